@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+bench_apply_patch.py - Time and memory benchmark for Project.apply_patch.
+
+Compares the current move-based patch application against the previous
+deep-copy implementation on large multi-chapter patches.
+
+Usage:
+    python benchmarks/bench_apply_patch.py [--chapters 20] [--paragraphs 120]
+"""
+import argparse
+import copy
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console  # noqa: E402
+
+from src import utils  # noqa: E402
+from src.project import Project  # noqa: E402
+
+PARAGRAPH_TEXT = (
+    "The lantern swung in the wind as Mara crossed the square,\n"
+    "her boots loud against the wet cobbles. **Nobody** followed her, "
+    "or so she told herself while the bells of the old chapel counted the hour."
+)
+
+
+def build_book(chapter_count: int) -> ET.Element:
+    """Builds an outline-only book with the given number of chapters."""
+    book = ET.Element("book")
+    ET.SubElement(book, "title").text = "Benchmark Book"
+    ET.SubElement(book, "characters")
+    chapters = ET.SubElement(book, "chapters")
+    for i in range(1, chapter_count + 1):
+        chapter = ET.SubElement(chapters, "chapter", id=str(i))
+        ET.SubElement(chapter, "title").text = f"Chapter {i}"
+        ET.SubElement(chapter, "summary").text = f"Summary {i}"
+    return book
+
+
+def build_patch(chapter_count: int, paragraph_count: int) -> str:
+    """Builds a patch XML string with full content for every chapter."""
+    parts = ["<patch>"]
+    parts.append("<characters>")
+    for i in range(50):
+        parts.append(
+            f'<character id="c{i}"><name>Character {i}</name>'
+            f"<description>{'A long description. ' * 20}</description></character>"
+        )
+    parts.append("</characters>")
+    for i in range(1, chapter_count + 1):
+        parts.append(f'<chapter id="{i}"><content>')
+        for j in range(1, paragraph_count + 1):
+            parts.append(f'<paragraph id="{j}">{PARAGRAPH_TEXT}</paragraph>')
+        parts.append("</content></chapter>")
+    parts.append("</patch>")
+    return "".join(parts)
+
+
+def legacy_apply_patch(project: Project, patch_xml_str: str) -> bool:
+    """The previous deep-copy implementation of apply_patch, kept for comparison."""
+    patch_root = utils.parse_xml_string(patch_xml_str, project.console, expected_root_tag="patch")
+    applied_changes = False
+    for chapter_patch in patch_root.findall("chapter"):
+        chapter_id = chapter_patch.get("id") or chapter_patch.findtext("id")
+        target_chapter = project.find_chapter(chapter_id)
+        if target_chapter is None:
+            continue
+        new_content = chapter_patch.find("content")
+        if new_content is None:
+            paragraphs = chapter_patch.findall("paragraph")
+            if paragraphs:
+                new_content = ET.Element("content")
+                for paragraph in paragraphs:
+                    if paragraph.text:
+                        paragraph.text = utils.clean_paragraph_text(paragraph.text)
+                    new_content.append(copy.deepcopy(paragraph))
+        if new_content is not None:
+            for paragraph in new_content.findall("paragraph"):
+                if paragraph.text:
+                    paragraph.text = utils.clean_paragraph_text(paragraph.text)
+            old_content = target_chapter.find("content")
+            if old_content is not None:
+                target_chapter.remove(old_content)
+            target_chapter.append(copy.deepcopy(new_content))
+            applied_changes = True
+    for element_patch in patch_root:
+        if element_patch.tag not in ["title", "synopsis", "characters", "story_elements"]:
+            continue
+        target_element = project.book_root.find(element_patch.tag)
+        if target_element is not None:
+            project.book_root.remove(target_element)
+        project.book_root.append(copy.deepcopy(element_patch))
+        applied_changes = True
+    return applied_changes
+
+
+def measure(label: str, apply_fn, chapters: int, patch_xml: str, rounds: int) -> None:
+    """Runs apply_fn over fresh projects and prints timing and peak memory."""
+    console = Console(quiet=True)
+    timings = []
+    peak = 0
+    for _ in range(rounds):
+        project = Project(console)
+        project.book_root = build_book(chapters)
+        tracemalloc.start()
+        start = time.perf_counter()
+        apply_fn(project, patch_xml)
+        timings.append(time.perf_counter() - start)
+        _, round_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak = max(peak, round_peak)
+    best = min(timings)
+    print(f"{label:<10} best {best * 1000:8.1f} ms   peak {peak / 1024 / 1024:7.2f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--chapters", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=120)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    patch_xml = build_patch(args.chapters, args.paragraphs)
+    print(
+        f"Patch: {args.chapters} chapters x {args.paragraphs} paragraphs "
+        f"({len(patch_xml) / 1024:.0f} KiB)"
+    )
+    measure("legacy", legacy_apply_patch, args.chapters, patch_xml, args.rounds)
+    measure(
+        "current",
+        lambda project, xml: project.apply_patch(xml, is_loading=True),
+        args.chapters,
+        patch_xml,
+        args.rounds,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+bench_book_analysis.py - Benchmark for whole-book chapter analysis.
+
+Analyzes a generated book in-process and over a process pool, checks that both give
+the same per-chapter results, and reports the wall-clock speedup alongside the one
+the parallel run measured for itself.
+
+Usage:
+    python benchmarks/bench_book_analysis.py [--chapters 40] [--words 4500] [--workers 4]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_slop_detection import build_text  # noqa: E402
+
+from src.book_analysis import analyze_book  # noqa: E402
+from src.slop_detection import _ANALYSIS_CACHE  # noqa: E402
+
+
+def build_book(chapter_count: int, words_per_chapter: int, rng: random.Random) -> list:
+    chapters = []
+    for i in range(chapter_count):
+        words = build_text(words_per_chapter, rng).replace("\n", " ").split(" ")
+        paragraphs = [" ".join(words[j:j + 80]).capitalize() for j in range(0, len(words), 80)]
+        chapters.append((str(i + 1), f"Chapter {i + 1} summary", paragraphs))
+    return chapters
+
+
+def comparable(analysis) -> list:
+    return [
+        (chapter.chapter_id, chapter.quality.overall_score, chapter.quality.slop_analysis,
+         chapter.engagement, chapter.continuity_issues)
+        for chapter in analysis.chapters
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--chapters", type=int, default=40)
+    parser.add_argument("--words", type=int, default=4500, help="words per chapter")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    chapters = build_book(args.chapters, args.words, random.Random(7))
+
+    # Start both runs cold; workers never see this process's paragraph cache
+    _ANALYSIS_CACHE.clear()
+    start = time.perf_counter()
+    serial = analyze_book(chapters, workers=1)
+    serial_time = time.perf_counter() - start
+    _ANALYSIS_CACHE.clear()
+    start = time.perf_counter()
+    parallel = analyze_book(chapters, workers=args.workers)
+    parallel_time = time.perf_counter() - start
+    assert comparable(serial) == comparable(parallel)
+
+    print(f"{args.chapters} chapters x {args.words} words, {os.cpu_count()} CPU cores")
+    print(f"  in-process   {serial_time * 1000:8.1f} ms")
+    print(
+        f"  {parallel.workers} workers    {parallel_time * 1000:8.1f} ms  x{serial_time / parallel_time:.1f} "
+        f"(self-reported x{parallel.speedup:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+bench_engagement.py - Benchmark for the emotional arc and tension cycles of a book.
+
+Times EngagementOptimizer's emotional arc and tension cycle analysis, which score
+every sentence of a chapter from one scan with the regex of the compiled
+EngagementLexicon, against the previous per-sentence scoring, which rebuilt each
+word list and tested every entry as a substring of every sentence. The two differ
+where a substring is not a word ("now" in "know"), so the counts of sentences
+each flags are printed rather than compared.
+
+Usage:
+    python benchmarks/bench_engagement.py [--chapters 30] [--words 4000] [--rounds 3]
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_slop_detection import best_time  # noqa: E402
+
+from src.engagement_optimizer import (  # noqa: E402
+    _BEAT_WORDS,
+    _HIGH_INTENSITY_WORDS,
+    _HIGH_TENSION_WORDS,
+    _MEDIUM_INTENSITY_WORDS,
+    _MEDIUM_TENSION_WORDS,
+    EmotionalBeat,
+    EngagementOptimizer,
+)
+from src.text_analysis import TextAnalysis  # noqa: E402
+
+PROSE = (
+    "the harbour lay quiet under a low grey sky while she walked toward the old "
+    "lighthouse and wondered what the keeper knew about the ship that never came "
+    "home across the cold water of the bay"
+).split()
+SIGNAL_WORDS = [
+    word
+    for words in (*_BEAT_WORDS.values(), _HIGH_INTENSITY_WORDS, _HIGH_TENSION_WORDS)
+    for word in words
+]
+
+
+def build_chapter(word_count: int, rng: random.Random) -> str:
+    words = []
+    for _ in range(word_count):
+        words.append(rng.choice(SIGNAL_WORDS) if rng.random() < 0.03 else rng.choice(PROSE))
+        if rng.random() < 0.06:
+            words[-1] += rng.choice(".!?")
+    return " ".join(words)
+
+
+def legacy_signals(sentence: str, position: float) -> tuple:
+    """The previous per-sentence beat, intensity and tension: substring tests per entry."""
+    sentence_lower = sentence.lower()
+    beat = EmotionalBeat.SETUP if position < 0.2 else None
+    for beat_type, words in _BEAT_WORDS.items():
+        if beat is None and any(word in sentence_lower for word in list(words)):
+            beat = beat_type
+    if any(word in sentence_lower for word in list(_HIGH_INTENSITY_WORDS)):
+        intensity = 0.8
+    elif any(word in sentence_lower for word in list(_MEDIUM_INTENSITY_WORDS)):
+        intensity = 0.5
+    else:
+        intensity = 0.2
+    high_count = sum(1 for word in list(_HIGH_TENSION_WORDS) if word in sentence_lower)
+    medium_count = sum(1 for word in list(_MEDIUM_TENSION_WORDS) if word in sentence_lower)
+    return beat, intensity, min(1.0, high_count * 0.4 + medium_count * 0.2)
+
+
+def legacy_book(chapters: list[str]) -> tuple[int, int]:
+    beats = tense = 0
+    for text in chapters:
+        sentences = TextAnalysis(text).sentence_pieces
+        for i, sentence in enumerate(sentences):
+            if sentence.strip():
+                beat, _, tension = legacy_signals(sentence, i / len(sentences))
+                beats += beat is not None
+                tense += tension > 0.5
+    return beats, tense
+
+
+def compiled_book(optimizer: EngagementOptimizer, chapters: list[str]) -> tuple[int, int]:
+    beats = tense = 0
+    for text in chapters:
+        analysis = TextAnalysis(text)
+        signals = optimizer._sentence_signals(analysis)
+        beats += len(optimizer._analyze_emotional_arc(analysis, signals)["beats"])
+        tense += sum(
+            signal.tension > 0.5
+            for piece, signal in zip(analysis.sentence_pieces, signals, strict=True)
+            if piece.strip()
+        )
+        optimizer._analyze_tension_cycles(analysis, signals)
+    return beats, tense
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--chapters", type=int, default=30)
+    parser.add_argument("--words", type=int, default=4000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    chapters = [build_chapter(args.words, rng) for _ in range(args.chapters)]
+    optimizer = EngagementOptimizer()
+    legacy_counts = legacy_book(chapters)
+    compiled_counts = compiled_book(optimizer, chapters)
+
+    legacy_time = best_time(lambda: legacy_book(chapters), args.rounds)
+    compiled_time = best_time(lambda: compiled_book(optimizer, chapters), args.rounds)
+    print(
+        f"{args.chapters} chapters x {args.words} words  substring {legacy_time * 1000:8.1f} ms  "
+        f"compiled {compiled_time * 1000:8.1f} ms  x{legacy_time / compiled_time:.1f}  "
+        f"(beats, tense sentences: substring {legacy_counts}, compiled {compiled_counts})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+bench_lorebook_loading.py - Benchmark for opening large lorebooks.
+
+Times a cold load (JSON parse plus index build, which also writes the cache) against
+a load served from the index cache, for an unchanged and for a touched lorebook file.
+
+Usage:
+    python benchmarks/bench_lorebook_loading.py [--entries 1000 10000] [--rounds 3]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_lorebook_matching import build_lorebook  # noqa: E402
+
+from src.lorebook_index import cache_path, load_index  # noqa: E402
+
+
+def best_time(func, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        for entry_count in args.entries:
+            lorebook = build_lorebook(entry_count, rng)
+            for entry in lorebook["entries"].values():
+                entry["content"] = " ".join([entry["content"]] * 40)
+            path = Path(tmp) / f"lorebook-{entry_count}.json"
+            path.write_text(json.dumps(lorebook, indent=2), encoding="utf-8")
+
+            def cold_load(path=path):
+                cache_path(path).unlink(missing_ok=True)
+                load_index(path)
+
+            def touched_load(path=path):
+                stat = path.stat()
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+                load_index(path)
+
+            cold = best_time(cold_load, args.rounds)
+            cached = best_time(lambda path=path: load_index(path), args.rounds)
+            touched = best_time(touched_load, args.rounds)
+            size_mb = path.stat().st_size / 1e6
+            print(
+                f"{entry_count:>6} entries ({size_mb:5.1f} MB)  cold {cold * 1000:8.1f} ms  "
+                f"cached {cached * 1000:7.1f} ms  touched {touched * 1000:7.1f} ms  "
+                f"x{cold / cached:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
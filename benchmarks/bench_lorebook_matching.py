@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+bench_lorebook_matching.py - Benchmark for lorebook keyword matching.
+
+Compares the compiled LorebookIndex (one Aho-Corasick pass over the text) against
+the previous lookup, which re-normalized every entry's keys and ran a substring
+search per key on each call, for lorebooks of increasing size.
+
+Usage:
+    python benchmarks/bench_lorebook_matching.py [--entries 100 1000 10000] [--words 5000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.lorebook_index import LorebookIndex  # noqa: E402
+
+SYLLABLES = ["ka", "ren", "dor", "vel", "ith", "mar", "os", "tul", "an", "bre", "sil", "quo"]
+PROSE = (
+    "the wind carried salt over the harbour walls while the lamps were lit one by one "
+    "and somewhere below the market a bell rang for the night watch"
+).split()
+
+
+def build_lorebook(entry_count: int, rng: random.Random) -> dict:
+    entries = {}
+    for i in range(entry_count):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(3)).capitalize() + str(i)
+        keys = [name, f"{name} Hall", f"order of {name.lower()}"]
+        entries[str(i)] = {"comment": name, "keys": keys, "content": f"Lore about {name}."}
+    return {"entries": entries}
+
+
+def build_text(word_count: int, lorebook: dict, rng: random.Random) -> str:
+    names = [entry["comment"] for entry in lorebook["entries"].values()]
+    words = []
+    for _ in range(word_count):
+        words.append(rng.choice(names) if rng.random() < 0.01 else rng.choice(PROSE))
+    return " ".join(words)
+
+
+def legacy_matching_titles(lorebook_data: dict, text: str) -> list[str]:
+    """The previous per-call, per-key scan from Orchestrator._extract_lorebook_context."""
+    entries = list(lorebook_data["entries"].values())
+    titles = []
+    text_lower = text.lower()
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        if entry.get("disable", False) or not entry.get("enable", True):
+            continue
+        keys = entry.get("keys", entry.get("key", []))
+        if isinstance(keys, str):
+            keys = [k.strip() for k in keys.split(",")]
+        elif not isinstance(keys, list):
+            keys = []
+        if any(key.lower() in text_lower for key in keys if isinstance(key, str) and key.strip()):
+            if entry.get("content", "").strip():
+                titles.append(entry.get("comment", entry.get("title", "Entry")))
+    return titles
+
+
+def best_time(func, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entries", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    for entry_count in args.entries:
+        lorebook = build_lorebook(entry_count, rng)
+        text = build_text(args.words, lorebook, rng)
+
+        start = time.perf_counter()
+        index = LorebookIndex.from_data(lorebook)
+        build = time.perf_counter() - start
+        matched = [entry.title for entry in index.matching_entries(text)]
+        # Whole-word matching only drops the legacy scan's substring false positives
+        assert set(matched) <= set(legacy_matching_titles(lorebook, text))
+
+        legacy = best_time(
+            lambda lorebook=lorebook, text=text: legacy_matching_titles(lorebook, text), args.rounds
+        )
+        current = best_time(
+            lambda index=index, text=text: index.matching_entries(text), args.rounds
+        )
+        print(
+            f"{entry_count:>6} entries  build {build * 1000:8.2f} ms  "
+            f"legacy {legacy * 1000:8.2f} ms  index {current * 1000:7.2f} ms  "
+            f"x{legacy / current:.1f}  ({len(matched)} matched)"
+        )
+
+
+if __name__ == "__main__":
+    main()
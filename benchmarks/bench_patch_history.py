@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+bench_patch_history.py - Disk usage of patch snapshots with and without retention.
+
+Simulates a long editing session in which every save rewrites one chapter, then
+compares the size of the raw patch-NN.xml files with the archived history.
+
+Usage:
+    python benchmarks/bench_patch_history.py [--chapters 20] [--saves 60]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_apply_patch import PARAGRAPH_TEXT, build_book  # noqa: E402
+from rich.console import Console  # noqa: E402
+
+from src import config  # noqa: E402
+from src.patch_history import PatchHistory  # noqa: E402
+from src.project import Project  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--chapters", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=80)
+    parser.add_argument("--saves", type=int, default=60)
+    parser.add_argument("--keep-last", type=int, default=config.PATCH_HISTORY_KEEP_LAST)
+    parser.add_argument("--keep-every", type=int, default=config.PATCH_HISTORY_KEEP_EVERY)
+    args = parser.parse_args()
+
+    config.ENABLE_PATCH_HISTORY_RETENTION = False
+    work_dir = Path(tempfile.mkdtemp())
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        project = Project(Console(quiet=True))
+        project.setup_new_project("idea", "Benchmark Book", "synopsis")
+        project.book_root = build_book(args.chapters)
+        for n in range(1, args.saves + 1):
+            chapter_id = (n % args.chapters) + 1
+            paragraphs = "".join(
+                f'<paragraph id="{j}">{PARAGRAPH_TEXT} (revision {n})</paragraph>'
+                for j in range(1, args.paragraphs + 1)
+            )
+            project.apply_patch(
+                f'<patch><chapter id="{chapter_id}"><content>{paragraphs}</content></chapter></patch>',
+                is_loading=True,
+            )
+            project.save_state(f"patch-{n:02d}.xml")
+
+        history = PatchHistory(project.book_dir, args.keep_last, args.keep_every)
+        raw_bytes, _ = history.disk_usage()
+        history.apply_retention()
+        hot_bytes, archived_bytes = history.disk_usage()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    kept = hot_bytes + archived_bytes
+    print(f"{args.saves} saves of {args.chapters} chapters x {args.paragraphs} paragraphs")
+    print(f"raw snapshots      {raw_bytes / 1024 / 1024:8.2f} MiB")
+    print(f"hot + history      {kept / 1024 / 1024:8.2f} MiB  ({raw_bytes / kept:.1f}x smaller)")
+    print(f"  hot (last {args.keep_last:>3})   {hot_bytes / 1024 / 1024:8.2f} MiB")
+    print(f"  history/         {archived_bytes / 1024 / 1024:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+bench_prompt_context.py - Size of the book XML embedded in prompts, verbose vs compact.
+
+Loads a synthetic book the way a project is loaded from a pretty-printed snapshot,
+then compares ET.tostring (what prompts used to embed) against utils.compact_xml
+with and without paragraph ids. Tokens are counted with tiktoken's cl100k_base
+encoding when it is installed, otherwise estimated by splitting into words,
+punctuation and whitespace runs, which tracks BPE counts closely for English prose
+and XML markup.
+
+Usage:
+    python benchmarks/bench_prompt_context.py [--chapters 20] [--paragraphs 40] [--rounds 5]
+"""
+import argparse
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import utils  # noqa: E402
+
+PARAGRAPH_TEXT = (
+    "The lantern swung in the wind as Mara crossed the square, her boots loud against "
+    "the wet cobbles. Nobody followed her, or so she told herself while the bells of "
+    "the old chapel counted the hour."
+)
+
+_TOKEN_ESTIMATE_PATTERN = re.compile(r" ?\w+| ?[^\w\s]|\s+")
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken missing or its encoding cannot be downloaded
+    _ENCODING = None
+
+
+def count_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(_TOKEN_ESTIMATE_PATTERN.findall(text))
+
+
+def build_loaded_book(chapter_count: int, paragraph_count: int) -> ET.Element:
+    """Builds a book, pretty-prints it as save_state does and parses it back."""
+    book = ET.Element("book")
+    ET.SubElement(book, "title").text = "Benchmark Book"
+    ET.SubElement(book, "synopsis").text = PARAGRAPH_TEXT
+    characters = ET.SubElement(book, "characters")
+    for i in range(12):
+        character = ET.SubElement(characters, "character", id=f"c{i}")
+        ET.SubElement(character, "name").text = f"Character {i}"
+        ET.SubElement(character, "description").text = PARAGRAPH_TEXT
+    chapters = ET.SubElement(book, "chapters")
+    for i in range(1, chapter_count + 1):
+        chapter = ET.SubElement(chapters, "chapter", id=str(i), setting="The old chapel")
+        ET.SubElement(chapter, "number").text = str(i)
+        ET.SubElement(chapter, "title").text = f"Chapter {i}"
+        ET.SubElement(chapter, "summary").text = f"Summary of chapter {i}. {PARAGRAPH_TEXT}"
+        content = ET.SubElement(chapter, "content")
+        for j in range(1, paragraph_count + 1):
+            ET.SubElement(content, "paragraph", id=str(j)).text = PARAGRAPH_TEXT
+    return ET.fromstring(utils.pretty_xml(book))
+
+
+def best_time(func, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--chapters", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    book = build_loaded_book(args.chapters, args.paragraphs)
+    variants = {
+        "ET.tostring": lambda: ET.tostring(book, encoding="unicode"),
+        "compact": lambda: utils.compact_xml(book),
+        "compact, no ids": lambda: utils.compact_xml(book, paragraph_ids=False),
+    }
+
+    counter = "tiktoken cl100k_base" if _ENCODING is not None else "estimated"
+    print(f"{args.chapters} chapters x {args.paragraphs} paragraphs, tokens {counter}")
+    baseline_tokens = None
+    for label, serialize in variants.items():
+        text = serialize()
+        tokens = count_tokens(text)
+        baseline_tokens = baseline_tokens or tokens
+        elapsed = best_time(serialize, args.rounds)
+        print(
+            f"{label:<16} {len(text):>9,} chars {tokens:>8,} tokens "
+            f"({100 * (1 - tokens / baseline_tokens):5.1f}% saved) {elapsed * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
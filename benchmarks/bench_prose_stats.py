@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+bench_prose_stats.py - Benchmark for book-wide prose statistics.
+
+Times book_prose_stats, which computes every chapter's sentence length
+distribution, variance, type-token ratios and readability in one NumPy batch,
+against the per-chapter Python loops of QualityEvaluator and ContentEnhancer
+(sentence variety, vocabulary richness and the detailed sentence analysis) plus
+a sliding-window type-token ratio computed window by window. Both sides start
+from the raw chapter text, so tokenisation is included; the batch is also timed
+on chapters whose TextAnalysis another analyser already computed.
+
+Usage:
+    python benchmarks/bench_prose_stats.py [--chapters 30] [--words 4000] [--rounds 3]
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_slop_detection import best_time, build_text  # noqa: E402
+
+from src import config  # noqa: E402
+from src.content_enhancements import ContentEnhancer  # noqa: E402
+from src.prose_stats import book_prose_stats, numpy_available  # noqa: E402
+from src.quality_metrics import QualityEvaluator  # noqa: E402
+from src.text_analysis import TextAnalysis  # noqa: E402
+
+
+def window_ttr(words: list[str], window: int) -> float:
+    """Moving-average type-token ratio, one set per window."""
+    if len(words) < window:
+        return len(set(words)) / len(words) if words else 0.0
+    windows = len(words) - window + 1
+    return sum(len(set(words[i:i + window])) for i in range(windows)) / (window * windows)
+
+
+def per_chapter_loops(chapters: list[tuple[str, str]], window: int) -> list[tuple]:
+    evaluator = QualityEvaluator(enable_slop_detection=False)
+    enhancer = ContentEnhancer()
+    results = []
+    for _, text in chapters:
+        results.append((
+            evaluator._evaluate_sentence_variety(text),
+            evaluator._evaluate_vocabulary_richness(text),
+            enhancer.analyze_sentence_variety_detailed(text).std_dev,
+            window_ttr(TextAnalysis(text).lower_words, window),
+        ))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--chapters", type=int, default=30)
+    parser.add_argument("--words", type=int, default=4000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    if not numpy_available:
+        sys.exit("numpy is not installed")
+
+    rng = random.Random(11)
+    chapters = [(str(i + 1), build_text(args.words, rng)) for i in range(args.chapters)]
+    window = config.MATTR_WINDOW_WORDS
+    stats = book_prose_stats(chapters)
+    loops = per_chapter_loops(chapters, window)
+    for chapter, (variety, _, _, mattr) in zip(stats.chapters, loops, strict=True):
+        assert chapter.sentence_variety_score == variety
+        assert abs(chapter.moving_average_ttr - mattr) < 1e-9
+
+    loop_time = best_time(lambda: per_chapter_loops(chapters, window), args.rounds)
+    batch_time = best_time(lambda: book_prose_stats(chapters), args.rounds)
+    analyzed = [(chapter_id, TextAnalysis(text)) for chapter_id, text in chapters]
+    book_prose_stats(analyzed)
+    shared_time = best_time(lambda: book_prose_stats(analyzed), args.rounds)
+    print(
+        f"{args.chapters} chapters x {args.words} words  per-chapter loops {loop_time * 1000:8.1f} ms  "
+        f"batch {batch_time * 1000:8.1f} ms  x{loop_time / batch_time:.1f}  "
+        f"batch, pre-tokenised {shared_time * 1000:8.1f} ms  x{loop_time / shared_time:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
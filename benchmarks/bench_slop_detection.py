@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+bench_slop_detection.py - Benchmark for slop detection on chapter- and book-sized text.
+
+Compares SlopDetector.analyze_text against the previous detection loop, which ran
+re.finditer with an uncompiled pattern string for every pattern of every category
+and once more per overused word, and checks that both report identical issues.
+Auto-cleaning is timed against the previous cleaner, which re-sliced the whole
+text for every removal or replacement, and re-checking a chapter after a
+one-paragraph edit is timed with and without the per-paragraph cache.
+
+Usage:
+    python benchmarks/bench_slop_detection.py [--words 5000 50000] [--rounds 3]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.slop_detection import SlopCategory, SlopDetector, SlopIssue  # noqa: E402
+
+PROSE = (
+    "the wind carried salt over the harbour walls while the lamps were lit one by one "
+    "and somewhere below the market a bell rang for the night watch she said nothing "
+    "and looked at the very small boat that was really quite good"
+).split()
+SLOP = [
+    "Suddenly", "once upon a time", "it's worth noting that", "a piece of cake",
+    "needless to say", "(quietly)", "she seemed to", "kind of", "free gift",
+    "to be honest", "bite the bullet", "first, second, third", "perhaps, maybe, possibly", "\nAnd then",
+    "basically", "the exact same", "if you will", "was running", "sort of",
+]
+
+
+def build_text(word_count: int, rng: random.Random) -> str:
+    words = []
+    for _ in range(word_count):
+        words.append(rng.choice(SLOP) if rng.random() < 0.01 else rng.choice(PROSE))
+        if rng.random() < 0.05:
+            words[-1] += "."
+    return " ".join(words)
+
+
+def legacy_overused_words(detector: SlopDetector, text: str) -> list[SlopIssue]:
+    """The previous SlopDetector._detect_overused_words: one regex scan per flagged word."""
+    issues = []
+    word_counts = {}
+    words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
+    for word in words:
+        if len(word) > 3:
+            word_counts[word] = word_counts.get(word, 0) + 1
+    text_length = len(words)
+    for word, count in word_counts.items():
+        frequency = count / text_length
+        if count > 5 and frequency > 0.02 and word in detector._overused_words:
+            matches = []
+            for match in re.finditer(rf'\b{re.escape(word)}\b', text, re.IGNORECASE):
+                matches.append((match.start(), match.group()))
+            issues.append(SlopIssue(
+                category=SlopCategory.OVERUSED_WORDS, pattern=word, matches=matches,
+                severity=min(0.9, frequency * 10),
+                suggestion=f"Used {count} times. Consider alternatives: {', '.join(detector._overused_words[word])}",
+            ))
+    return issues
+
+
+def legacy_issues(detector: SlopDetector, text: str) -> list[SlopIssue]:
+    """The previous per-category loops from SlopDetector.analyze_text."""
+    categories = {category: (flags, patterns) for category, flags, patterns in detector._pattern_categories()}
+    order = [
+        SlopCategory.GENERIC_PHRASES, SlopCategory.CLICHES, SlopCategory.OVERUSED_WORDS,
+        SlopCategory.AI_PATTERNS, SlopCategory.WEAK_PROSE, SlopCategory.REDUNDANCY,
+        SlopCategory.FILLER_CONTENT,
+    ]
+    issues = []
+    for category in order:
+        if category is SlopCategory.OVERUSED_WORDS:
+            issues.extend(legacy_overused_words(detector, text))
+            continue
+        flags, patterns = categories[category]
+        for pattern, severity, suggestion in patterns:
+            matches = []
+            for match in re.finditer(pattern, text, flags):
+                matches.append((match.start(), match.group()))
+            if matches:
+                issues.append(SlopIssue(
+                    category=category, pattern=pattern, matches=matches,
+                    severity=severity, suggestion=suggestion,
+                ))
+    return [issue for issue in issues if issue.severity >= detector.sensitivity_threshold]
+
+
+def legacy_clean_text(text: str, issues: list[SlopIssue]) -> str:
+    """The previous SlopDetector._clean_text: re-slices the whole text for every edit."""
+    cleaned = text
+    all_matches = sorted(
+        ((pos, match_text, issue) for issue in issues for pos, match_text in issue.matches),
+        key=lambda x: x[0],
+        reverse=True,
+    )
+    for pos, match_text, issue in all_matches:
+        if issue.category in [SlopCategory.FILLER_CONTENT, SlopCategory.REDUNDANCY]:
+            cleaned = cleaned[:pos] + cleaned[pos + len(match_text):]
+        elif issue.suggestion and "Consider:" in issue.suggestion:
+            replacement = issue.suggestion.split("Consider:")[1].strip().split(",")[0].strip()
+            cleaned = cleaned[:pos] + replacement + cleaned[pos + len(match_text):]
+    return cleaned
+
+
+def best_time(func, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--words", type=int, nargs="+", default=[5000, 50000])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    detector = SlopDetector("strict")
+    for word_count in args.words:
+        text = build_text(word_count, rng)
+        analysis = detector.analyze_text(text)
+        assert analysis.issues == legacy_issues(detector, text)
+
+        legacy = best_time(lambda text=text: legacy_issues(detector, text), args.rounds)
+        current = best_time(lambda text=text: detector.analyze_text(text), args.rounds)
+        print(
+            f"{word_count:>6} words  legacy {legacy * 1000:8.1f} ms  "
+            f"current {current * 1000:8.1f} ms  x{legacy / current:.1f}  "
+            f"({len(analysis.issues)} issues)"
+        )
+        # The bench text has no overlapping edits, so both cleaners must agree
+        cleaned, _, _, edits = detector._clean_text(text, analysis.issues)
+        assert cleaned == legacy_clean_text(text, analysis.issues)
+        issues = analysis.issues
+        legacy = best_time(
+            lambda text=text, issues=issues: legacy_clean_text(text, issues), args.rounds
+        )
+        current = best_time(
+            lambda text=text, issues=issues: detector._clean_text(text, issues), args.rounds
+        )
+        print(
+            f"{'':>6}        auto-clean      legacy {legacy * 1000:6.1f} ms  "
+            f"current {current * 1000:6.1f} ms  x{legacy / current:.1f}  ({len(edits)} edits)"
+        )
+        # Re-checking after a one-paragraph edit, as paragraphs of about 60 words
+        words = text.replace("\n", " ").split(" ")
+        paragraphs = [" ".join(words[i:i + 60]) for i in range(0, len(words), 60)]
+        assert detector.analyze_paragraphs(paragraphs) == detector.analyze_text("\n".join(paragraphs))
+        edits = iter(range(10 ** 6))
+
+        def recheck_edited(paragraphs=paragraphs, edits=edits):
+            paragraphs[len(paragraphs) // 2] = f"Edit {next(edits)} was very small."
+            detector.analyze_paragraphs(paragraphs)
+
+        full = best_time(
+            lambda paragraphs=paragraphs: detector.analyze_text("\n".join(paragraphs)), args.rounds
+        )
+        incremental = best_time(recheck_edited, args.rounds)
+        print(
+            f"{'':>6}        edited re-check full    {full * 1000:6.1f} ms  "
+            f"cached  {incremental * 1000:6.1f} ms  x{full / incremental:.1f}  ({len(paragraphs)} paragraphs)"
+        )
+        legacy = best_time(lambda text=text: legacy_overused_words(detector, text), args.rounds)
+        current = best_time(lambda text=text: detector._detect_overused_words(text), args.rounds)
+        print(
+            f"{'':>6}        overused words  legacy {legacy * 1000:6.1f} ms  "
+            f"current {current * 1000:6.1f} ms  x{legacy / current:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+bench_xml_cleaning.py - Benchmark for utils.clean_llm_xml_output and clean_paragraph_text.
+
+Compares the precompiled cleaner against the previous chain of uncompiled re.sub
+passes on synthetic 50-100 KB LLM responses, both well-formed and with the line
+break damage the cleaner repairs, and checks that both produce identical output.
+
+Usage:
+    python benchmarks/bench_xml_cleaning.py [--sizes 50 100] [--rounds 5]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import utils  # noqa: E402
+
+SENTENCES = [
+    "The lantern swung in the wind as Mara crossed the square.",
+    "her boots loud against the wet cobbles,",
+    "**Nobody** followed her, or so she told herself.",
+    '"Who goes there?" the watchman called.',
+    "the bells of the old chapel counted the hour",
+    "She did not answer!",
+    "Was it fear, or something  older?",
+]
+
+
+def legacy_clean_llm_xml_output(xml_string: str) -> str:
+    """The previous multi-pass implementation of clean_llm_xml_output, kept for comparison."""
+    if not isinstance(xml_string, str):
+        return ""
+    # Find the first '<' and the last '>'
+    start = xml_string.find("<")
+    end = xml_string.rfind(">")
+    if start != -1 and end != -1:
+        cleaned = xml_string[start : end + 1].strip()
+        # Remove markdown code fences
+        cleaned = re.sub(r"^```xml\s*", "", cleaned, flags=re.IGNORECASE | re.MULTILINE)
+        cleaned = re.sub(r"\s*```$", "", cleaned)
+
+        # Fix malformed attribute quotes with comprehensive patterns
+        # Pattern 1: id="value\n" -> id="value"
+        cleaned = re.sub(r'(\w+)="([^"]*?)\s*\n\s*"', r'\1="\2"', cleaned)
+
+        # Pattern 2: id="value\n"> -> id="value">
+        cleaned = re.sub(r'(\w+)="([^"]*?)\s*\n\s*">', r'\1="\2">', cleaned)
+
+        # Pattern 3: id="value\nother_text" -> id="valueother_text" (no space for IDs)
+        cleaned = re.sub(
+            r'(\w+)="([^"]*?)\n([^"]*?)"',
+            lambda m: (
+                f'{m.group(1)}="{m.group(2)}{m.group(3)}"'
+                if m.group(1) == "id"
+                else f'{m.group(1)}="{m.group(2)} {m.group(3)}"'
+            ),
+            cleaned,
+        )
+
+        # Pattern 4: Fix cases where the newline is within the tag itself
+        # Example: <paragraph id="2\n1"> -> <paragraph id="21">
+        cleaned = re.sub(r'(<\w+[^>]*?\s+\w+=")([^"]*?)\n([^"]*?)(")', r"\1\2\3\4", cleaned)
+
+        # Pattern 5: Fix newlines breaking the opening tag
+        # Example: <paragraph id="2\n1">content -> <paragraph id="21">content
+        cleaned = re.sub(r"(<\w+[^>]*?)\n([^<>]*?>)", r"\1\2", cleaned)
+
+        # Fix unwanted line breaks within paragraph content with more comprehensive cleaning
+        def fix_paragraph_content(match):
+            full_para = match.group(0)
+
+            # First, fix any structural issues in the paragraph tag itself
+            # Handle cases where attributes are split across lines
+            para_fixed = re.sub(r"(<paragraph[^>]*?)\n([^<>]*?>)", r"\1\2", full_para)
+
+            # Now fix content line breaks - be more aggressive
+            # Replace line breaks that are NOT after sentence endings with spaces
+            content_pattern = r">(.*?)<"
+
+            def fix_content(content_match):
+                content = content_match.group(1)
+                # Replace newlines with spaces unless they follow sentence endings
+                # Keep breaks after: . ! ? " or if the next line starts with a capital (new sentence)
+                fixed_content = re.sub(r'(?<![.!?"\n])\n(?!\s*[A-Z"])', " ", content)
+                # Clean up multiple spaces
+                fixed_content = re.sub(r"  +", " ", fixed_content)
+                return f">{fixed_content}<"
+
+            para_fixed = re.sub(content_pattern, fix_content, para_fixed, flags=re.DOTALL)
+            return para_fixed
+
+        # Apply the fix to all paragraph elements
+        cleaned = re.sub(
+            r"<paragraph[^>]*>.*?</paragraph>", fix_paragraph_content, cleaned, flags=re.DOTALL
+        )
+
+        # Additional patterns to fix specific XML formatting issues
+
+        # Fix cases where paragraph opening tags are broken across lines
+        # Example: <paragraph id="2\n1"> -> <paragraph id="21">
+        cleaned = re.sub(
+            r'<paragraph\s+id="([^"]*?)\n([^"]*?)">', r'<paragraph id="\1\2">', cleaned
+        )
+
+        # Fix any XML tag that has been split across lines
+        # Pattern: <tag attr="val\nue"> -> <tag attr="value">
+        cleaned = re.sub(r'(<\w+[^>]*?="[^"]*?)\n([^"]*?"[^>]*?>)', r"\1\2", cleaned)
+
+        # Handle cases where the paragraph content starts on the next line after the tag
+        # Pattern: <paragraph id="1">\nContent -> <paragraph id="1">Content
+        cleaned = re.sub(r"(<paragraph[^>]*>)\s*\n\s*([A-Z])", r"\1\2", cleaned)
+
+        # Clean up multiple spaces that might result from the above fixes
+        cleaned = re.sub(r"  +", " ", cleaned)
+
+        # Attempt to repair truncated XML for patches and book outlines
+        if cleaned.startswith("<patch>") and not cleaned.rstrip().endswith("</patch>"):
+            # If the patch XML is truncated, try to repair it by closing open tags
+            cleaned = _legacy_attempt_xml_repair(cleaned)
+        elif cleaned.startswith("<book>") and not cleaned.rstrip().endswith("</book>"):
+            # If the XML is truncated, try to repair it by closing open tags
+            cleaned = _legacy_attempt_xml_repair(cleaned)
+
+        return cleaned
+    return xml_string  # Return original if no tags found
+
+
+def _legacy_attempt_xml_repair(xml_string: str) -> str:
+    # Track open tags using a simple stack
+
+    # Find all opening and closing tags
+    tag_pattern = r"<(/?)(\w+)(?:\s[^>]*)?>"
+    matches = re.findall(tag_pattern, xml_string)
+
+    tag_stack = []
+    for is_closing, tag_name in matches:
+        if is_closing:  # Closing tag
+            if tag_stack and tag_stack[-1] == tag_name:
+                tag_stack.pop()
+        else:  # Opening tag
+            # Skip self-closing tags or tags that don't need closing
+            if tag_name not in ["br", "hr", "img", "input", "meta", "link"]:
+                tag_stack.append(tag_name)
+
+    # Close any remaining open tags in reverse order
+    repaired = xml_string
+    for tag in reversed(tag_stack):
+        repaired += f"</{tag}>"
+
+    return repaired
+
+
+def legacy_clean_paragraph_text(text: str) -> str:
+    """The previous implementation of clean_paragraph_text, kept for comparison."""
+    if not text:
+        return text
+
+    # Remove markdown bold formatting (**text**)
+    cleaned = re.sub(r"\*\*(.*?)\*\*", r"\1", text)
+
+    # Remove line breaks that are not after sentence endings or dialogue
+    # Keep breaks after: . ! ? " and at the start/end of paragraphs
+    cleaned = re.sub(r'(?<![.!?"\n])\n(?=\s*[a-z])', " ", cleaned)
+
+    # Clean up multiple spaces
+    cleaned = re.sub(r"  +", " ", cleaned)
+
+    # Clean up trailing/leading whitespace while preserving intentional breaks
+    cleaned = cleaned.strip()
+
+    return cleaned
+
+
+def build_response(size_kb: int, damaged: bool, seed: int = 7) -> str:
+    """Builds a patch response of roughly size_kb kilobytes, optionally with broken lines."""
+    rng = random.Random(seed)
+    parts = ["Here is the chapter:\n```xml\n<patch>\n"]
+    size = 0
+    chapter = paragraph = 0
+    while size < size_kb * 1024:
+        chapter += 1
+        parts.append(f'  <chapter id="{chapter}">\n    <content>\n')
+        for _ in range(40):
+            paragraph += 1
+            joiner = "\n" if damaged else " "
+            text = joiner.join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 8)))
+            if damaged and rng.random() < 0.1:
+                tag = f'<paragraph id="{paragraph // 10}\n{paragraph % 10}">'
+            else:
+                tag = f'<paragraph id="{paragraph}">'
+            parts.append(f"      {tag}{text}</paragraph>\n")
+            size += len(text) + 40
+        parts.append("    </content>\n  </chapter>\n")
+    parts.append("</patch>\n```")
+    return "".join(parts)
+
+
+def best_time(fn, arg, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    for size_kb in args.sizes:
+        for damaged in (False, True):
+            response = build_response(size_kb, damaged)
+            assert utils.clean_llm_xml_output(response) == legacy_clean_llm_xml_output(response)
+            legacy = best_time(legacy_clean_llm_xml_output, response, args.rounds)
+            current = best_time(utils.clean_llm_xml_output, response, args.rounds)
+            label = f"{len(response) / 1024:.0f} KiB {'damaged' if damaged else 'clean'}"
+            print(
+                f"{label:<18} legacy {legacy * 1000:8.2f} ms   current {current * 1000:8.2f} ms"
+                f"   x{legacy / current:.1f}"
+            )
+
+    paragraphs = [" ".join(SENTENCES[i % 7 :] + SENTENCES[: i % 7]) for i in range(2000)]
+    legacy = best_time(lambda ps: [legacy_clean_paragraph_text(p) for p in ps], paragraphs, args.rounds)
+    current = best_time(lambda ps: [utils.clean_paragraph_text(p) for p in ps], paragraphs, args.rounds)
+    print(
+        f"{'2000 paragraphs':<18} legacy {legacy * 1000:8.2f} ms   current {current * 1000:8.2f} ms"
+        f"   x{legacy / current:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -62,6 +62,7 @@ def main():
     )
     args = parser.parse_args()
 
+    project = None
     try:
         # --- Lorebook Creation Mode ---
         if args.create_lorebook is not None:
@@ -215,7 +216,8 @@ def main():
                 # User imported a character card
                 character_card_premise = imported_premise
         
-        project = Project(ui.console, resume_folder_name=resume_folder)
+        # Resumed projects load chapter content on demand to keep startup fast
+        project = Project(ui.console, resume_folder_name=resume_folder, lazy=True)
         ui.display_welcome(project.book_dir.name if project.book_dir else None)
         
         llm_client = LLMClient(ui.console)
@@ -246,6 +248,9 @@ def main():
     except Exception as e:
         ui.console.print("\n[bold red]An unexpected critical error occurred:[/bold red]")
         ui.console.print_exception(show_locals=False, word_wrap=True)
+    finally:
+        if project is not None:
+            project.close()
 
 if __name__ == "__main__":
     main()
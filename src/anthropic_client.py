@@ -5,6 +5,7 @@ anthropic_client.py - Anthropic client implementation for LLMClientInterface.
 import getpass
 import os
 import time
+from typing import TYPE_CHECKING
 
 import anthropic
 from rich.console import Console
@@ -15,6 +16,9 @@ from rich.prompt import Confirm
 from src import config
 from src.llm_client_interface import LLMClientInterface
 
+if TYPE_CHECKING:
+    from src.stream_monitor import StreamingSlopMonitor
+
 
 class AnthropicClient(LLMClientInterface):
     """A client to handle all communication with the Anthropic API."""
@@ -63,15 +67,23 @@ class AnthropicClient(LLMClientInterface):
             return None
 
     def get_response(
-        self, prompt: str, task_description: str = "Generating content", allow_stream: bool = True
+        self,
+        prompt: str,
+        task_description: str = "Generating content",
+        allow_stream: bool = True,
+        stream_monitor: "StreamingSlopMonitor | None" = None,
     ) -> str | None:
         """
         Sends a prompt to the Anthropic API and returns the response.
-        Handles API errors with retries and exponential backoff.
+        Handles API errors with retries and exponential backoff. A streamed response
+        is stopped, and None returned, as soon as stream_monitor asks to abort it.
         """
         retries = 0
         while retries < config.MAX_API_RETRIES:
             full_response = ""
+            if stream_monitor is not None:
+                # A retry is a new response; never judge it against the failed one
+                stream_monitor.reset()
             try:
                 self.console.print(
                     Panel(
@@ -108,8 +120,17 @@ class AnthropicClient(LLMClientInterface):
 
                                 print(text, end="", flush=True)
                                 full_response += text
+                                # Leaving the stream's context closes the connection
+                                if stream_monitor is not None and stream_monitor.feed(text):
+                                    break
 
                         print()  # Newline after streaming
+                        # The last paragraph has no blank line after it to trigger its checks
+                        if stream_monitor is not None and stream_monitor.finish():
+                            self.console.print(
+                                f"[yellow]Stopped generation early: {stream_monitor.alert.description}[/yellow]"
+                            )
+                            return None
                 else:
                     # Non-streaming response
                     with Progress(
@@ -186,3 +207,63 @@ class AnthropicClient(LLMClientInterface):
                 return None
 
         return None
+
+    def get_structured_response(
+        self, prompt: str, task_description: str, schema: dict, schema_name: str
+    ) -> dict | None:
+        """
+        Sends a prompt to the Anthropic API with the response constrained to a JSON schema.
+        Returns None on any failure so the caller can fall back to a text response.
+        """
+        self.console.print(
+            Panel(
+                f"[yellow]Sending structured request to Anthropic ({task_description})...[/yellow]",
+                border_style="dim",
+            )
+        )
+        try:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                transient=True,
+            ) as progress:
+                progress.add_task(description="[cyan]Anthropic is thinking...", total=None)
+                response = self.client.messages.create(
+                    max_tokens=config.ANTHROPIC_MAX_TOKENS,
+                    messages=[{"role": "user", "content": prompt}],
+                    model=config.ANTHROPIC_MODEL_NAME,
+                    tools=[
+                        {
+                            "name": schema_name,
+                            "description": "Return the generated content as structured data.",
+                            "input_schema": schema,
+                        }
+                    ],
+                    tool_choice={"type": "tool", "name": schema_name},
+                )
+
+            data = next(
+                (
+                    block.input
+                    for block in response.content
+                    if block.type == "tool_use" and block.name == schema_name
+                ),
+                None,
+            )
+            if not isinstance(data, dict):
+                self.console.print("[yellow]Response did not contain the expected tool call.[/yellow]")
+                return None
+
+            self.console.print(
+                Panel(
+                    "[green]✓ Anthropic structured response received successfully.[/green]",
+                    border_style="dim",
+                )
+            )
+            return data
+        except Exception as e:
+            self.console.print(
+                f"[yellow]Structured output failed ({type(e).__name__}: {e}); "
+                "falling back to a text response.[/yellow]"
+            )
+            return None
@@ -0,0 +1,168 @@
+"""
+book_analysis.py - Whole-book analysis fanned out over a process pool.
+
+Slop detection, quality metrics and engagement analysis are CPU-bound regex work
+that depends on one chapter at a time, so chapters are sent to worker processes as
+plain paragraph text and analyzed in parallel. Continuity tracking carries entity
+state from chapter to chapter, so it runs in this process, in chapter order, once
+the per-chapter results are back. Small books are analyzed in-process, where
+starting workers would cost more than it saves.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pickle import PicklingError
+
+from src import config
+from src.continuity_manager import ContinuityIssue, ContinuityManager
+from src.engagement_optimizer import EngagementAnalysis, EngagementOptimizer
+from src.logger import get_logger
+from src.quality_metrics import QualityEvaluator, QualityMetrics
+from src.text_analysis import TextAnalysis
+
+logger = get_logger(__name__)
+
+# (chapter id, summary, paragraph texts): all a worker needs to analyze a chapter
+ChapterText = tuple[str, str, list[str]]
+
+
+@dataclass(slots=True)
+class ChapterAnalysis:
+    """Analysis results for one chapter."""
+
+    chapter_id: str
+    quality: QualityMetrics  # Includes the slop analysis
+    engagement: EngagementAnalysis
+    continuity_issues: list[ContinuityIssue] = field(default_factory=list)
+    seconds: float = 0.0  # CPU time spent analyzing the chapter
+
+
+@dataclass(slots=True)
+class BookAnalysis:
+    """Analysis results for a whole book, with how the work was spread."""
+
+    chapters: list[ChapterAnalysis]
+    workers: int  # 1 when analyzed in-process
+    elapsed_seconds: float
+
+    @property
+    def busy_seconds(self) -> float:
+        """CPU time the chapter analyses took in total, as if run one after another."""
+        return sum(chapter.seconds for chapter in self.chapters)
+
+    @property
+    def speedup(self) -> float:
+        """How much faster than analyzing the chapters one by one the analysis ran."""
+        if self.elapsed_seconds <= 0:
+            return 1.0
+        return self.busy_seconds / self.elapsed_seconds
+
+
+# Analyzers of the current process, created once per worker (or per sensitivity in-process)
+_analyzers: dict[str, tuple[QualityEvaluator, EngagementOptimizer]] = {}
+
+
+def _get_analyzers(sensitivity: str) -> tuple[QualityEvaluator, EngagementOptimizer]:
+    if sensitivity not in _analyzers:
+        _analyzers[sensitivity] = (
+            QualityEvaluator(
+                enable_slop_detection=config.ENABLE_SLOP_DETECTION, slop_sensitivity=sensitivity
+            ),
+            EngagementOptimizer(),
+        )
+    return _analyzers[sensitivity]
+
+
+def _analyze_chapter(chapter: ChapterText, sensitivity: str) -> ChapterAnalysis:
+    """Runs the per-chapter analyses; executed in a worker process when parallel."""
+    # CPU time, so workers competing for too few cores do not inflate the speedup
+    start = time.process_time()
+    chapter_id, _, paragraphs = chapter
+    # Tokenised once, for both analyzers
+    content = TextAnalysis("\n".join(paragraphs))
+    quality_evaluator, engagement_optimizer = _get_analyzers(sensitivity)
+    return ChapterAnalysis(
+        chapter_id=chapter_id,
+        quality=quality_evaluator.evaluate_chapter(content),
+        engagement=engagement_optimizer.analyze_chapter_engagement(content),
+        seconds=time.process_time() - start,
+    )
+
+
+def _analyze_chapters(chapters: list[ChapterText], sensitivity: str) -> list[ChapterAnalysis]:
+    """Worker task: analyzes a batch of chapters, so each round trip carries several."""
+    return [_analyze_chapter(chapter, sensitivity) for chapter in chapters]
+
+
+def _resolve_workers(workers: int | None) -> int:
+    if workers is None:
+        workers = config.BOOK_ANALYSIS_WORKERS
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, workers)
+
+
+def analyze_book(
+    chapters: list[ChapterText],
+    sensitivity: str | None = None,
+    workers: int | None = None,
+    continuity: ContinuityManager | None = None,
+    contents: list[TextAnalysis] | None = None,
+) -> BookAnalysis:
+    """
+    Analyzes every chapter of a book, over a process pool when it is worth it.
+
+    Args:
+        chapters: (chapter id, summary, paragraph texts) for each chapter, in book order
+        sensitivity: Slop detection sensitivity (defaults to the configured one)
+        workers: Worker processes (defaults to config.BOOK_ANALYSIS_WORKERS, then the CPU count)
+        continuity: Continuity manager to track the book's entities with (a new one if omitted)
+        contents: TextAnalysis of each chapter's joined paragraphs, when the caller already
+            has them; continuity runs in this process and reuses them
+
+    Returns:
+        BookAnalysis with the chapter results in book order
+    """
+    sensitivity = sensitivity or config.SLOP_DETECTION_SENSITIVITY
+    workers = min(_resolve_workers(workers), len(chapters)) or 1
+    word_count = sum(
+        len(paragraph.split()) for _, _, paragraphs in chapters for paragraph in paragraphs
+    )
+    start = time.perf_counter()
+
+    results = None
+    if workers > 1 and word_count >= config.BOOK_ANALYSIS_PARALLEL_MIN_WORDS:
+        # A few batches per worker balances uneven chapters without a round trip per chapter
+        batch_size = max(1, len(chapters) // (workers * 4))
+        batches = [chapters[i : i + batch_size] for i in range(0, len(chapters), batch_size)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                batch_results = executor.map(
+                    _analyze_chapters, batches, [sensitivity] * len(batches)
+                )
+                results = [analysis for batch in batch_results for analysis in batch]
+        except (OSError, BrokenProcessPool, PicklingError) as e:
+            logger.warning(f"Parallel book analysis unavailable, analyzing in-process: {e}")
+    if results is None:
+        workers = 1
+        results = _analyze_chapters(chapters, sensitivity)
+
+    # Continuity depends on what earlier chapters introduced, so it runs in book order
+    continuity = continuity if continuity is not None else ContinuityManager()
+    if contents is None:
+        contents = [TextAnalysis("\n".join(paragraphs)) for _, _, paragraphs in chapters]
+    for (chapter_id, summary, _), content, analysis in zip(
+        chapters, contents, results, strict=True
+    ):
+        continuity_start = time.process_time()
+        analysis.continuity_issues = continuity.analyze_chapter_for_continuity(
+            chapter_id, content, summary
+        )
+        analysis.seconds += time.process_time() - continuity_start
+
+    return BookAnalysis(
+        chapters=results, workers=workers, elapsed_seconds=time.perf_counter() - start
+    )
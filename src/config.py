@@ -10,6 +10,31 @@ MODEL_NAME = "z-ai/glm4.7"
 MAX_API_RETRIES = 3
 API_RETRY_BACKOFF_FACTOR = 2  # Base seconds for backoff (e.g., 2s, 4s, 8s)
 
+# --- Structured Output Configuration ---
+# Ask clients that support it (the default NVIDIA client, OpenAI, Anthropic, Ollama) for
+# chapters as JSON-schema data instead of XML; failed structured calls use the XML prompt
+ENABLE_STRUCTURED_PATCH_OUTPUT = False
+
+# --- Prompt Context Configuration ---
+# Embed book XML in prompts without indentation, empty elements or (where the task
+# does not edit paragraphs) paragraph ids; False sends ET.tostring output unchanged
+COMPACT_PROMPT_CONTEXT = True
+
+# --- Lorebook Configuration ---
+# Match lorebook keys against whole words only ("Ann" does not match "planned");
+# False matches keys anywhere in the text, as plain substrings
+LOREBOOK_MATCH_WHOLE_WORDS = True
+# Estimated tokens of lorebook entries added to a prompt (0 = no limit); matched entries
+# are ranked by priority and relevance and the lowest-ranked ones left out
+LOREBOOK_CONTEXT_TOKEN_BUDGET = 2000
+# Extra relevance (as a fraction) for entries mentioned at the very end of the text
+LOREBOOK_RECENCY_WEIGHT = 0.5
+# Concurrent LLM requests for bulk lorebook condense/expand operations
+LOREBOOK_BULK_CONCURRENCY = 4
+# Default word limits for "condense all long entries" and "expand all stub entries"
+LOREBOOK_CONDENSE_MIN_WORDS = 300
+LOREBOOK_STUB_MAX_WORDS = 40
+
 # --- Formatting and Naming Conventions ---
 TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 DATE_FORMAT_FOR_FOLDER = "%Y%m%d"
@@ -33,6 +58,28 @@ AUTO_CLEAN_SLOP = True
 SLOP_DETECTION_SENSITIVITY = "medium"
 # Show detailed slop reports in console
 SHOW_SLOP_REPORTS = True
+# Paragraphs whose detection results are kept for re-checking edited chapters
+SLOP_CACHE_MAX_PARAGRAPHS = 20000
+
+# --- Streaming Slop Monitor Configuration ---
+# Watch streamed responses and stop the ones that degenerate before they finish
+ENABLE_STREAM_MONITOR = True
+# Share of repeated 4-word phrases among the recent words that counts as a degenerate loop (0-1)
+STREAM_REPETITION_THRESHOLD = 0.5
+# Recent words the repetition share is computed over
+STREAM_REPETITION_WINDOW_WORDS = 120
+# Stop when the mean slop score (0-10, higher is cleaner) of the latest paragraphs falls below this
+STREAM_MIN_SLOP_SCORE = 5.0
+# Paragraphs the rolling slop score averages over
+STREAM_SLOP_WINDOW_PARAGRAPHS = 3
+# Times a stopped request is re-prompted; the last attempt is kept even if it alerts
+STREAM_MAX_REPROMPTS = 1
+
+# --- Book Analysis Configuration ---
+# Worker processes for whole-book analysis (None = one per CPU core)
+BOOK_ANALYSIS_WORKERS = None
+# Books shorter than this are analyzed in-process, where starting workers costs more than it saves
+BOOK_ANALYSIS_PARALLEL_MIN_WORDS = 20000
 
 # --- Adaptive Sub-beat Configuration ---
 # Target word count per chapter (used for calculating sub-beat count)
@@ -97,12 +144,15 @@ MIN_DIALOGUE_RATIO = 0.15  # At least 15% should be dialogue
 MAX_DIALOGUE_RATIO = 0.70  # At most 70% should be dialogue
 # Sentence variety threshold (short < 10, medium 10-25, long > 25 words)
 MIN_SENTENCE_VARIETY_SCORE = 5  # Score 1-10, below this lacks variety
-# Vocabulary richness threshold (unique word ratio)
+# Vocabulary richness threshold (moving-average type-token ratio)
 MIN_VOCABULARY_RICHNESS_SCORE = 6  # Score 1-10, below this is poor vocabulary
 # Auto-reject content that doesn't meet thresholds
 AUTO_REJECT_BELOW_THRESHOLDS = True
 # Maximum auto-regeneration attempts per chapter
 MAX_AUTO_REGEN_ATTEMPTS = 2
+# Words per window of the moving-average type-token ratio (MATTR); the vocabulary
+# richness bands in quality_metrics are calibrated for 50
+MATTR_WINDOW_WORDS = 50
 
 # --- Continuity Management Configuration ---
 # Enable/disable continuity tracking
@@ -130,6 +180,20 @@ MAX_REGENERATION_ATTEMPTS = 3
 # Number of versions to keep per chapter
 VERSIONS_TO_KEEP = 3
 
+# --- Patch History Retention Configuration ---
+# Compress and deduplicate old patch-NN.xml snapshots into the project's history/ folder
+ENABLE_PATCH_HISTORY_RETENTION = True
+# Number of newest snapshots kept uncompressed in the project folder (minimum 1)
+PATCH_HISTORY_KEEP_LAST = 5
+# Of the older snapshots, archive every Kth patch number and delete the rest (1 = keep all)
+PATCH_HISTORY_KEEP_EVERY = 1
+
+# --- Project Storage Configuration ---
+# Storage backend for new projects: "xml" (outline.xml + patch-NN.xml snapshots) or
+# "sqlite" (a single project.db with indexed chapter history). Existing projects keep
+# their backend until migrated from the editing menu's "Project Storage" option.
+PROJECT_STORAGE_BACKEND = "xml"
+
 # --- Content Enhancement Configuration ---
 # Enable/disable content enhancement tools
 ENABLE_CONTENT_ENHANCEMENTS = True
@@ -6,6 +6,8 @@ from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
 
+from src.text_analysis import TextAnalysis
+
 
 class DialogueTag(str, Enum):
     """Types of dialogue tags."""
@@ -363,19 +365,21 @@ Consider:
 - A character commits to a course of action
 """
 
-    def analyze_dialogue_tags(self, content_text: str) -> DialogueTagAnalysis:
+    def analyze_dialogue_tags(self, content_text: str | TextAnalysis) -> DialogueTagAnalysis:
         """
         Analyze dialogue tag usage for variety and overuse.
 
         Args:
-            content_text: Prose content to analyze
+            content_text: Prose content to analyze, or its shared TextAnalysis
 
         Returns:
             DialogueTagAnalysis with counts and suggestions
         """
+        analysis = TextAnalysis.of(content_text)
+        content_text = analysis.text
         # Extract dialogue with tags
         dialogue_pattern = r'"([^"]*)"\s+([a-z]+)'
-        matches = re.findall(dialogue_pattern, content_text.lower())
+        matches = re.findall(dialogue_pattern, analysis.lower)
 
         if not matches:
             return DialogueTagAnalysis(
@@ -434,19 +438,17 @@ Consider:
             suggestions=suggestions,
         )
 
-    def analyze_sentence_variety_detailed(self, content_text: str) -> SentenceVarietyAnalysis:
+    def analyze_sentence_variety_detailed(self, content_text: str | TextAnalysis) -> SentenceVarietyAnalysis:
         """
         Detailed sentence variety analysis.
 
         Args:
-            content_text: Prose content to analyze
+            content_text: Prose content to analyze, or its shared TextAnalysis
 
         Returns:
             SentenceVarietyAnalysis with detailed metrics
         """
-        # Split into sentences
-        sentences = re.split(r"[.!?]+", content_text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentences = TextAnalysis.of(content_text).sentences
 
         if not sentences:
             return SentenceVarietyAnalysis(
@@ -635,32 +637,33 @@ Consider:
 
         return "\n".join(prompt_parts)
 
-    def get_quick_suggestions(self, content_text: str, chapter_summary: str = "") -> list[str]:
+    def get_quick_suggestions(self, content_text: str | TextAnalysis, chapter_summary: str = "") -> list[str]:
         """
         Get quick improvement suggestions for content.
 
         Args:
-            content_text: Prose content
+            content_text: Prose content, or its shared TextAnalysis
             chapter_summary: Chapter summary (optional)
 
         Returns:
             List of prioritized suggestions
         """
         suggestions = []
+        # Tokenised once for all of the checks below
+        analysis = TextAnalysis.of(content_text)
 
         # Check dialogue tags
-        dialogue_analysis = self.analyze_dialogue_tags(content_text)
+        dialogue_analysis = self.analyze_dialogue_tags(analysis)
         if dialogue_analysis.suggestions:
             suggestions.extend(dialogue_analysis.suggestions[:2])
 
         # Check sentence variety
-        sentence_analysis = self.analyze_sentence_variety_detailed(content_text)
+        sentence_analysis = self.analyze_sentence_variety_detailed(analysis)
         if sentence_analysis.suggestions:
             suggestions.extend(sentence_analysis.suggestions[:2])
 
         # Check for repeated words
-        words = re.findall(r"\b\w+\b", content_text.lower())
-        word_counts = Counter(words)
+        word_counts = analysis.word_counts
         repeated_words = [(w, c) for w, c in word_counts.items() if c > 5 and len(w) > 4]
         repeated_words.sort(key=lambda x: x[1], reverse=True)
 
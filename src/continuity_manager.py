@@ -8,6 +8,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Set, Tuple
 
+from src.text_analysis import TextAnalysis
+
 
 class EntityType(str, Enum):
     """Types of entities to track for continuity."""
@@ -62,20 +64,22 @@ class ContinuityManager:
         self.issues: List[ContinuityIssue] = []
 
     def analyze_chapter_for_continuity(
-        self, chapter_id: str, content_text: str, chapter_summary: str = ""
+        self, chapter_id: str, content_text: str | TextAnalysis, chapter_summary: str = ""
     ) -> List[ContinuityIssue]:
         """
         Analyze a chapter for continuity issues.
 
         Args:
             chapter_id: Chapter identifier
-            content_text: Prose content to analyze
+            content_text: Prose content to analyze, or its shared TextAnalysis
             chapter_summary: Chapter summary for context
 
         Returns:
             List of continuity issues found
         """
         chapter_issues = []
+        analysis = TextAnalysis.of(content_text)
+        content_text = analysis.text
 
         # Extract proper nouns and track first mentions
         proper_nouns = self._extract_proper_nouns(content_text)
@@ -87,12 +91,12 @@ class ContinuityManager:
             if entity_key in self.entities:
                 # Entity exists - check for consistency
                 entity = self.entities[entity_key]
-                self._check_entity_consistency(entity, noun, content_text, chapter_issues)
+                self._check_entity_consistency(entity, noun, analysis, chapter_issues)
             else:
                 # New entity - record first mention
-                position = content_text.lower().find(noun.lower())
+                position = analysis.lower.find(noun.lower())
                 if position >= 0:
-                    entity_type = self._classify_entity(noun, chapter_summary, content_text)
+                    entity_type = self._classify_entity(noun, chapter_summary, analysis)
                     self.entities[entity_key] = Entity(
                         name=noun,
                         entity_type=entity_type,
@@ -114,7 +118,7 @@ class ContinuityManager:
                     pass
 
         # Check world rule violations
-        self._check_world_rule_compliance(chapter_id, content_text, chapter_issues)
+        self._check_world_rule_compliance(chapter_id, analysis, chapter_issues)
 
         # Track issues
         self.issues.extend(chapter_issues)
@@ -132,8 +136,7 @@ class ContinuityManager:
 
         # Match capitalized words mid-sentence
         mid_sentence_caps = re.findall(r"(?:^|[.!?]\s+)([A-Z][a-zA-Z]+)", text)
-        for match in mid_sentence_caps:
-            word = match.group(1)
+        for word in mid_sentence_caps:
             # Filter out common words that get capitalized
             if word.lower() not in [
                 "the",
@@ -159,7 +162,7 @@ class ContinuityManager:
         """Normalize entity name for consistent tracking."""
         return name.lower().strip()
 
-    def _classify_entity(self, name: str, summary: str, content: str) -> EntityType:
+    def _classify_entity(self, name: str, summary: str, content: str | TextAnalysis) -> EntityType:
         """
         Classify an entity as character, place, object, or concept.
         """
@@ -192,7 +195,7 @@ class ContinuityManager:
 
         # Character indicators (verbs/actions associated with people)
         char_indicators = ["walked", "said", "shouted", "ran", "thought", "felt", "saw"]
-        text_lower = content.lower()
+        text_lower = TextAnalysis.of(content).lower
         if any(f"{name_lower} {ind}" in text_lower for ind in char_indicators):
             return EntityType.CHARACTER
 
@@ -212,7 +215,11 @@ class ContinuityManager:
         return False
 
     def _check_entity_consistency(
-        self, entity: Entity, current_name: str, content_text: str, issues: List[ContinuityIssue]
+        self,
+        entity: Entity,
+        current_name: str,
+        content_text: str | TextAnalysis,
+        issues: List[ContinuityIssue],
     ) -> None:
         """
         Check if entity is used consistently.
@@ -232,14 +239,13 @@ class ContinuityManager:
                 )
             )
 
-    def _find_spelling_variations(self, original_name: str, text: str) -> List[str]:
+    def _find_spelling_variations(self, original_name: str, text: str | TextAnalysis) -> List[str]:
         """Find potential spelling variations of an entity name."""
         variations = []
-        text_lower = text.lower()
         original_lower = original_name.lower()
 
         # Simple Levenshtein-like approximation
-        for word in re.findall(r"\b[A-Z][a-z]+\b", text):
+        for word in TextAnalysis.of(text).capitalized_words:
             word_lower = word.lower()
             if word_lower != original_lower and len(word_lower) == len(original_lower):
                 # Same length, different - possible typo
@@ -263,13 +269,13 @@ class ContinuityManager:
         )
 
     def _check_world_rule_compliance(
-        self, chapter_id: str, content_text: str, issues: List[ContinuityIssue]
+        self, chapter_id: str, content_text: str | TextAnalysis, issues: List[ContinuityIssue]
     ) -> None:
         """Check if chapter violates any established world rules."""
         if not self.world_rules:
             return
 
-        content_lower = content_text.lower()
+        content_lower = TextAnalysis.of(content_text).lower
 
         for rule_name, rule in self.world_rules.items():
             # Simple heuristic: if rule contains keywords and content contradicts
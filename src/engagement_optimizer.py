@@ -8,6 +8,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Dict, List
 
+from src.text_analysis import TextAnalysis
+
 
 class EmotionalBeat(str, Enum):
     """Types of emotional beats in narrative."""
@@ -43,6 +45,311 @@ class EngagementAnalysis:
     overall_engagement_score: float
 
 
+# Words and phrases suggesting each emotional beat, in the order a sentence is checked for them
+_BEAT_WORDS = {
+    EmotionalBeat.TENSION_BUILD: (
+        "worried",
+        "feared",
+        "tense",
+        "anxious",
+        "nervous",
+        "danger",
+        "threat",
+        "rising",
+        "building",
+        "growing",
+        "increasing",
+    ),
+    EmotionalBeat.CONFLICT: (
+        "fight",
+        "argued",
+        "clashed",
+        "struggled",
+        "battle",
+        "war",
+        "angry",
+        "furious",
+        "rage",
+        "violence",
+        "confronted",
+    ),
+    EmotionalBeat.CLIMAX: (
+        "exploded",
+        "shattered",
+        "crashed",
+        "screamed",
+        "died",
+        "dying",
+        "everything changed",
+        "nothing would ever be the same",
+        "ultimate",
+        "final",
+    ),
+    EmotionalBeat.RELEASE: (
+        "sighed",
+        "relaxed",
+        "calmed",
+        "peaceful",
+        "relief",
+        "safe",
+        "finally",
+        "over",
+        "done",
+        "settled",
+    ),
+    EmotionalBeat.RESOLUTION: (
+        "learned",
+        "understood",
+        "realized",
+        "accepted",
+        "moved on",
+        "changed",
+        "grown",
+        "forgiven",
+        "together",
+    ),
+}
+_HIGH_INTENSITY_WORDS = (
+    "screamed",
+    "shouted",
+    "cried",
+    "terrified",
+    "horrified",
+    "ecstatic",
+    "overwhelmed",
+    "devastated",
+    "exploded",
+    "shattered",
+)
+_MEDIUM_INTENSITY_WORDS = (
+    "worried",
+    "angry",
+    "happy",
+    "excited",
+    "nervous",
+    "calm",
+    "relieved",
+    "confused",
+    "surprised",
+)
+_HIGH_TENSION_WORDS = (
+    "danger",
+    "death",
+    "kill",
+    "threat",
+    "escape",
+    "urgent",
+    "impossible",
+    "now",
+    "suddenly",
+    "terror",
+    "panic",
+    "die",
+)
+_MEDIUM_TENSION_WORDS = (
+    "worried",
+    "feared",
+    "nervous",
+    "anxious",
+    "concerned",
+    "hesitated",
+    "uncertain",
+    "risk",
+)
+_SUDDEN_ACTION_WORDS = (
+    "suddenly",
+    "instantly",
+    "abruptly",
+    "without warning",
+    "shock",
+    "startled",
+)
+
+
+# Entries used as adjectives, adverbs or participles, matched only as written
+_UNINFLECTED_WORDS = frozenset(
+    {
+        "angry",
+        "anxious",
+        "done",
+        "ecstatic",
+        "final",
+        "forgiven",
+        "furious",
+        "grown",
+        "happy",
+        "impossible",
+        "nervous",
+        "now",
+        "over",
+        "peaceful",
+        "safe",
+        "tense",
+        "together",
+        "ultimate",
+        "uncertain",
+        "understood",
+        "urgent",
+    }
+)
+# Entries used as nouns, matched as written or plural
+_NOUN_WORDS = frozenset({"danger", "death", "relief", "terror", "threat", "violence"})
+# Past forms the suffix rules cannot make
+_IRREGULAR_PAST = {"fight": "fought"}
+_VOWELS = "aeiou"
+
+
+def _inflections(word: str) -> List[str]:
+    """
+    The word and its inflections, by its ending ("die": "dies", "died", "dying";
+    "war": "wars", "warred", "warring"). Participles, adverbs and the listed
+    adjectives are not inflected; the listed nouns only take a plural.
+    """
+    if word in _UNINFLECTED_WORDS or word.endswith(("ed", "ing", "ly")):
+        return [word]
+    sibilant = word.endswith(("s", "sh", "ch", "x", "z"))
+    plural = word + ("es" if sibilant else "s")
+    if word in _NOUN_WORDS:
+        return [word, plural]
+
+    if word.endswith("ie"):
+        forms = [plural, word + "d", word[:-2] + "ying"]
+    elif word.endswith("e"):
+        forms = [plural, word + "d", word[:-1] + "ing"]
+    elif word.endswith("y") and word[-2:-1] not in _VOWELS:
+        forms = [word[:-1] + "ies", word[:-1] + "ied", word + "ing"]
+    elif word.endswith("c"):
+        forms = [plural, word + "ked", word + "king"]
+    elif (
+        len(word) >= 3
+        and word[-1] not in _VOWELS + "wxy"
+        and word[-2] in _VOWELS
+        and word[-3] not in _VOWELS
+        and sum(char in _VOWELS for char in word) == 1
+    ):
+        # One-syllable consonant-vowel-consonant stems double their last letter
+        forms = [plural, word + word[-1] + "ed", word + word[-1] + "ing"]
+    else:
+        forms = [plural, word + "ed", word + "ing"]
+    if word in _IRREGULAR_PAST:
+        forms[1] = _IRREGULAR_PAST[word]
+    return [word, *forms]
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Regex alternation of the words, factored into a trie so that each position of
+    a text follows one branch per character; a space matches any whitespace.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def branch(node: Dict[str, dict]) -> str:
+        alternatives = [
+            (r"\s+" if char == " " else re.escape(char)) + branch(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not alternatives:
+            return ""
+        body = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+        # A word ending here may still continue into a longer one, which is tried first
+        return f"(?:{body})?" if "" in node else body
+
+    return branch(trie)
+
+
+@dataclass(frozen=True)
+class SentenceSignals:
+    """Engagement signals of one sentence, from the words it contains."""
+
+    beat: EmotionalBeat | None  # Beat its words suggest, whatever its position
+    intensity: float  # Emotional intensity: 0.2, 0.5 or 0.8
+    tension: float  # Tension level (0-1)
+
+
+_NO_SIGNALS = SentenceSignals(beat=None, intensity=0.2, tension=0.0)
+
+
+class EngagementLexicon:
+    """
+    The engagement word lists, compiled once into one regex and a lookup table.
+
+    The regex matches sentence-ending punctuation or any entry as whole words, so
+    one scan of a text finds the entries of every list in every sentence. Word
+    entries match whole words, or an inflection of the word: "kill" matches
+    "killed" but "now" does not match "know", nor "war" "toward". Phrases match as
+    written, and take the words they contain, so "everything changed" is not also
+    "changed".
+    """
+
+    def __init__(self, word_lists: Dict[str, tuple]) -> None:
+        """
+        Args:
+            word_lists: Entries (lowercase words or phrases) of each list, by list name
+        """
+        self.lists = {name: frozenset(entries) for name, entries in word_lists.items()}
+        forms: Dict[str, set] = {}
+        for entry in set().union(*self.lists.values()):
+            for form in [entry] if " " in entry else _inflections(entry):
+                forms.setdefault(form, set()).add(entry)
+        # Word or phrase as it may appear in a text -> entries it matches
+        self._forms = {form: frozenset(entries) for form, entries in forms.items()}
+        self._pattern = re.compile(r"[.!?]+|\b" + _trie_pattern(sorted(self._forms)) + r"\b")
+
+    def sentence_entries(self, lowered: str) -> List[set]:
+        """
+        Entries found in each sentence of a lowercased text, indexed as
+        TextAnalysis.sentence_pieces splits it.
+        """
+        found: List[set] = [set()]
+        forms = self._forms
+        for match in self._pattern.findall(lowered.strip()):
+            if match[0] in ".!?":
+                found.append(set())
+            else:
+                found[-1].update(forms[" ".join(match.split())])
+        return found
+
+    def entries(self, text: str) -> set:
+        """Entries found anywhere in a text."""
+        return set().union(*self.sentence_entries(text.lower()))
+
+    def signals(self, entries: set) -> SentenceSignals:
+        """Signals of a sentence containing the given entries."""
+        if not entries:
+            return _NO_SIGNALS
+        lists = self.lists
+        beat = next((beat for beat in _BEAT_WORDS if entries & lists[beat]), None)
+        if entries & lists["high_intensity"]:
+            intensity = 0.8
+        elif entries & lists["medium_intensity"]:
+            intensity = 0.5
+        else:
+            intensity = 0.2
+        tension = (
+            len(entries & lists["high_tension"]) * 0.4
+            + len(entries & lists["medium_tension"]) * 0.2
+        )
+        return SentenceSignals(beat=beat, intensity=intensity, tension=min(1.0, tension))
+
+
+_LEXICON = EngagementLexicon(
+    {
+        **_BEAT_WORDS,
+        "high_intensity": _HIGH_INTENSITY_WORDS,
+        "medium_intensity": _MEDIUM_INTENSITY_WORDS,
+        "high_tension": _HIGH_TENSION_WORDS,
+        "medium_tension": _MEDIUM_TENSION_WORDS,
+        "sudden_action": _SUDDEN_ACTION_WORDS,
+    }
+)
+
+
 class EngagementOptimizer:
     """Analyzes and optimizes reader engagement in content."""
 
@@ -56,23 +363,26 @@ class EngagementOptimizer:
             r"(?i)(?:the|a|an)\s+(?:door|sound|voice|figure)\s+(?:opened|called|appeared)",
             r"\.\.\.$",
         ]
+        self._lexicon = _LEXICON
 
     def analyze_chapter_engagement(
-        self, content_text: str, chapter_context: Dict | None = None
+        self, content_text: str | TextAnalysis, chapter_context: Dict | None = None
     ) -> EngagementAnalysis:
         """
         Analyze chapter for engagement elements.
 
         Args:
-            content_text: The prose content of the chapter
+            content_text: The prose content of the chapter, or its shared TextAnalysis
             chapter_context: Additional context about the chapter (position, etc.)
 
         Returns:
             EngagementAnalysis with findings and suggestions
         """
-        cliffhanger_analysis = self._analyze_cliffhanger(content_text)
-        emotional_arc = self._analyze_emotional_arc(content_text)
-        tension_cycles = self._analyze_tension_cycles(content_text)
+        analysis = TextAnalysis.of(content_text)
+        signals = self._sentence_signals(analysis)
+        cliffhanger_analysis = self._analyze_cliffhanger(analysis)
+        emotional_arc = self._analyze_emotional_arc(analysis, signals)
+        tension_cycles = self._analyze_tension_cycles(analysis, signals)
         suggestions = self._generate_engagement_suggestions(
             cliffhanger_analysis, emotional_arc, tension_cycles, chapter_context
         )
@@ -93,20 +403,21 @@ class EngagementOptimizer:
             overall_engagement_score=overall_score,
         )
 
-    def _analyze_cliffhanger(self, text: str) -> Dict:
+    def _analyze_cliffhanger(self, text: str | TextAnalysis) -> Dict:
         """
         Analyze if the chapter ends with a cliffhanger.
         Returns analysis dict with has_cliffhanger and strength (0-1).
         """
-        if not text or not text.strip():
+        analysis = TextAnalysis.of(text)
+        if not analysis.text or not analysis.text.strip():
             return {"has_cliffhanger": False, "strength": 0.0}
 
-        sentences = re.split(r"[.!?]+", text.strip())
+        sentences = analysis.sentence_pieces
         if not sentences:
             return {"has_cliffhanger": False, "strength": 0.0}
 
         last_sentence = sentences[-1].strip()
-        last_paragraph = self._get_last_paragraph(text)
+        last_paragraph = self._get_last_paragraph(analysis)
 
         cliffhanger_indicators = 0
 
@@ -131,14 +442,29 @@ class EngagementOptimizer:
 
         return {"has_cliffhanger": has_cliffhanger, "strength": strength}
 
-    def _analyze_emotional_arc(self, text: str) -> Dict:
+    def _sentence_signals(self, text: str | TextAnalysis) -> List[SentenceSignals]:
+        """
+        Signals of each of the text's sentence pieces, from one scan of its lowercase view.
+        """
+        analysis = TextAnalysis.of(text)
+        return [
+            self._lexicon.signals(entries)
+            for entries in self._lexicon.sentence_entries(analysis.lower)
+        ]
+
+    def _analyze_emotional_arc(
+        self, text: str | TextAnalysis, signals: List[SentenceSignals] | None = None
+    ) -> Dict:
         """
         Analyze the emotional arc of the chapter.
         Returns dict with score (0-1) and beat data.
         """
-        sentences = re.split(r"[.!?]+", text.strip())
+        analysis = TextAnalysis.of(text)
+        sentences = analysis.sentence_pieces
         if not sentences:
             return {"score": 0.0, "beats": []}
+        if signals is None:
+            signals = self._sentence_signals(analysis)
 
         beats = []
         total_sentences = len(sentences)
@@ -148,8 +474,8 @@ class EngagementOptimizer:
                 continue
 
             position = i / total_sentences
-            beat_type = self._detect_emotional_beat(sentence, position)
-            intensity = self._measure_emotional_intensity(sentence)
+            beat_type = EmotionalBeat.SETUP if position < 0.2 else signals[i].beat
+            intensity = signals[i].intensity
 
             if beat_type:
                 beats.append(
@@ -169,125 +495,15 @@ class EngagementOptimizer:
         """
         Detect the type of emotional beat in a sentence.
         """
-        sentence_lower = sentence.lower()
-
         if position < 0.2:
             return EmotionalBeat.SETUP
-
-        tension_words = [
-            "worried",
-            "feared",
-            "tense",
-            "anxious",
-            "nervous",
-            "danger",
-            "threat",
-            "rising",
-            "building",
-            "growing",
-            "increasing",
-        ]
-        if any(word in sentence_lower for word in tension_words):
-            return EmotionalBeat.TENSION_BUILD
-
-        conflict_words = [
-            "fight",
-            "argued",
-            "clashed",
-            "struggled",
-            "battle",
-            "war",
-            "angry",
-            "furious",
-            "rage",
-            "violence",
-            "confronted",
-        ]
-        if any(word in sentence_lower for word in conflict_words):
-            return EmotionalBeat.CONFLICT
-
-        climax_words = [
-            "exploded",
-            "shattered",
-            "crashed",
-            "screamed",
-            "died",
-            "dying",
-            "everything changed",
-            "nothing would ever be the same",
-            "ultimate",
-            "final",
-        ]
-        if any(word in sentence_lower for word in climax_words):
-            return EmotionalBeat.CLIMAX
-
-        release_words = [
-            "sighed",
-            "relaxed",
-            "calmed",
-            "peaceful",
-            "relief",
-            "safe",
-            "finally",
-            "over",
-            "done",
-            "settled",
-        ]
-        if any(word in sentence_lower for word in release_words):
-            return EmotionalBeat.RELEASE
-
-        resolution_words = [
-            "learned",
-            "understood",
-            "realized",
-            "accepted",
-            "moved on",
-            "changed",
-            "grown",
-            "forgiven",
-            "together",
-        ]
-        if any(word in sentence_lower for word in resolution_words):
-            return EmotionalBeat.RESOLUTION
-
-        return None
+        return self._lexicon.signals(self._lexicon.entries(sentence)).beat
 
     def _measure_emotional_intensity(self, sentence: str) -> float:
         """
         Measure the emotional intensity of a sentence (0-1).
         """
-        high_intensity_words = [
-            "screamed",
-            "shouted",
-            "cried",
-            "terrified",
-            "horrified",
-            "ecstatic",
-            "overwhelmed",
-            "devastated",
-            "exploded",
-            "shattered",
-        ]
-        medium_intensity_words = [
-            "worried",
-            "angry",
-            "happy",
-            "excited",
-            "nervous",
-            "calm",
-            "relieved",
-            "confused",
-            "surprised",
-        ]
-
-        sentence_lower = sentence.lower()
-
-        if any(word in sentence_lower for word in high_intensity_words):
-            return 0.8
-        elif any(word in sentence_lower for word in medium_intensity_words):
-            return 0.5
-
-        return 0.2
+        return self._lexicon.signals(self._lexicon.entries(sentence)).intensity
 
     def _evaluate_emotional_arc_quality(self, beats: List[Dict], total_sentences: int) -> float:
         """
@@ -320,14 +536,19 @@ class EngagementOptimizer:
 
         return min(1.0, score)
 
-    def _analyze_tension_cycles(self, text: str) -> List[Dict]:
+    def _analyze_tension_cycles(
+        self, text: str | TextAnalysis, signals: List[SentenceSignals] | None = None
+    ) -> List[Dict]:
         """
         Identify tension/release cycles in the chapter.
         Returns list of cycle data.
         """
-        sentences = re.split(r"[.!?]+", text.strip())
+        analysis = TextAnalysis.of(text)
+        sentences = analysis.sentence_pieces
         if not sentences:
             return []
+        if signals is None:
+            signals = self._sentence_signals(analysis)
 
         cycles = []
         current_tension = 0.0
@@ -337,7 +558,7 @@ class EngagementOptimizer:
             if not sentence.strip():
                 continue
 
-            sentence_tension = self._measure_tension_level(sentence)
+            sentence_tension = signals[i].tension
 
             if sentence_tension > 0.5 and not in_tension:
                 cycles.append(
@@ -358,38 +579,7 @@ class EngagementOptimizer:
         """
         Measure the tension level of a sentence (0-1).
         """
-        high_tension_words = [
-            "danger",
-            "death",
-            "kill",
-            "threat",
-            "escape",
-            "urgent",
-            "impossible",
-            "now",
-            "suddenly",
-            "terror",
-            "panic",
-            "die",
-        ]
-        medium_tension_words = [
-            "worried",
-            "feared",
-            "nervous",
-            "anxious",
-            "concerned",
-            "hesitated",
-            "uncertain",
-            "risk",
-        ]
-
-        sentence_lower = sentence.lower()
-
-        high_count = sum(1 for word in high_tension_words if word in sentence_lower)
-        medium_count = sum(1 for word in medium_tension_words if word in sentence_lower)
-
-        tension_score = (high_count * 0.4) + (medium_count * 0.2)
-        return min(1.0, tension_score)
+        return self._lexicon.signals(self._lexicon.entries(sentence)).tension
 
     def _generate_engagement_suggestions(
         self,
@@ -465,9 +655,9 @@ class EngagementOptimizer:
 
         return round(sum(scores) / len(scores), 2)
 
-    def _get_last_paragraph(self, text: str) -> str:
+    def _get_last_paragraph(self, text: str | TextAnalysis) -> str:
         """Get the last paragraph of the text."""
-        paragraphs = re.split(r"\n\n+", text.strip())
+        paragraphs = TextAnalysis.of(text).paragraphs
         return paragraphs[-1] if paragraphs else ""
 
     def _has_unresolved_question(self, text: str) -> bool:
@@ -480,15 +670,7 @@ class EngagementOptimizer:
 
     def _has_sudden_action(self, text: str) -> bool:
         """Check if text indicates sudden action."""
-        sudden_action_words = [
-            "suddenly",
-            "instantly",
-            "abruptly",
-            "without warning",
-            "shock",
-            "startled",
-        ]
-        return any(word in text.lower() for word in sudden_action_words)
+        return bool(self._lexicon.entries(text) & self._lexicon.lists["sudden_action"])
 
     def generate_cliffhanger_suggestion(
         self, content_text: str, chapter_summary: str = "", next_chapter_summary: str = ""
@@ -57,8 +57,6 @@ class ExportManager:
 
     def _edit_frontmatter_menu(self) -> None:
         """Displays the frontmatter editing menu."""
-        from src import utils
-
         frontmatter_options = {
             "1": ("Edit Author Name", lambda: self._edit_author_name()),
             "2": ("Edit Book Title", lambda: self._edit_book_title()),
@@ -79,7 +77,7 @@ class ExportManager:
                 handler()
                 # Save changes after editing
                 if self.project.book_root is not None:
-                    patch_num = utils.get_next_patch_number(self.project.book_dir)
+                    patch_num = self.project.next_patch_number()
                     self.project.save_state(f"patch-{patch_num:02d}.xml")
             else:
                 break  # Return to Export Menu
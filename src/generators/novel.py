@@ -1,11 +1,10 @@
 """
 novel.py - Contains the specific logic for generating a novel outline.
 """
-import xml.etree.ElementTree as ET
 
 from rich.panel import Panel
 
-from src import ui
+from src import ui, utils
 from src.llm_client import LLMClient
 from src.project import Project
 
@@ -20,7 +19,7 @@ def generate_outline(llm_client: LLMClient, project: Project, lorebook_context:
     # Get required info from the user
     num_chapters = ui.prompt_for_chapter_count()
 
-    current_book_xml_for_prompt = ET.tostring(project.book_root, encoding="unicode")
+    current_book_xml_for_prompt = utils.xml_for_prompt(project.book_root, paragraph_ids=False)
 
     prompt = f"""
 You are a creative assistant tasked with expanding a book concept into a detailed novel outline.
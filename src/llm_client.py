@@ -2,13 +2,15 @@
 llm_client.py - Manages all interactions with the OpenAI API.
 """
 
+import asyncio
 import getpass
 import os
 import sys
 import time
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 _USE_COLOR = sys.stdout.isatty() and os.getenv("NO_COLOR") is None
 _REASONING_COLOR = "\033[90m" if _USE_COLOR else ""
@@ -19,11 +21,20 @@ from rich.panel import Panel
 from rich.prompt import Confirm
 
 from src import config
+from src.structured_output import parse_structured_json
+
+if TYPE_CHECKING:
+    from src.stream_monitor import StreamingSlopMonitor
+
+_NVIDIA_BASE_URL = "https://integrate.api.nvidia.com/v1"
 
 
 class LLMClient:
     """A client to handle all communication with the OpenAI API."""
 
+    # get_response accepts a stream_monitor that can stop a degenerate response early
+    supports_stream_monitor = True
+
     def __init__(self, console: Console) -> None:
         self.console = console
         self.api_key = self._get_api_key()
@@ -32,6 +43,8 @@ class LLMClient:
         self.client = self._init_client()
         if not self.client:
             raise ConnectionError("Failed to initialize the OpenAI client.")
+        # Created on first use by get_response_async
+        self.async_client: AsyncOpenAI | None = None
 
     def _get_api_key(self) -> str | None:
         """Gets NVIDIA API key from environment variables or prompts the user."""
@@ -52,7 +65,7 @@ class LLMClient:
     def _init_client(self) -> OpenAI | None:
         """Initializes and returns the OpenAI client with NVIDIA endpoint."""
         try:
-            client = OpenAI(base_url="https://integrate.api.nvidia.com/v1", api_key=self.api_key)
+            client = OpenAI(base_url=_NVIDIA_BASE_URL, api_key=self.api_key)
             self.console.print(
                 f"[green]Successfully initialized NVIDIA API client with model '{config.MODEL_NAME}'[/green]"
             )
@@ -69,14 +82,19 @@ class LLMClient:
         prompt_content: str,
         task_description: str = "Generating content",
         allow_stream: bool = False,
+        stream_monitor: "StreamingSlopMonitor | None" = None,
     ) -> str | None:
         """
         Sends a prompt to the LLM and returns the response.
-        Handles API errors with retries and exponential backoff.
+        Handles API errors with retries and exponential backoff. The response is
+        stopped, and None returned, as soon as stream_monitor asks to abort it.
         """
         retries = 0
         while retries < config.MAX_API_RETRIES:
             full_response = ""
+            if stream_monitor is not None:
+                # A retry is a new response; never judge it against the failed one
+                stream_monitor.reset()
             try:
                 self.console.print(
                     Panel(
@@ -116,8 +134,17 @@ class LLMClient:
                         content_piece = str(delta.content)
                         print(content_piece, end="", flush=True)
                         full_response += content_piece
+                        if stream_monitor is not None and stream_monitor.feed(content_piece):
+                            completion.close()
+                            break
 
                 print()  # Newline after response completes
+                # The last paragraph has no blank line after it to trigger its checks
+                if stream_monitor is not None and stream_monitor.finish():
+                    self.console.print(
+                        f"[yellow]Stopped generation early: {stream_monitor.alert.description}[/yellow]"
+                    )
+                    return None
 
                 if not full_response:
                     self.console.print(
@@ -172,3 +199,96 @@ class LLMClient:
                 return None
 
         return None
+
+    def get_structured_response(
+        self, prompt: str, task_description: str, schema: dict, schema_name: str
+    ) -> dict | None:
+        """
+        Sends a prompt with the response constrained to a JSON schema.
+        Returns None on any failure so the caller can fall back to a text response.
+        """
+        self.console.print(
+            Panel(
+                f"[yellow]Sending structured request to GLM5 ({task_description})...[/yellow]",
+                border_style="dim",
+            )
+        )
+        try:
+            assert self.client is not None
+            completion = self.client.chat.completions.create(
+                model=config.MODEL_NAME,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=1,
+                top_p=1,
+                max_tokens=16384,
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {"name": schema_name, "schema": schema, "strict": True},
+                },
+            )
+            content = completion.choices[0].message.content if completion.choices else None
+            data = parse_structured_json(content) if content else None
+            if data is None:
+                self.console.print("[yellow]Structured response was not valid JSON.[/yellow]")
+                return None
+
+            self.console.print(
+                Panel(
+                    "[green]✓ GLM5 structured response received successfully.[/green]",
+                    border_style="dim",
+                )
+            )
+            return data
+        except Exception as e:
+            self.console.print(
+                f"[yellow]Structured output failed ({type(e).__name__}: {e}); "
+                "falling back to a text response.[/yellow]"
+            )
+            return None
+
+    async def get_response_async(
+        self,
+        prompt_content: str,
+        task_description: str = "Generating content",
+        allow_stream: bool = False,
+    ) -> str | None:
+        """
+        Sends a prompt without streaming and returns the response, for concurrent callers.
+
+        Retries with the same exponential backoff as get_response, but without asking
+        the user before each retry, since other requests may be in flight.
+        """
+        if self.async_client is None:
+            self.async_client = AsyncOpenAI(base_url=_NVIDIA_BASE_URL, api_key=self.api_key)
+
+        for attempt in range(1, config.MAX_API_RETRIES + 1):
+            try:
+                completion = await self.async_client.chat.completions.create(
+                    model=config.MODEL_NAME,
+                    messages=[{"role": "user", "content": prompt_content}],
+                    temperature=1,
+                    top_p=1,
+                    max_tokens=16384,
+                )
+                content = completion.choices[0].message.content if completion.choices else None
+                if not content:
+                    self.console.print(
+                        f"[yellow]{task_description}: response contains no text content.[/yellow]"
+                    )
+                    return None
+                return content
+
+            except Exception as e:
+                self.console.print(
+                    f"[bold red]API Error ({task_description}): {type(e).__name__} - {e}[/bold red]"
+                )
+                if "authentication" in str(e).lower():
+                    return None
+
+            if attempt < config.MAX_API_RETRIES:
+                await asyncio.sleep(config.API_RETRY_BACKOFF_FACTOR * (2 ** (attempt - 1)))
+
+        self.console.print(
+            f"[bold red]Maximum retries ({config.MAX_API_RETRIES}) reached for {task_description}.[/bold red]"
+        )
+        return None
@@ -2,14 +2,25 @@
 llm_client_interface.py - Abstract base class for LLM client implementations.
 """
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.stream_monitor import StreamingSlopMonitor
 
 
 class LLMClientInterface(ABC):
     """Abstract base class for LLM client implementations."""
 
+    # get_response accepts a stream_monitor that can stop a degenerate response early
+    supports_stream_monitor = True
+
     @abstractmethod
     def get_response(
-        self, prompt: str, task_description: str, allow_stream: bool = True
+        self,
+        prompt: str,
+        task_description: str,
+        allow_stream: bool = True,
+        stream_monitor: "StreamingSlopMonitor | None" = None,
     ) -> str | None:
         """
         Get a response from the LLM (synchronous).
@@ -18,6 +29,8 @@ class LLMClientInterface(ABC):
             prompt: The input prompt for the LLM
             task_description: Description of the task for UI feedback
             allow_stream: Whether to allow streaming responses
+            stream_monitor: Fed the streamed text, and reset before each retry; the
+                            response is stopped and None returned once it asks to abort
 
         Returns:
             The LLM response as a string, or None if failed
@@ -50,3 +63,23 @@ class LLMClientInterface(ABC):
             True if initialization succeeded, False otherwise
         """
         pass
+
+    def get_structured_response(
+        self, prompt: str, task_description: str, schema: dict, schema_name: str
+    ) -> dict | None:
+        """
+        Get a response constrained to a JSON schema (structured output / tool call).
+
+        Providers without structured-output support keep this default, and callers
+        fall back to get_response with the XML prompt.
+
+        Args:
+            prompt: The input prompt for the LLM
+            task_description: Description of the task for UI feedback
+            schema: JSON schema the response must follow
+            schema_name: Name of the schema (used as the tool name where needed)
+
+        Returns:
+            The decoded response object, or None if unsupported or failed
+        """
+        return None
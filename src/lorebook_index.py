@@ -0,0 +1,424 @@
+"""
+lorebook_index.py - Keyword index for matching lorebook entries against story text.
+
+The index is built once per loaded lorebook: every key of every enabled entry goes
+into a single Aho-Corasick automaton, so finding all entries mentioned in a text is
+one pass over the text regardless of how many keys the lorebook has. By default keys
+match whole words only (the key "Ann" does not match "planned"); the text and the
+keys are split into lowercase word tokens and the automaton runs over the tokens.
+
+Matched entries are ranked for the prompt by BM25-style relevance (key hit counts
+weighted by how few entries share the key), boosted for keys that occur late in the
+text, after any explicit Tavern `order`/`insertion_order` priority, and selected
+until a token budget is filled. Key rarity and entry token counts are computed when
+the index is built.
+
+load_index keeps the built index in a cache file next to the lorebook JSON, keyed
+by the file's mtime, size and SHA-256, so reopening a large lorebook skips both the
+JSON parse and the index build.
+"""
+import hashlib
+import json
+import marshal
+import math
+import os
+import re
+from collections import deque
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from src import config, utils
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Tavern's default insertion order; entries with a higher order are preferred
+DEFAULT_ENTRY_ORDER = 100
+# BM25 term-frequency saturation: repeated hits on one key add less and less
+_BM25_K1 = 1.2
+# Same rough words-to-tokens ratio as the batch generator
+_TOKENS_PER_WORD = 1.3
+# Bumped whenever the cached index layout changes, invalidating existing cache files
+CACHE_FORMAT_VERSION = 1
+
+
+class AhoCorasick:
+    """Multi-pattern matcher over any sequence of hashable symbols (characters or words)."""
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, patterns: Iterable[tuple[Sequence[Hashable], object]]) -> None:
+        """
+        Args:
+            patterns: (pattern, value) pairs; the value is reported for each match.
+                      Empty patterns are ignored.
+        """
+        goto: list[dict] = [{}]
+        out: list[list[tuple[int, object]]] = [[]]
+        for pattern, value in patterns:
+            if not pattern:
+                continue
+            node = 0
+            for symbol in pattern:
+                child = goto[node].get(symbol)
+                if child is None:
+                    child = len(goto)
+                    goto[node][symbol] = child
+                    goto.append({})
+                    out.append([])
+                node = child
+            out[node].append((len(pattern), value))
+
+        # Breadth-first, so every failure target is finished before it is inherited from
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for symbol, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and symbol not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(symbol, 0)
+                if out[fail[child]]:
+                    out[child] = out[child] + out[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    @classmethod
+    def _from_tables(cls, goto: list[dict], fail: list[int], out: list[list]) -> "AhoCorasick":
+        automaton = cls.__new__(cls)
+        automaton._goto, automaton._fail, automaton._out = goto, fail, out
+        return automaton
+
+    def iter_matches(self, sequence: Iterable[Hashable]) -> Iterator[tuple[int, int, object]]:
+        """Yields (start, end, value) for every pattern occurrence, overlapping ones included."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for position, symbol in enumerate(sequence):
+            while node and symbol not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(symbol, 0)
+            if out[node]:
+                end = position + 1
+                for length, value in out[node]:
+                    yield end - length, end, value
+
+
+@dataclass(slots=True)
+class LorebookEntry:
+    """An enabled lorebook entry with its keys normalized to a tuple of strings."""
+
+    title: str
+    content: str
+    keys: tuple[str, ...]
+    order: int = DEFAULT_ENTRY_ORDER
+    tokens: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.tokens:
+            self.tokens = estimate_tokens(format_entry(self.title, self.content))
+
+
+def format_entry(title: str, content: str) -> str:
+    """Formats one entry as it appears in the prompt's lorebook context."""
+    return f"**{title}:**\n{content}\n"
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(utils.count_words(text) * _TOKENS_PER_WORD)
+
+
+def entry_order(entry: dict) -> int:
+    """Returns the Tavern priority of a raw entry ("order", or the card-book "insertion_order")."""
+    for field in ("order", "insertion_order"):
+        value = entry.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return int(value)
+    return DEFAULT_ENTRY_ORDER
+
+
+def iter_raw_entries(lorebook_data) -> list:
+    """Returns the raw entry dicts of a lorebook in any supported layout, in file order."""
+    if not lorebook_data:
+        return []
+    if isinstance(lorebook_data, list):
+        return lorebook_data
+    if "entries" in lorebook_data:
+        entries_data = lorebook_data["entries"]
+        # Both dict (TavernAI format with IDs as keys) and list formats
+        if isinstance(entries_data, dict):
+            return list(entries_data.values())
+        if isinstance(entries_data, list):
+            return entries_data
+        return []
+    return lorebook_data.get("worldInfos") or []
+
+
+def entry_keys(entry: dict) -> list[str]:
+    """Returns an entry's keywords from its "keys" or "key" field (a list or comma-separated)."""
+    keys = entry.get("keys", entry.get("key", []))
+    if isinstance(keys, str):
+        keys = [k.strip() for k in keys.split(",")]
+    elif not isinstance(keys, list):
+        return []
+    return [k for k in keys if isinstance(k, str) and k.strip()]
+
+
+class LorebookIndex:
+    """Enabled lorebook entries and the compiled keyword automaton that finds them."""
+
+    def __init__(
+        self,
+        entries: list[LorebookEntry],
+        whole_words: bool = config.LOREBOOK_MATCH_WHOLE_WORDS,
+        recency_weight: float = config.LOREBOOK_RECENCY_WEIGHT,
+    ) -> None:
+        self.entries = entries
+        self.whole_words = whole_words
+        self.recency_weight = recency_weight
+
+        key_entries: dict[Sequence[str], set[int]] = {}
+        for position, entry in enumerate(entries):
+            for key in entry.keys:
+                pattern = self._normalize(key)
+                if pattern:
+                    key_entries.setdefault(pattern, set()).add(position)
+
+        # BM25 IDF per distinct key: a key shared by many entries says little about any of them
+        count = len(entries)
+        self._key_idf: list[float] = []
+        patterns = []
+        for key_id, (pattern, positions) in enumerate(sorted(key_entries.items())):
+            shared = len(positions)
+            self._key_idf.append(math.log(1 + (count - shared + 0.5) / (shared + 0.5)))
+            patterns.extend((pattern, (position, key_id)) for position in sorted(positions))
+        self._automaton = AhoCorasick(patterns)
+
+    @classmethod
+    def from_data(
+        cls,
+        lorebook_data,
+        whole_words: bool = config.LOREBOOK_MATCH_WHOLE_WORDS,
+        recency_weight: float = config.LOREBOOK_RECENCY_WEIGHT,
+    ) -> "LorebookIndex":
+        """Builds the index from loaded lorebook JSON, skipping disabled and empty entries."""
+        entries = []
+        for entry in iter_raw_entries(lorebook_data):
+            if not isinstance(entry, dict):
+                continue
+            if entry.get("disable", False) or not entry.get("enable", True):
+                continue
+            content = entry.get("content", "").strip()
+            if not content:
+                continue
+            entries.append(
+                LorebookEntry(
+                    title=entry.get("comment", entry.get("title", "Entry")),
+                    content=content,
+                    keys=tuple(entry_keys(entry)),
+                    order=entry_order(entry),
+                )
+            )
+        return cls(entries, whole_words=whole_words, recency_weight=recency_weight)
+
+    def _cache_state(self) -> tuple:
+        """Returns the built index as plain containers that marshal can store."""
+        automaton = self._automaton
+        return (
+            [(e.title, e.content, e.keys, e.order, e.tokens) for e in self.entries],
+            self._key_idf,
+            automaton._goto,
+            automaton._fail,
+            automaton._out,
+        )
+
+    @classmethod
+    def _from_cache_state(
+        cls, state: tuple, whole_words: bool, recency_weight: float
+    ) -> "LorebookIndex":
+        entries, key_idf, goto, fail, out = state
+        index = cls.__new__(cls)
+        index.entries = [
+            LorebookEntry(title, content, tuple(keys), order, tokens)
+            for title, content, keys, order, tokens in entries
+        ]
+        index.whole_words = whole_words
+        index.recency_weight = recency_weight
+        index._key_idf = key_idf
+        index._automaton = AhoCorasick._from_tables(goto, fail, out)
+        return index
+
+    def _normalize(self, text: str) -> Sequence[str]:
+        if self.whole_words:
+            return tuple(_WORD_PATTERN.findall(text.lower()))
+        return text.lower()
+
+    def _key_hits(self, text: str) -> tuple[dict[tuple[int, int], int], dict[int, int], int]:
+        """Returns hit counts per (entry, key), each entry's last hit offset and the text length."""
+        key_hits: dict[tuple[int, int], int] = {}
+        last_hit: dict[int, int] = {}
+        if not self.entries or not text:
+            return key_hits, last_hit, 0
+        symbols = self._normalize(text)
+        for _, end, (position, key_id) in self._automaton.iter_matches(symbols):
+            key_hits[position, key_id] = key_hits.get((position, key_id), 0) + 1
+            last_hit[position] = end
+        return key_hits, last_hit, len(symbols)
+
+    def match(self, text: str) -> dict[int, int]:
+        """
+        Finds the entries whose keys occur in the text.
+
+        Returns:
+            Mapping of entry position (in self.entries) to the number of key occurrences
+        """
+        hits: dict[int, int] = {}
+        for (position, _), count in self._key_hits(text)[0].items():
+            hits[position] = hits.get(position, 0) + count
+        return hits
+
+    def matching_entries(self, text: str) -> list[LorebookEntry]:
+        """Returns the entries mentioned in the text, in lorebook order."""
+        return [self.entries[position] for position in sorted(self.match(text))]
+
+    def score(self, text: str) -> dict[int, float]:
+        """
+        Scores the entries mentioned in the text by relevance.
+
+        Each matched key contributes its IDF times a saturating function of its hit
+        count; the sum is boosted by up to recency_weight for entries mentioned near
+        the end of the text, which is where the story currently is.
+        """
+        key_hits, last_hit, length = self._key_hits(text)
+        scores: dict[int, float] = {}
+        for (position, key_id), count in key_hits.items():
+            saturation = count * (_BM25_K1 + 1) / (count + _BM25_K1)
+            scores[position] = scores.get(position, 0.0) + self._key_idf[key_id] * saturation
+        for position in scores:
+            scores[position] *= 1 + self.recency_weight * last_hit[position] / length
+        return scores
+
+    def select(self, text: str, token_budget: int = 0) -> list[LorebookEntry]:
+        """
+        Returns the entries to include for the text, most important first.
+
+        Entries are ordered by Tavern priority, then relevance score, and added while
+        their estimated tokens fit in token_budget (0 for no limit); an entry too large
+        for the remaining budget is skipped in favour of smaller, lower-ranked ones.
+        """
+        scores = self.score(text)
+        ranked = sorted(scores, key=lambda p: (-self.entries[p].order, -scores[p], p))
+        selected = []
+        used = 0
+        for position in ranked:
+            entry = self.entries[position]
+            if token_budget and used + entry.tokens > token_budget:
+                continue
+            selected.append(entry)
+            used += entry.tokens
+        return selected
+
+
+def cache_path(lorebook_path: Path) -> Path:
+    """Returns the index cache file kept next to a lorebook JSON file."""
+    return lorebook_path.with_name(f".{lorebook_path.name}.index")
+
+
+def load_index(
+    lorebook_path: Path,
+    whole_words: bool = config.LOREBOOK_MATCH_WHOLE_WORDS,
+    recency_weight: float = config.LOREBOOK_RECENCY_WEIGHT,
+) -> LorebookIndex:
+    """
+    Loads the index for a lorebook file, from its cache when the cache is current.
+
+    The cache is trusted when the lorebook's mtime and size are unchanged; otherwise
+    the file is hashed, so a touched but unmodified lorebook still hits the cache (and
+    the cache header takes its new mtime and size).
+    On a miss the JSON is parsed, the index built and the cache rewritten.
+
+    Raises:
+        OSError: If the lorebook cannot be read
+        json.JSONDecodeError: If the lorebook is not valid JSON
+    """
+    stat = lorebook_path.stat()
+    index_cache = cache_path(lorebook_path)
+    header = _read_cache_header(index_cache)
+    data = None
+    if header is not None:
+        version, mtime_ns, size, digest, cached_whole_words = header
+        current = version == CACHE_FORMAT_VERSION and cached_whole_words == whole_words
+        stat_changed = (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size)
+        if current and stat_changed:
+            data = lorebook_path.read_bytes()
+            current = hashlib.sha256(data).hexdigest() == digest
+        if current:
+            state = _read_cache_state(index_cache)
+            if state is not None:
+                if stat_changed:
+                    # Record the new stat so later loads skip hashing the lorebook again
+                    header = (version, stat.st_mtime_ns, stat.st_size, digest, whole_words)
+                    _write_cache(index_cache, header, state)
+                return LorebookIndex._from_cache_state(state, whole_words, recency_weight)
+
+    if data is None:
+        data = lorebook_path.read_bytes()
+    index = LorebookIndex.from_data(
+        json.loads(data), whole_words=whole_words, recency_weight=recency_weight
+    )
+    header = (
+        CACHE_FORMAT_VERSION,
+        stat.st_mtime_ns,
+        stat.st_size,
+        hashlib.sha256(data).hexdigest(),
+        whole_words,
+    )
+    _write_cache(index_cache, header, index._cache_state())
+    return index
+
+
+# Cache file layout: 4-byte little-endian header length, marshalled header, marshalled
+# index state. The header is read on its own; marshal.load on a file object reads in
+# small chunks, so each part is read as bytes and decoded with marshal.loads.
+_HEADER_LENGTH_BYTES = 4
+
+
+def _read_cache_header(index_cache: Path) -> tuple | None:
+    try:
+        with open(index_cache, "rb") as f:
+            length = int.from_bytes(f.read(_HEADER_LENGTH_BYTES), "little")
+            header = marshal.loads(f.read(length))
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return header if isinstance(header, tuple) and len(header) == 5 else None
+
+
+def _read_cache_state(index_cache: Path) -> tuple | None:
+    try:
+        with open(index_cache, "rb") as f:
+            length = int.from_bytes(f.read(_HEADER_LENGTH_BYTES), "little")
+            f.seek(length, os.SEEK_CUR)
+            state = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return state if isinstance(state, tuple) and len(state) == 5 else None
+
+
+def _write_cache(index_cache: Path, header: tuple, state: tuple) -> None:
+    tmp_path = index_cache.with_name(index_cache.name + ".tmp")
+    try:
+        header_bytes = marshal.dumps(header)
+        with open(tmp_path, "wb") as f:
+            f.write(len(header_bytes).to_bytes(_HEADER_LENGTH_BYTES, "little"))
+            f.write(header_bytes)
+            f.write(marshal.dumps(state))
+        os.replace(tmp_path, index_cache)
+    except (OSError, ValueError) as e:
+        # The cache only saves time on the next load; the lorebook works without it
+        logger.warning(f"Could not write lorebook index cache {index_cache}: {e}")
@@ -4,17 +4,22 @@ Lorebook management functionality extracted from Orchestrator.
 Handles creation, modification, and AI-powered lorebook operations.
 """
 
+import asyncio
 import json
 import re
+from collections.abc import Callable
 from pathlib import Path
 
 from rich.console import Console
 from rich.panel import Panel
+from rich.progress import Progress
 from rich.prompt import Confirm, IntPrompt, Prompt
 
-from src import ui
+from src import config, ui, utils
 from src.exceptions import LorebookError
 from src.logger import get_logger
+from src.lorebook_index import cache_path
+from src.parallel_generation import batch_process_with_callback
 
 logger = get_logger(__name__)
 
@@ -22,16 +27,21 @@ logger = get_logger(__name__)
 class LorebookManager:
     """Manager for lorebook operations and AI-powered enhancements."""
 
-    def __init__(self, llm, console: Console):
+    def __init__(
+        self, llm, console: Console, on_save: Callable[[Path, dict], None] | None = None
+    ):
         """
         Initialize the LorebookManager.
 
         Args:
             llm: LLM client for AI-powered lorebook operations
             console: Rich console for output
+            on_save: Optional callback invoked with (path, lorebook_data) after each save,
+                     so a loaded copy of the lorebook can be refreshed
         """
         self.llm = llm
         self.console = console
+        self.on_save = on_save
 
     def show_lorebook_menu(self) -> None:
         """Displays the lorebook management menu."""
@@ -165,6 +175,7 @@ class LorebookManager:
             default=False,
         ):
             selected_lorebook.unlink()
+            cache_path(selected_lorebook).unlink(missing_ok=True)
             self.console.print(f"[green]Deleted: {selected_lorebook.name}[/green]")
         else:
             self.console.print("[dim]Deletion cancelled.[/dim]")
@@ -197,11 +208,13 @@ class LorebookManager:
                     "4. Remove entry",
                     "5. Condense entry with LLM",
                     "6. Expand entry with LLM",
-                    "7. Save and exit",
-                    "8. Exit without saving",
+                    "7. Condense all long entries with LLM",
+                    "8. Expand all stub entries with LLM",
+                    "9. Save and exit",
+                    "10. Exit without saving",
                 ],
             )
-            choice = choice[0]  # Extract the number from the choice
+            choice = choice.split(".")[0]  # Extract the number from the choice
 
             if choice == "1":
                 self._list_lorebook_entries(lorebook_data)
@@ -216,10 +229,14 @@ class LorebookManager:
             elif choice == "6":
                 self._expand_lorebook_entry(lorebook_data)
             elif choice == "7":
+                self._bulk_condense_entries(path, lorebook_data)
+            elif choice == "8":
+                self._bulk_expand_entries(path, lorebook_data)
+            elif choice == "9":
                 self._save_lorebook(path, lorebook_data)
                 self.console.print("[green]Lorebook saved successfully![/green]")
                 break
-            elif choice == "8":
+            elif choice == "10":
                 if Confirm.ask("Exit without saving changes?"):
                     break
 
@@ -577,11 +594,10 @@ Output ONLY the JSON object, no additional text.
             entry["content"] = expanded_content
             self.console.print(f"[green]Expanded entry: {title}[/green]")
 
-    def _llm_expand_entry_content(self, title: str, keywords: list, current_content: str) -> str:
-        """Use LLM to expand/improve entry content."""
+    def _expand_prompt(self, title: str, keywords: list, current_content: str) -> str:
         keywords_str = ", ".join(keywords) if keywords else "None"
 
-        prompt = f"""You are helping to expand a lorebook entry for a creative writing project.
+        return f"""You are helping to expand a lorebook entry for a creative writing project.
 
 Entry Title: {title}
 Keywords: {keywords_str}
@@ -595,17 +611,8 @@ Please expand and improve this lorebook entry. Make it more detailed, engaging,
 
 Keep the expanded content focused and well-organized. Write in a clear, informative style that would be helpful for creative writing."""
 
-        try:
-            response = self.llm.get_response(prompt, "Expanding lorebook entry", allow_stream=False)
-            return response.strip() if response else current_content
-        except Exception as e:
-            logger.error(f"Error expanding lorebook content: {e}", exc_info=True)
-            self.console.print(f"[red]Error expanding content: {e}[/red]")
-            return current_content
-
-    def _llm_condense_entry_content(self, title: str, current_content: str) -> str:
-        """Use LLM to condense entry content."""
-        prompt = f"""You are helping to condense a lorebook entry for a creative writing project.
+    def _condense_prompt(self, title: str, current_content: str) -> str:
+        return f"""You are helping to condense a lorebook entry for a creative writing project.
 
 Entry Title: {title}
 Current Content: {current_content}
@@ -621,6 +628,22 @@ Make the condensed version noticeably shorter than the original while retaining
 
 Return ONLY the condensed content, no explanations or meta-commentary."""
 
+    def _llm_expand_entry_content(self, title: str, keywords: list, current_content: str) -> str:
+        """Use LLM to expand/improve entry content."""
+        prompt = self._expand_prompt(title, keywords, current_content)
+
+        try:
+            response = self.llm.get_response(prompt, "Expanding lorebook entry", allow_stream=False)
+            return response.strip() if response else current_content
+        except Exception as e:
+            logger.error(f"Error expanding lorebook content: {e}", exc_info=True)
+            self.console.print(f"[red]Error expanding content: {e}[/red]")
+            return current_content
+
+    def _llm_condense_entry_content(self, title: str, current_content: str) -> str:
+        """Use LLM to condense entry content."""
+        prompt = self._condense_prompt(title, current_content)
+
         try:
             response = self.llm.get_response(
                 prompt, "Condensing lorebook entry", allow_stream=False
@@ -641,6 +664,91 @@ Return ONLY the condensed content, no explanations or meta-commentary."""
             self.console.print(f"[red]Error condensing content: {e}[/red]")
             return current_content
 
+    def _bulk_condense_entries(self, path: Path, lorebook_data: dict) -> None:
+        """Condense every entry longer than a word limit, then save once."""
+        min_words = IntPrompt.ask(
+            "Condense entries longer than how many words?",
+            default=config.LOREBOOK_CONDENSE_MIN_WORDS,
+        )
+        jobs = []
+        for entry in lorebook_data.get("entries", []):
+            content = entry.get("content", "")
+            if utils.count_words(content) > min_words:
+                title = entry.get("comment", entry.get("title", "Entry"))
+                jobs.append((entry, self._condense_prompt(title, content), f"Condensing {title}"))
+        self._run_bulk_update(path, lorebook_data, jobs, shorten=True)
+
+    def _bulk_expand_entries(self, path: Path, lorebook_data: dict) -> None:
+        """Expand every stub entry below a word limit, then save once."""
+        max_words = IntPrompt.ask(
+            "Expand entries shorter than how many words?",
+            default=config.LOREBOOK_STUB_MAX_WORDS,
+        )
+        jobs = []
+        for entry in lorebook_data.get("entries", []):
+            content = entry.get("content", "")
+            if utils.count_words(content) < max_words:
+                title = entry.get("comment", entry.get("title", "Entry"))
+                prompt = self._expand_prompt(title, entry.get("keys", []), content)
+                jobs.append((entry, prompt, f"Expanding {title}"))
+        self._run_bulk_update(path, lorebook_data, jobs, shorten=False)
+
+    def _run_bulk_update(
+        self, path: Path, lorebook_data: dict, jobs: list[tuple[dict, str, str]], shorten: bool
+    ) -> int:
+        """
+        Sends the (entry, prompt, description) jobs concurrently and updates the entries.
+
+        At most LOREBOOK_BULK_CONCURRENCY requests are in flight. Each entry's content is
+        replaced as soon as its response arrives (condensed text only if it is shorter),
+        and the lorebook is saved once after all requests finish.
+
+        Returns:
+            Number of entries updated
+        """
+        if not jobs:
+            self.console.print("[yellow]No entries match.[/yellow]")
+            return 0
+
+        updated = 0
+        with Progress(console=self.console) as progress:
+            task_id = progress.add_task("[cyan]Updating lorebook entries...", total=len(jobs))
+
+            def on_complete(index: int, response: str | None) -> None:
+                nonlocal updated
+                entry, _, description = jobs[index]
+                progress.update(task_id, advance=1)
+                new_content = response.strip() if response else ""
+                current = entry.get("content", "")
+                if not new_content or (shorten and len(new_content) >= len(current)):
+                    self.console.print(f"[yellow]{description}: kept the original.[/yellow]")
+                    return
+                entry["content"] = new_content
+                updated += 1
+
+            asyncio.run(
+                batch_process_with_callback(
+                    jobs,
+                    lambda job: self._get_response_async(job[1], job[2]),
+                    max_concurrent=config.LOREBOOK_BULK_CONCURRENCY,
+                    on_complete=on_complete,
+                )
+            )
+
+        self.console.print(f"[green]Updated {updated} of {len(jobs)} entries.[/green]")
+        if updated:
+            self._save_lorebook(path, lorebook_data)
+        return updated
+
+    async def _get_response_async(self, prompt: str, task_description: str) -> str | None:
+        """Uses the client's async API when it has one, else its blocking call in a thread."""
+        get_response_async = getattr(self.llm, "get_response_async", None)
+        if get_response_async is not None:
+            return await get_response_async(prompt, task_description, allow_stream=False)
+        return await asyncio.to_thread(
+            self.llm.get_response, prompt, task_description, allow_stream=False
+        )
+
     def _save_lorebook(self, path: Path, lorebook_data: dict) -> None:
         """Save the lorebook data to file."""
         try:
@@ -651,3 +759,5 @@ Return ONLY the condensed content, no explanations or meta-commentary."""
             logger.error(f"Error saving lorebook {path}: {e}", exc_info=True)
             self.console.print(f"[red]Error saving lorebook: {e}[/red]")
             raise LorebookError(f"Failed to save lorebook: {e}") from e
+        if self.on_save:
+            self.on_save(path, lorebook_data)
@@ -3,6 +3,7 @@ ollama_client.py - Ollama client implementation for LLMClientInterface.
 """
 
 import time
+from typing import TYPE_CHECKING
 
 import ollama
 from rich.console import Console
@@ -12,6 +13,10 @@ from rich.prompt import Confirm
 
 from src import config
 from src.llm_client_interface import LLMClientInterface
+from src.structured_output import parse_structured_json
+
+if TYPE_CHECKING:
+    from src.stream_monitor import StreamingSlopMonitor
 
 
 class OllamaClient(LLMClientInterface):
@@ -54,15 +59,23 @@ class OllamaClient(LLMClientInterface):
             return None
 
     def get_response(
-        self, prompt: str, task_description: str = "Generating content", allow_stream: bool = True
+        self,
+        prompt: str,
+        task_description: str = "Generating content",
+        allow_stream: bool = True,
+        stream_monitor: "StreamingSlopMonitor | None" = None,
     ) -> str | None:
         """
         Sends a prompt to the Ollama API and returns the response.
-        Handles API errors with retries and exponential backoff.
+        Handles API errors with retries and exponential backoff. A streamed response
+        is stopped, and None returned, as soon as stream_monitor asks to abort it.
         """
         retries = 0
         while retries < config.MAX_API_RETRIES:
             full_response = ""
+            if stream_monitor is not None:
+                # A retry is a new response; never judge it against the failed one
+                stream_monitor.reset()
             try:
                 self.console.print(
                     Panel(
@@ -99,8 +112,17 @@ class OllamaClient(LLMClientInterface):
                             if chunk.response:
                                 print(chunk.response, end="", flush=True)
                                 full_response += chunk.response
+                                if stream_monitor is not None and stream_monitor.feed(chunk.response):
+                                    stream.close()
+                                    break
 
                         print()  # Newline after streaming
+                        # The last paragraph has no blank line after it to trigger its checks
+                        if stream_monitor is not None and stream_monitor.finish():
+                            self.console.print(
+                                f"[yellow]Stopped generation early: {stream_monitor.alert.description}[/yellow]"
+                            )
+                            return None
                 else:
                     # Non-streaming response
                     with Progress(
@@ -174,3 +196,46 @@ class OllamaClient(LLMClientInterface):
                 return None
 
         return None
+
+    def get_structured_response(
+        self, prompt: str, task_description: str, schema: dict, schema_name: str
+    ) -> dict | None:
+        """
+        Sends a prompt to the Ollama API with the response constrained to a JSON schema.
+        Returns None on any failure so the caller can fall back to a text response.
+        """
+        self.console.print(
+            Panel(
+                f"[yellow]Sending structured request to Ollama ({task_description})...[/yellow]",
+                border_style="dim",
+            )
+        )
+        try:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                transient=True,
+            ) as progress:
+                progress.add_task(description="[cyan]Ollama is thinking...", total=None)
+                response = self.client.generate(
+                    model=config.OLLAMA_MODEL_NAME, prompt=prompt, format=schema
+                )
+
+            data = parse_structured_json(response.response)
+            if data is None:
+                self.console.print("[yellow]Structured response was not valid JSON.[/yellow]")
+                return None
+
+            self.console.print(
+                Panel(
+                    "[green]✓ Ollama structured response received successfully.[/green]",
+                    border_style="dim",
+                )
+            )
+            return data
+        except Exception as e:
+            self.console.print(
+                f"[yellow]Structured output failed ({type(e).__name__}: {e}); "
+                "falling back to a text response.[/yellow]"
+            )
+            return None
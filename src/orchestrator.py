@@ -11,22 +11,49 @@ from pathlib import Path
 
 from rich.panel import Panel
 from rich.prompt import Confirm
+from rich.table import Table
 
 from src import config, ui, utils
+from src.book_analysis import analyze_book
 from src.exceptions import LorebookLoadError, ProjectError, XMLParseError
 from src.export_manager import ExportManager
 from src.exporters import epub, html, markdown, pdf, txt
 from src.generators import novel, short_story
 from src.llm_client import LLMClient
 from src.logger import get_logger
+from src.lorebook_index import LorebookIndex, format_entry, load_index
 from src.lorebook_manager import LorebookManager
 from src.project import Project
 from src.prompt_enhancer import PromptEnhancer
+from src.prose_stats import book_prose_stats, numpy_available
 from src.slop_detection import SlopDetectionAgent
+from src.stream_monitor import StreamingSlopMonitor
+from src.structured_output import (
+    PATCH_SCHEMA,
+    PATCH_SCHEMA_NAME,
+    build_structured_prompt,
+    patch_data_to_xml,
+)
+from src.text_analysis import TextAnalysis
 
 logger = get_logger(__name__)
 
 
+def paragraph_edit_format(chapter_id: str) -> str:
+    """Output-format instructions for edits expressed as paragraph-level operations."""
+    return f"""Output format: Return ONLY an XML `<patch>`. Express your changes as paragraph-level edits that refer to the `id` of each `<paragraph>` shown in the context, so unchanged paragraphs are not repeated:
+
+<patch>
+  <chapter id="{chapter_id}">
+    <replace paragraph="4">The complete new text of paragraph 4.</replace>
+    <insert after="7">A new paragraph placed after paragraph 7 (use after="0" for the very start).</insert>
+    <delete paragraph="9"/>
+  </chapter>
+</patch>
+
+Paragraph ids always refer to the chapter as shown in the context, not to its state after your other edits. Use as many operations as needed. Only if nearly every paragraph changes, return the whole chapter instead as `<chapter id="{chapter_id}"><content><paragraph id="1">...</paragraph><paragraph id="2">...</paragraph></content></chapter>`, numbering the paragraphs from 1."""
+
+
 class Orchestrator:
     """Orchestrates the entire novel generation process."""
 
@@ -37,7 +64,10 @@ class Orchestrator:
         self.project = project
         self.llm = llm_client
         self.console = ui.console
-        self.lorebook_data = self._load_lorebook(lorebook_path) if lorebook_path else None
+        self.lorebook_path = None
+        self.lorebook_data = None
+        if lorebook_path:
+            self._open_lorebook(Path(lorebook_path))
 
         self.export_manager = ExportManager(self.project, self.console)
         
@@ -49,7 +79,9 @@ class Orchestrator:
             self.slop_agent = SlopDetectionAgent(sensitivity=slop_sensitivity)
         else:
             self.slop_agent = None
-        self.lorebook_manager = LorebookManager(self.llm, self.console)
+        self.lorebook_manager = LorebookManager(
+            self.llm, self.console, on_save=self._on_lorebook_saved
+        )
         self.prompt_enhancer = PromptEnhancer(self.llm, self.console, self)
 
     def _load_lorebook(self, lorebook_path: str) -> dict | None:
@@ -74,69 +106,63 @@ class Orchestrator:
             self.console.print(f"[red]Error loading lorebook: {e}[/red]")
             return None
 
-    def _extract_lorebook_context(self, text: str) -> str:
-        """Extracts relevant lorebook entries based on keywords found in the text."""
-        if not self.lorebook_data:
-            return ""
-
-        # Extract entries from lorebook structure
-        entries = []
-        if "entries" in self.lorebook_data:
-            entries_data = self.lorebook_data["entries"]
-            # Handle both dict (TavernAI format with IDs as keys) and list formats
-            if isinstance(entries_data, dict):
-                entries = list(entries_data.values())
-            elif isinstance(entries_data, list):
-                entries = entries_data
-        elif isinstance(self.lorebook_data, list):
-            entries = self.lorebook_data
-        elif "worldInfos" in self.lorebook_data:
-            entries = self.lorebook_data["worldInfos"]
-
-        if not entries:
-            return ""
-
-        relevant_entries = []
-        text_lower = text.lower()
-
-        for entry in entries:
-            # Skip non-dict entries
-            if not isinstance(entry, dict):
-                continue
-
-            # Skip disabled entries
-            if entry.get("disable", False) or not entry.get("enable", True):
-                continue
+    def _open_lorebook(self, path: Path) -> None:
+        """
+        Makes the lorebook at path the session's lorebook.
 
-            # Check for keywords (supports both "keys" and "key" fields)
-            keys = entry.get("keys", entry.get("key", []))
-            if isinstance(keys, str):
-                keys = [k.strip() for k in keys.split(",")]
-            elif not isinstance(keys, list):
-                keys = []
+        Only the keyword index is loaded, from its on-disk cache when current; the raw
+        JSON is parsed on first access to lorebook_data.
+        """
+        self.lorebook_path = path
+        self.lorebook_data = None
+        try:
+            if not path.exists():
+                raise LorebookLoadError(f"Lorebook file not found: {path}")
+            self.lorebook_index = load_index(path)
+            self.console.print(f"[green]Loaded lorebook: {path.name}[/green]")
+        except LorebookLoadError as e:
+            logger.warning(str(e))
+            self.console.print(f"[yellow]Warning: {e}[/yellow]")
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load lorebook from {path}: {e}", exc_info=True)
+            self.console.print(f"[red]Error loading lorebook: {e}[/red]")
 
-            # Check if any keyword matches
-            matches = any(
-                key.lower() in text_lower for key in keys if isinstance(key, str) and key.strip()
-            )
+    @property
+    def lorebook_data(self) -> dict | None:
+        if self._lorebook_data is None and self.lorebook_index is not None:
+            # Opened from the index cache; the full JSON is only needed for editing
+            try:
+                with open(self.lorebook_path, encoding="utf-8") as f:
+                    self._lorebook_data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"Failed to load lorebook from {self.lorebook_path}: {e}", exc_info=True)
+                self.console.print(f"[red]Error loading lorebook: {e}[/red]")
+        return self._lorebook_data
+
+    @lorebook_data.setter
+    def lorebook_data(self, lorebook_data: dict | None) -> None:
+        # The keyword index is compiled once per lorebook, not on every lookup
+        self._lorebook_data = lorebook_data
+        self.lorebook_index = LorebookIndex.from_data(lorebook_data) if lorebook_data else None
+
+    def _on_lorebook_saved(self, path: Path, lorebook_data: dict) -> None:
+        """Picks up edits the lorebook manager saved to the lorebook this session uses."""
+        if self.lorebook_path is not None and path.resolve() == self.lorebook_path.resolve():
+            self.lorebook_data = lorebook_data
 
-            if matches:
-                content = entry.get("content", "").strip()
-                if content:
-                    relevant_entries.append(
-                        {
-                            "title": entry.get("comment", entry.get("title", "Entry")),
-                            "content": content,
-                        }
-                    )
+    def _extract_lorebook_context(self, text: str) -> str:
+        """Extracts relevant lorebook entries based on keywords found in the text."""
+        if not self.lorebook_index:
+            return ""
 
+        relevant_entries = self.lorebook_index.select(text, config.LOREBOOK_CONTEXT_TOKEN_BUDGET)
         if not relevant_entries:
             return ""
 
         # Format the lorebook context
         context_parts = ["## Lorebook Context\n"]
         for entry in relevant_entries:
-            context_parts.append(f"**{entry['title']}:**\n{entry['content']}\n")
+            context_parts.append(format_entry(entry.title, entry.content))
 
         return "\n".join(context_parts)
 
@@ -209,14 +235,15 @@ class Orchestrator:
     def setup_new_project(self, idea: str) -> bool:
         """Guides the user through setting up a new project."""
         # Offer lorebook selection if none was provided via CLI
-        if not self.lorebook_data:
+        if self.lorebook_index is None:
             lorebook_path, is_import = ui.prompt_for_lorebook_creation_or_import()
             if lorebook_path:
                 # For new lorebooks (not imports), use _load_or_create_lorebook to enable auto-generation
                 # For imports, just load the existing file
                 path = Path(lorebook_path)
+                self.lorebook_path = path
                 if is_import or path.exists():
-                    self.lorebook_data = self._load_lorebook(lorebook_path)
+                    self._open_lorebook(path)
                 else:
                     # New lorebook - load/create with book idea for auto-generation
                     # Then open management interface for user to review/edit
@@ -232,7 +259,7 @@ class Orchestrator:
                             ):
                                 self.lorebook_manager.manage_lorebook(str(path))
                                 # Reload the potentially modified lorebook
-                                self.lorebook_data = self._load_lorebook(str(path))
+                                self._open_lorebook(path)
 
         # 1. Get initial title and synopsis
         title, synopsis = self._generate_initial_summary(idea)
@@ -305,11 +332,12 @@ Output ONLY a JSON object in the format:
 
     def _has_full_outline(self) -> bool:
         """Checks if the project appears to have a complete outline."""
-        if not self.project.book_root:
+        book_root = self.project.outline_root
+        if not book_root:
             return False
 
-        chapters = self.project.book_root.findall(".//chapter")
-        characters = self.project.book_root.findall(".//character")
+        chapters = book_root.findall(".//chapter")
+        characters = book_root.findall(".//character")
         has_summaries = any(c.findtext("summary", "").strip() for c in chapters)
 
         return bool(chapters and characters and has_summaries)
@@ -483,17 +511,17 @@ Output ONLY an XML `<patch>` containing a `<chapter>` for each requested ID. Eac
 
 Full Book Context:
 ```xml
-{ET.tostring(self.project.book_root, encoding="unicode")}
+{utils.xml_for_prompt(self.project.book_root)}
 ```
 """
-            patch_xml = self.llm.get_response(prompt, f"Writing chapters {ids_str}")
+            patch_xml = self._request_patch(prompt, f"Writing chapters {ids_str}")
             
             # Apply slop detection to generated content before applying patch
             if patch_xml and self.slop_agent:
                 self._apply_slop_detection_to_patch(patch_xml, ids_str)
             
             if patch_xml and self.project.apply_patch(patch_xml):
-                patch_num = utils.get_next_patch_number(self.project.book_dir)
+                patch_num = self.project.next_patch_number()
                 self.project.save_state(f"patch-{patch_num:02d}.xml")
                 ui.display_summary(self.project)
             else:
@@ -506,15 +534,13 @@ Full Book Context:
     def _select_chapters_to_generate(self, batch_size=2) -> list:
         """Selects the next batch of chapters to write using a fill-gaps strategy."""
         all_chapters = sorted(
-            self.project.book_root.findall(".//chapter"),
+            self.project.outline_root.findall(".//chapter"),
             key=lambda c: int(utils.get_chapter_id_with_default(c, "0")),
         )
 
-        chapters_needing_content = []
-        for chap in all_chapters:
-            paras = chap.findall(".//paragraph")
-            if not any(p.text and p.text.strip() for p in paras):
-                chapters_needing_content.append(chap)
+        chapters_needing_content = [
+            chap for chap in all_chapters if self.project.get_chapter_word_count(chap) == 0
+        ]
 
         return chapters_needing_content[:batch_size]
 
@@ -535,9 +561,11 @@ Full Book Context:
             ),
             "5": ("Ask LLM for Edit Suggestions", self._edit_suggest_edits),
             "6": ("Detect & Fix AI Slop", self._edit_detect_slop),
-            "7": ("Manage Lorebooks", self.lorebook_manager.show_lorebook_menu),
-            "8": ("Export Menu", self.export_manager.show_export_menu),
-            "9": ("Quit Editing", None),
+            "7": ("Analyze Whole Book", self._edit_analyze_book),
+            "8": ("Manage Lorebooks", self.lorebook_manager.show_lorebook_menu),
+            "9": ("Export Menu", self.export_manager.show_export_menu),
+            "10": ("Project Storage", self._edit_project_storage),
+            "11": ("Quit Editing", None),
         }
 
         while True:
@@ -550,6 +578,120 @@ Full Book Context:
             else:  # Quit
                 break
 
+    def _edit_project_storage(self) -> None:
+        """Handler for moving the project to SQLite storage and using its version log."""
+        if self.project.store is None:
+            storage_options = {
+                "1": (
+                    "Migrate Project to SQLite Storage (project.db)",
+                    self.project.migrate_to_store,
+                ),
+                "2": ("Return to Editing Menu", None),
+            }
+        else:
+            storage_options = {
+                "1": ("Export Current State as XML", self._storage_export_xml),
+                "2": ("Show Chapter History", self._storage_chapter_history),
+                "3": ("Return to Editing Menu", None),
+            }
+        choice = ui.display_menu("Project Storage", storage_options)
+        handler = storage_options.get(choice)[1]
+        if handler:
+            handler()
+
+    def _storage_export_xml(self) -> None:
+        """Writes the current state of a SQLite-backed project in the XML file layout."""
+        xml_path = self.project.book_dir / f"{self.project.book_title_slug}-export.xml"
+        if self.project.store.export_xml(xml_path):
+            self.console.print(f"[green]Exported project state to:[/green] [cyan]{xml_path}[/cyan]")
+        else:
+            self.console.print("[red]No saved state to export.[/red]")
+
+    def _storage_chapter_history(self) -> None:
+        """Shows every saved version in which a chapter's content changed."""
+        chapters = ui.get_chapter_selection(
+            self.project, "Enter chapter ID to show its history", allow_multiple=False
+        )
+        if not chapters:
+            return
+        chapter_id = utils.get_chapter_id(chapters[0])
+        history = self.project.store.chapter_history(chapter_id)
+        if not history:
+            self.console.print(f"[yellow]No saved versions of Chapter {chapter_id}.[/yellow]")
+            return
+
+        table = Table(title=f"History of Chapter {chapter_id}")
+        table.add_column("Version", justify="right")
+        table.add_column("Saved as")
+        table.add_column("Saved at")
+        table.add_column("Words", justify="right")
+        for entry in history:
+            words = f"{entry.word_count:,}" if entry.has_content else "(no content)"
+            table.add_row(str(entry.version), entry.label, entry.saved_at, words)
+        self.console.print(table)
+
+    def _request_patch(
+        self, prompt: str, task_description: str, paragraph_edits: bool = False
+    ) -> str | None:
+        """
+        Asks the LLM for a chapter patch and returns it as patch XML.
+
+        With structured output enabled and supported by the provider, the chapters come
+        back as schema-validated data and are converted to XML locally, so the response
+        never needs cleaning or repair. Otherwise (or if that call fails) the XML prompt
+        is sent as before. Prompts asking for paragraph_edits always use XML, since the
+        schema only describes whole chapters.
+
+        When the client supports it, the streamed XML response is watched for degenerate
+        repetition and slop, and a response that goes bad is stopped and re-prompted.
+        """
+        get_structured = getattr(self.llm, "get_structured_response", None)
+        if config.ENABLE_STRUCTURED_PATCH_OUTPUT and get_structured is not None and not paragraph_edits:
+            data = get_structured(
+                build_structured_prompt(prompt), task_description, PATCH_SCHEMA, PATCH_SCHEMA_NAME
+            )
+            patch_xml = patch_data_to_xml(data) if data is not None else None
+            if patch_xml:
+                return patch_xml
+        if config.ENABLE_STREAM_MONITOR and getattr(self.llm, "supports_stream_monitor", False):
+            return self._get_monitored_response(prompt, task_description)
+        return self.llm.get_response(prompt, task_description)
+
+    def _get_monitored_response(self, prompt: str, task_description: str) -> str | None:
+        """
+        Streams a response under a StreamingSlopMonitor, re-prompting when it is stopped
+        early. The last attempt is watched but never stopped, since a complete but sloppy
+        response beats none.
+        """
+        detector = self.slop_agent.detector if self.slop_agent else None
+        for _ in range(config.STREAM_MAX_REPROMPTS):
+            monitor = StreamingSlopMonitor(detector=detector)
+            response = self.llm.get_response(prompt, task_description, stream_monitor=monitor)
+            if not monitor.aborted:
+                return response
+            logger.warning(
+                f"{task_description}: response stopped after {monitor.alert.characters} characters, "
+                f"it {monitor.alert.description}"
+            )
+            self.console.print("[yellow]Re-prompting with a note to avoid the problem...[/yellow]")
+            prompt = (
+                f"{prompt}\n\nNote: a previous attempt at this response was stopped because it "
+                f"{monitor.alert.description}. Write varied, concrete prose and never repeat "
+                f"sentences or paragraphs."
+            )
+
+        monitor = StreamingSlopMonitor(on_alert=lambda alert: False, detector=detector)
+        response = self.llm.get_response(prompt, task_description, stream_monitor=monitor)
+        if monitor.alert is not None:
+            logger.warning(
+                f"{task_description}: kept the final attempt although it {monitor.alert.description}"
+            )
+            self.console.print(
+                f"[yellow]{task_description}: the final attempt {monitor.alert.description}; "
+                f"keeping it anyway.[/yellow]"
+            )
+        return response
+
     def _handle_patch_result(self, patch_xml: str | None, operation_desc: str) -> None:
         """Helper to apply, save, and report the result of an edit operation."""
         if not patch_xml:
@@ -559,7 +701,7 @@ Full Book Context:
         ui.display_patch_suggestion(patch_xml)
         if Confirm.ask("\n[yellow]Apply this suggested patch?[/yellow]", default=True):
             if self.project.apply_patch(patch_xml):
-                patch_num = utils.get_next_patch_number(self.project.book_dir)
+                patch_num = self.project.next_patch_number()
                 self.project.save_state(f"patch-{patch_num:02d}.xml")
                 self.console.print(f"[green]{operation_desc} successful. Patch saved.[/green]")
             else:
@@ -574,7 +716,7 @@ Full Book Context:
             return
 
         if self.project.apply_patch(patch_xml):
-            patch_num = utils.get_next_patch_number(self.project.book_dir)
+            patch_num = self.project.next_patch_number()
             self.project.save_state(f"patch-{patch_num:02d}.xml")
             self.console.print(f"[green]{operation_desc} successful. Patch auto-applied.[/green]")
         else:
@@ -621,7 +763,10 @@ Full Book Context:
                 break
 
         if target_chapter is None:
-            return ET.tostring(reduced_book, encoding="unicode")
+            return utils.xml_for_prompt(reduced_book)
+
+        # Paragraph edits refer to these ids; chapters written before they existed have none
+        utils.number_paragraphs(target_chapter)
 
         # Add chapters section with target + surrounding chapters
         chapters_elem = ET.SubElement(reduced_book, "chapters")
@@ -647,7 +792,7 @@ Full Book Context:
                 if content_elem is not None:
                     chapter_copy.append(copy.deepcopy(content_elem))
 
-        return ET.tostring(reduced_book, encoding="unicode")
+        return utils.xml_for_prompt(reduced_book)
 
     def _create_enhanced_context_for_book_editing(self, chapter_id: str) -> str:
         """Creates enhanced context for book-wide editing that includes narrative flow and continuity information."""
@@ -680,7 +825,10 @@ Full Book Context:
                 break
 
         if target_chapter is None:
-            return ET.tostring(enhanced_book, encoding="unicode")
+            return utils.xml_for_prompt(enhanced_book)
+
+        # Paragraph edits refer to these ids; chapters written before they existed have none
+        utils.number_paragraphs(target_chapter)
 
         # Add enhanced chapters section with broader context
         chapters_elem = ET.SubElement(enhanced_book, "chapters")
@@ -746,7 +894,7 @@ Full Book Context:
 
         flow_elem.text = flow_summary
 
-        return ET.tostring(enhanced_book, encoding="unicode")
+        return utils.xml_for_prompt(enhanced_book)
 
     def _edit_make_longer(self) -> None:
         """Handler for making chapters longer."""
@@ -790,14 +938,18 @@ Maintain the original narrative flow, character voices, and plot progression. Th
 
 Keep the narrative grounded in the setting described in the chapter's `setting` attribute to prevent setting drift.
 
-Output an XML `<patch>` with the expanded `<chapter>` content that preserves all key story elements while making them richer and more detailed. Make sure to include the `setting` attribute in the chapter tag.
+Preserve all key story elements while making them richer and more detailed.
+
+{paragraph_edit_format(chapter_id)}
 
 Relevant Context:
 ```xml
 {reduced_context}
 ```
 """
-            patch_xml = self.llm.get_response(prompt, f"Expanding chapter {chapter_id}")
+            patch_xml = self._request_patch(
+                prompt, f"Expanding chapter {chapter_id}", paragraph_edits=True
+            )
             if len(chapters) > 1:
                 self._handle_patch_result_auto(patch_xml, f"Make Longer (Ch {chapter_id})")
             else:
@@ -853,14 +1005,18 @@ Maintain the original narrative flow, character voices, and plot progression. Th
 
 Keep the narrative grounded in the setting described in the chapter's `setting` attribute to prevent setting drift.
 
-Output an XML `<patch>` with the expanded `<chapter>` content that preserves all key story elements while making them richer and more detailed. Make sure to include the `setting` attribute in the chapter tag.
+Preserve all key story elements while making them richer and more detailed.
+
+{paragraph_edit_format(chapter_id)}
 
 Relevant Context:
 ```xml
 {reduced_context}
 ```
 """
-            patch_xml = self.llm.get_response(prompt, f"Expanding chapter {chapter_id}")
+            patch_xml = self._request_patch(
+                prompt, f"Expanding chapter {chapter_id}", paragraph_edits=True
+            )
             self._handle_patch_result_auto(patch_xml, f"Make Longer (Ch {chapter_id})")
 
     def _edit_rewrite_chapter(self, blackout: bool) -> None:
@@ -884,22 +1040,29 @@ Relevant Context:
             if content_to_clear is not None:
                 content_to_clear.clear()
 
+        if blackout:
+            output_format = f'''Output an XML `<patch>` with the rewritten `<chapter>` content. Make sure to include the `setting` attribute in the chapter tag (e.g., <chapter id="{chapter_id}" setting="...">).'''
+        else:
+            output_format = paragraph_edit_format(chapter_id)
+
         prompt = f"""
-Rewrite the entire content for Chapter {chapter_id} based on these instructions:
+Rewrite the content of Chapter {chapter_id} based on these instructions:
 "{escape(instructions)}"
 {"The original content has been omitted from the context to encourage a fresh take." if blackout else ""}
 Ensure the new content respects the chapter's summary and the overall plot.
 
 IMPORTANT: Keep the narrative grounded in the setting described in the chapter's `setting` attribute. This keeps the scene focused and prevents setting drift.
 
-Output an XML `<patch>` with the rewritten `<chapter>` content. Make sure to include the `setting` attribute in the chapter tag (e.g., <chapter id="{chapter_id}" setting="...">).
+{output_format}
 
 Full Book Context:
 ```xml
-{ET.tostring(temp_root, encoding="unicode")}
+{utils.xml_for_prompt(temp_root, paragraph_ids=not blackout)}
 ```
 """
-        patch_xml = self.llm.get_response(prompt, f"Rewriting chapter {chapter_id}")
+        patch_xml = self._request_patch(
+            prompt, f"Rewriting chapter {chapter_id}", paragraph_edits=not blackout
+        )
         self._handle_patch_result(patch_xml, f"Rewrite (Ch {chapter_id})")
 
     def _edit_suggest_edits(self) -> None:
@@ -913,7 +1076,7 @@ You are an expert editor. Analyze the manuscript below and provide a numbered li
 
 Full Book Context:
 ```xml
-{ET.tostring(self.project.book_root, encoding="unicode")}
+{utils.xml_for_prompt(self.project.book_root)}
 ```
 """
         suggestions_text = self.llm.get_response(
@@ -990,16 +1153,7 @@ The enhanced context below includes surrounding chapters and narrative flow info
 - Ongoing plot threads and story elements that must be preserved
 - Tone and style consistency with the broader narrative
 
-Output format: Return ONLY an XML `<patch>` containing a `<chapter>` element with the complete updated content. Use this EXACT format and include the `setting` attribute:
-
-<patch>
-  <chapter id="{chapter_id}" setting="...">
-    <content>
-      <paragraph>First updated paragraph...</paragraph>
-      <paragraph>Second updated paragraph...</paragraph>
-    </content>
-  </chapter>
-</patch>
+{paragraph_edit_format(chapter_id)}
 
 Enhanced Context for Continuity:
 ```xml
@@ -1007,10 +1161,12 @@ Enhanced Context for Continuity:
 ```
 """
 
-            patch_xml = self.llm.get_response(prompt, f"Applying advice to chapter {chapter_id}")
+            patch_xml = self._request_patch(
+                prompt, f"Applying advice to chapter {chapter_id}", paragraph_edits=True
+            )
 
             if patch_xml and self.project.apply_patch(patch_xml):
-                patch_num = utils.get_next_patch_number(self.project.book_dir)
+                patch_num = self.project.next_patch_number()
                 self.project.save_state(f"patch-{patch_num:02d}.xml")
                 self.console.print(f"[green]✓ Chapter {chapter_id} updated successfully[/green]")
             else:
@@ -1083,8 +1239,8 @@ IMPORTANT: Output an XML `<patch>` containing a `<chapter>` element with the com
 <patch>
   <chapter id="{chapter_id}" setting="...">
     <content>
-      <paragraph>First updated paragraph...</paragraph>
-      <paragraph>Second updated paragraph...</paragraph>
+      <paragraph id="1">First updated paragraph...</paragraph>
+      <paragraph id="2">Second updated paragraph...</paragraph>
     </content>
   </chapter>
 </patch>
@@ -1094,10 +1250,10 @@ Relevant Context:
 {reduced_context}
 ```
 """
-            patch_xml = self.llm.get_response(prompt, f"Optimizing engagement for chapter {chapter_id}")
+            patch_xml = self._request_patch(prompt, f"Optimizing engagement for chapter {chapter_id}")
             
             if patch_xml and self.project.apply_patch(patch_xml):
-                patch_num = utils.get_next_patch_number(self.project.book_dir)
+                patch_num = self.project.next_patch_number()
                 self.project.save_state(f"patch-{patch_num:02d}.xml")
                 self.console.print(f"[green]✓ Chapter {chapter_id} engagement optimized successfully[/green]")
             else:
@@ -1258,7 +1414,7 @@ Relevant Context:
                         self.console.print(f"[green]✅ {chapter_title} cleaned: removed {cleaned_analysis.removals_count} fillers, replaced {cleaned_analysis.replacements_count} weak phrases[/green]")
                         
                         # Save changes
-                        patch_num = utils.get_next_patch_number(self.project.book_dir)
+                        patch_num = self.project.next_patch_number()
                         self.project.save_state(f"slop-fix-{patch_num:02d}.xml")
                     else:
                         self.console.print(f"[yellow]No auto-cleaning available for {chapter_title}[/yellow]")
@@ -1272,3 +1428,67 @@ Relevant Context:
             self.console.print(f"  🔍 {total_issues} total issues detected")
         else:
             self.console.print(f"\n[bold green]🎉 All {len(chapters)} chapters are slop-free![/bold green]")
+
+    def _edit_analyze_book(self) -> None:
+        """Analyzes every chapter for slop, quality, engagement and continuity."""
+        chapters = []
+        for chapter in self.project.book_root.findall(".//chapter"):
+            paragraphs = [p.text for p in chapter.findall(".//paragraph") if p.text]
+            if paragraphs:
+                chapter_id = utils.get_chapter_id_with_default(chapter)
+                chapters.append((chapter_id, chapter.findtext("summary", ""), paragraphs))
+        if not chapters:
+            self.console.print("[yellow]No chapters with content to analyze.[/yellow]")
+            return
+
+        # Tokenised once here, for both continuity and the prose statistics
+        contents = [TextAnalysis("\n".join(paragraphs)) for _, _, paragraphs in chapters]
+        sensitivity = self.slop_agent.detector.sensitivity if self.slop_agent else None
+        with self.console.status(f"[cyan]Analyzing {len(chapters)} chapters...[/cyan]"):
+            analysis = analyze_book(chapters, sensitivity=sensitivity, contents=contents)
+
+        table = Table(title="Book Analysis", title_style="bold cyan")
+        table.add_column("Chapter", style="cyan")
+        table.add_column("Words", justify="right")
+        table.add_column("Quality", justify="right")
+        table.add_column("Slop", justify="right")
+        table.add_column("Engagement", justify="right")
+        table.add_column("Continuity Issues", justify="right")
+        for chapter in analysis.chapters:
+            slop = chapter.quality.slop_analysis
+            table.add_row(
+                chapter.chapter_id,
+                str(chapter.quality.word_count),
+                f"{chapter.quality.overall_score:.1f}",
+                f"{slop.overall_score:.1f}" if slop else "-",
+                f"{chapter.engagement.overall_engagement_score:.1f}",
+                str(len(chapter.continuity_issues)),
+            )
+        self.console.print(table)
+        self.console.print(
+            f"[dim]Analyzed in {analysis.elapsed_seconds:.2f}s on {analysis.workers} process(es), "
+            f"{analysis.speedup:.1f}x faster than one chapter at a time.[/dim]"
+        )
+
+        if not numpy_available:
+            self.console.print("[dim]Install numpy (uv add numpy) for book-wide prose statistics.[/dim]")
+            return
+        chapter_ids = [chapter_id for chapter_id, _, _ in chapters]
+        stats = book_prose_stats(list(zip(chapter_ids, contents, strict=True)))
+        table = Table(title="Prose Statistics", title_style="bold cyan")
+        table.add_column("Chapter", style="cyan")
+        table.add_column("Sentence Length", justify="right")
+        table.add_column("Variety", justify="right")
+        table.add_column("MATTR", justify="right")
+        table.add_column("Reading Ease", justify="right")
+        table.add_column("Grade", justify="right")
+        for chapter_stats in [*stats.chapters, stats.book]:
+            table.add_row(
+                chapter_stats.label,
+                f"{chapter_stats.mean_sentence_length:.1f} ± {chapter_stats.sentence_length_std:.1f}",
+                f"{chapter_stats.sentence_variety_score:.1f}",
+                f"{chapter_stats.moving_average_ttr:.2f}",
+                f"{chapter_stats.flesch_reading_ease:.0f}",
+                f"{chapter_stats.flesch_kincaid_grade:.1f}",
+            )
+        self.console.print(table)
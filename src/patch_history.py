@@ -0,0 +1,176 @@
+"""
+patch_history.py - Retention, compression and deduplication of patch-NN.xml snapshots.
+
+Every save writes a complete snapshot of the book, and consecutive snapshots usually
+differ by a single chapter. Snapshots older than the newest few are moved into the
+project's history/ folder: each chapter <content> body is stored once as a gzip
+compressed, content-addressed blob, and the remaining skeleton is stored gzipped with
+a reference to each blob. Archived snapshots can be restored byte-for-byte.
+"""
+import gzip
+import hashlib
+import os
+import re
+from pathlib import Path
+
+from src import config, utils
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+HISTORY_DIRNAME = "history"
+BLOBS_DIRNAME = "blobs"
+
+# Placeholder left in an archived skeleton where a <content> body was cut out
+_BLOB_REF_PATTERN = re.compile(rb'<content __blob__="([0-9a-f]{64})"/>')
+
+
+class PatchHistory:
+    """Applies the retention policy to a project's snapshots and restores archived ones."""
+
+    def __init__(
+        self,
+        book_dir: Path,
+        keep_last: int = config.PATCH_HISTORY_KEEP_LAST,
+        keep_every: int = config.PATCH_HISTORY_KEEP_EVERY,
+    ) -> None:
+        """
+        Args:
+            book_dir: Project directory containing patch-NN.xml files
+            keep_last: Newest snapshots left uncompressed in the project folder (min 1)
+            keep_every: Of the older snapshots, archive only every Kth patch number
+                        and delete the rest (1 = archive all of them)
+        """
+        self.book_dir = book_dir
+        self.history_dir = book_dir / HISTORY_DIRNAME
+        self.blobs_dir = self.history_dir / BLOBS_DIRNAME
+        self.keep_last = max(1, keep_last)
+        self.keep_every = max(1, keep_every)
+
+    def _archive_path(self, patch_number: int) -> Path:
+        return self.history_dir / f"patch-{patch_number:02d}.xml.gz"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / f"{digest}.xml.gz"
+
+    def hot_patch_numbers(self) -> list[int]:
+        """Returns the numbers of uncompressed patch files in the project folder, ascending."""
+        numbers = (utils.parse_patch_number(p.name) for p in self.book_dir.glob("patch-*.xml"))
+        return sorted(n for n in numbers if n is not None)
+
+    def archived_patch_numbers(self) -> list[int]:
+        """Returns the numbers of archived snapshots, ascending."""
+        if not self.history_dir.is_dir():
+            return []
+        numbers = (
+            utils.parse_patch_number(p.name.removesuffix(".gz"))
+            for p in self.history_dir.glob("patch-*.xml.gz")
+        )
+        return sorted(n for n in numbers if n is not None)
+
+    def apply_retention(self) -> int:
+        """
+        Archives or deletes snapshots outside the keep-last window.
+
+        Returns:
+            Number of snapshots moved out of the project folder
+        """
+        hot = self.hot_patch_numbers()
+        expired = hot[: -self.keep_last]
+        if not expired:
+            return 0
+
+        deleted_any = False
+        for patch_number in expired:
+            patch_file = self.book_dir / f"patch-{patch_number:02d}.xml"
+            try:
+                if patch_number % self.keep_every == 0:
+                    self._archive(patch_number, patch_file.read_bytes())
+                else:
+                    deleted_any = True
+                patch_file.unlink()
+            except OSError as e:
+                logger.warning(f"Could not archive {patch_file}: {e}")
+
+        if deleted_any:
+            self._prune_archives()
+        return len(expired)
+
+    def _archive(self, patch_number: int, data: bytes) -> None:
+        """Splits a snapshot into deduplicated content blobs plus a compressed skeleton."""
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        pieces = []
+        position = 0
+        for start, end in utils.find_content_spans(data):
+            body = data[start:end]
+            digest = hashlib.sha256(body).hexdigest()
+            blob_path = self._blob_path(digest)
+            if not blob_path.exists():
+                _write_atomic(blob_path, gzip.compress(body))
+            pieces.append(data[position:start])
+            pieces.append(b'<content __blob__="%s"/>' % digest.encode("ascii"))
+            position = end
+        pieces.append(data[position:])
+        _write_atomic(self._archive_path(patch_number), gzip.compress(b"".join(pieces)))
+
+    def _prune_archives(self) -> None:
+        """Drops archived snapshots the keep-every policy no longer covers, then orphan blobs."""
+        referenced = set()
+        for patch_number in self.archived_patch_numbers():
+            archive_path = self._archive_path(patch_number)
+            if patch_number % self.keep_every != 0:
+                archive_path.unlink(missing_ok=True)
+                continue
+            skeleton = gzip.decompress(archive_path.read_bytes())
+            referenced.update(m.decode("ascii") for m in _BLOB_REF_PATTERN.findall(skeleton))
+
+        if self.blobs_dir.is_dir():
+            for blob_path in self.blobs_dir.glob("*.xml.gz"):
+                if blob_path.name.removesuffix(".xml.gz") not in referenced:
+                    blob_path.unlink(missing_ok=True)
+
+    def read_snapshot(self, patch_number: int) -> bytes | None:
+        """Returns the exact bytes of a snapshot, whether it is still hot or archived."""
+        patch_file = self.book_dir / f"patch-{patch_number:02d}.xml"
+        if patch_file.exists():
+            return patch_file.read_bytes()
+
+        archive_path = self._archive_path(patch_number)
+        if not archive_path.exists():
+            return None
+        skeleton = gzip.decompress(archive_path.read_bytes())
+        return _BLOB_REF_PATTERN.sub(
+            lambda m: gzip.decompress(self._blob_path(m.group(1).decode("ascii")).read_bytes()),
+            skeleton,
+        )
+
+    def materialize(self, patch_number: int) -> Path | None:
+        """
+        Ensures patch-NN.xml exists in the project folder, restoring it from history if needed.
+
+        Returns:
+            Path to the uncompressed snapshot, or None if it was never kept
+        """
+        patch_file = self.book_dir / f"patch-{patch_number:02d}.xml"
+        if patch_file.exists():
+            return patch_file
+        data = self.read_snapshot(patch_number)
+        if data is None:
+            return None
+        _write_atomic(patch_file, data)
+        return patch_file
+
+    def disk_usage(self) -> tuple[int, int]:
+        """Returns (bytes in hot snapshots, bytes in history/) for reporting."""
+        hot = sum(p.stat().st_size for p in self.book_dir.glob("patch-*.xml"))
+        archived = 0
+        if self.history_dir.is_dir():
+            archived = sum(p.stat().st_size for p in self.history_dir.rglob("*.gz"))
+        return hot, archived
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
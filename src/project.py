@@ -2,29 +2,75 @@
 """
 project.py - Manages the state of a novel project, including loading, saving, and patching.
 """
-import copy
+import html
+import io
+import re
+import sqlite3
 import uuid
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 from rich.console import Console
 
-from src import utils
+from src import config, utils
 from src.config import DATE_FORMAT_FOR_FOLDER
+from src.patch_history import PatchHistory
+from src.project_manifest import ProjectManifest, ProjectSummary, folder_mtime
+from src.project_store import STORE_FILENAME, ProjectStore, migrate_project_to_store
+
+# Captures the leading text of each non-empty <paragraph>, i.e. what ET exposes as .text
+_PARAGRAPH_TEXT_PATTERN = re.compile(rb"<paragraph(?:\s[^>]*)?(?<!/)>([^<]*)")
+
+# Paragraph-level edit operations a chapter patch may contain instead of full <content>
+PARAGRAPH_EDIT_TAGS = ("replace", "insert", "delete")
+
+
+def _count_span_words(data: bytes, start: int, end: int) -> int:
+    """Counts paragraph words in a byte range of serialized XML without building elements."""
+    word_count = 0
+    for raw_text in _PARAGRAPH_TEXT_PATTERN.findall(data, start, end):
+        if raw_text.isascii() and b"&#" not in raw_text:
+            # Named entities never contain whitespace, so a byte split gives the same count
+            word_count += len(raw_text.split())
+        else:
+            word_count += utils.count_words(html.unescape(raw_text.decode("utf-8")))
+    return word_count
+
+
+@dataclass(slots=True)
+class ContentSpan:
+    """Location of a chapter's unloaded <content> element inside a state file."""
+
+    source: Path
+    start: int
+    end: int
+    index: int
+    tail: str | None
+    word_count: int
 
 
 class Project:
     """Manages the entire state of a single writing project."""
 
-    def __init__(self, console: Console, resume_folder_name: str | None = None):
+    def __init__(
+        self, console: Console, resume_folder_name: str | None = None, lazy: bool = False
+    ):
         self.console = console
-        self.book_root: ET.Element | None = None
+        self._book_root: ET.Element | None = None
+        # Chapters whose <content> has not been read yet (lazy mode only)
+        self._lazy_content: dict[ET.Element, ContentSpan] = {}
+        self.lazy = lazy
         self.book_dir: Path | None = None
         self.book_id: str = ""
         self.book_title_slug: str = "untitled"
         self.chapters_generated_in_session: set = set()
         self.story_type: str = "novel"
+        # Highest patch-NN.xml number on disk for this project (0 = none yet)
+        self.latest_patch_number: int = 0
+        # SQLite backend (project.db); None for projects stored as XML snapshots
+        self.store: ProjectStore | None = None
 
         if resume_folder_name:
             self.console.print(f"Resuming project from: [cyan]{resume_folder_name}[/cyan]")
@@ -60,6 +106,52 @@ class Project:
             self.console.print("Starting a new project.")
             # Directory and initial files will be created by setup_new_project
 
+    @property
+    def book_root(self) -> ET.Element | None:
+        """The full book tree. In lazy mode, accessing it loads all pending chapter content."""
+        if self._lazy_content:
+            self.load_all_content()
+        return self._book_root
+
+    @book_root.setter
+    def book_root(self, value: ET.Element | None) -> None:
+        self._book_root = value
+        self._lazy_content = {}
+
+    @property
+    def outline_root(self) -> ET.Element | None:
+        """
+        The book tree without forcing pending chapter content to load.
+
+        Use this for outline-level reads (titles, summaries, characters). Chapters
+        loaded lazily have no <content> child; use get_chapter_word_count instead.
+        """
+        return self._book_root
+
+    def get_chapter_word_count(self, chapter: ET.Element) -> int:
+        """Returns the word count of a chapter without loading lazy content."""
+        word_count = sum(utils.count_words(p.text) for p in chapter.findall(".//paragraph"))
+        span = self._lazy_content.get(chapter)
+        if span is not None:
+            word_count += span.word_count
+        return word_count
+
+    def load_chapter_content(self, chapter: ET.Element) -> None:
+        """Reads a lazily loaded chapter's <content> from disk and attaches it."""
+        span = self._lazy_content.pop(chapter, None)
+        if span is None:
+            return
+        with open(span.source, "rb") as f:
+            f.seek(span.start)
+            content = ET.fromstring(f.read(span.end - span.start))
+        content.tail = span.tail
+        chapter.insert(span.index, content)
+
+    def load_all_content(self) -> None:
+        """Loads every pending chapter <content> so the tree matches an eager load."""
+        for chapter in list(self._lazy_content):
+            self.load_chapter_content(chapter)
+
     def setup_new_project(self, idea: str, title: str, synopsis: str) -> None:
         """Initializes the structure for a new project."""
         self.book_id = str(uuid.uuid4())[:8]
@@ -107,6 +199,8 @@ class Project:
 
         ET.SubElement(self.book_root, "chapters")
 
+        if config.PROJECT_STORAGE_BACKEND == "sqlite":
+            self.store = ProjectStore(self.book_dir / STORE_FILENAME)
         self.save_state("outline.xml")
 
     def _load_state(self) -> None:
@@ -114,39 +208,158 @@ class Project:
         if not self.book_dir:
             raise ValueError("Book directory not set.")
 
+        store_file = self.book_dir / STORE_FILENAME
+        if store_file.exists():
+            self._load_state_from_store(store_file)
+            return
+
         outline_file = self.book_dir / "outline.xml"
         if not outline_file.exists():
             raise FileNotFoundError(f"Required outline.xml not found in '{self.book_dir}'")
 
-        # Find all patch files and get the latest one (highest number)
-        patch_files = sorted(
-            [p for p in self.book_dir.glob("patch-*.xml") if p.stem.split("-")[-1].isdigit()],
-            key=lambda p: int(p.stem.split("-")[-1]),
-        )
+        # The manifest remembers the patch sequence (and the story type, which is not
+        # stored in the XML), so the folder is only listed when it disagrees with the files
+        manifest_entry = ProjectManifest(self.book_dir.parent).get(self.book_dir.name)
+        if manifest_entry is not None:
+            self.story_type = manifest_entry.story_type
+        if manifest_entry is not None and self._is_latest_patch(manifest_entry.latest_patch):
+            self.latest_patch_number = manifest_entry.latest_patch
+            latest_hot_patch = self.latest_patch_number
+        else:
+            latest_hot_patch = self._recover_patch_sequence()
 
-        if patch_files:
-            # Load from the latest patch file (which contains the complete state)
-            latest_patch = patch_files[-1]
-            try:
-                tree = ET.parse(latest_patch)
-                self.book_root = tree.getroot()
-                self.console.print(f"Loaded project state from: [cyan]{latest_patch.name}[/cyan]")
-            except ET.ParseError as e:
-                self.console.print(f"[bold red]Error parsing {latest_patch.name}: {e}[/bold red]")
-                raise
+        # Load from the latest patch file (which contains the complete state), else outline.xml
+        if latest_hot_patch:
+            state_file = self.book_dir / f"patch-{latest_hot_patch:02d}.xml"
         else:
-            # No patch files, load from outline.xml
-            try:
-                tree = ET.parse(outline_file)
-                self.book_root = tree.getroot()
-                self.console.print(f"Loaded base state from: [cyan]outline.xml[/cyan]")
-            except ET.ParseError as e:
-                self.console.print(f"[bold red]Error parsing outline.xml: {e}[/bold red]")
-                raise
+            state_file = outline_file
+        try:
+            if self.lazy:
+                self._parse_state_lazily(state_file)
+            else:
+                self.book_root = ET.parse(state_file).getroot()
+        except ET.ParseError as e:
+            self.console.print(f"[bold red]Error parsing {state_file.name}: {e}[/bold red]")
+            raise
+        if latest_hot_patch:
+            self.console.print(f"Loaded project state from: [cyan]{state_file.name}[/cyan]")
+        else:
+            self.console.print("Loaded base state from: [cyan]outline.xml[/cyan]")
 
         # Restore chapters_generated_in_session based on chapters with content
         self._restore_generated_chapters_set()
 
+    def _load_state_from_store(self, store_file: Path) -> None:
+        """Loads the current state of a SQLite-backed project (always eagerly)."""
+        self.store = ProjectStore(store_file)
+        book_root = self.store.load_book()
+        if book_root is None:
+            raise FileNotFoundError(f"No saved state found in '{store_file}'")
+        self.book_root = book_root
+        self.latest_patch_number = self.store.latest_patch_number()
+        self.story_type = self.store.get_metadata("story_type", self.story_type)
+        self.console.print(f"Loaded project state from: [cyan]{store_file.name}[/cyan]")
+        self._restore_generated_chapters_set()
+
+    def _parse_state_lazily(self, state_file: Path) -> None:
+        """
+        Loads metadata and outline from a state file while leaving chapter content on disk.
+
+        Each <content> element is cut out of the raw bytes and replaced with a small
+        placeholder, so iterparse only builds the outline skeleton. The byte span of every
+        chapter's content is recorded for on-demand loading, along with its word count.
+        """
+        data = state_file.read_bytes()
+
+        pieces = []
+        span_bounds = utils.find_content_spans(data)
+        position = 0
+        for span_index, (start, end) in enumerate(span_bounds):
+            pieces.append(data[position:start])
+            pieces.append(b'<content __span__="%d"/>' % span_index)
+            position = end
+        pieces.append(data[position:])
+
+        spans: dict[ET.Element, ContentSpan] = {}
+        root = None
+        for event, elem in ET.iterparse(io.BytesIO(b"".join(pieces)), events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag != "chapter":
+                continue
+            for index, child in enumerate(elem):
+                if child.tag != "content" or "__span__" not in child.attrib:
+                    continue
+                start, end = span_bounds[int(child.attrib.pop("__span__"))]
+                spans[elem] = ContentSpan(
+                    source=state_file,
+                    start=start,
+                    end=end,
+                    index=index,
+                    tail=child.tail,
+                    word_count=_count_span_words(data, start, end),
+                )
+                elem.remove(child)
+                break
+
+        # A <content> outside any chapter is loaded eagerly instead
+        for elem in list(root.iter()):
+            for index, child in enumerate(list(elem)):
+                if child.tag == "content" and "__span__" in child.attrib:
+                    start, end = span_bounds[int(child.attrib.pop("__span__"))]
+                    content = ET.fromstring(data[start:end])
+                    content.tail = child.tail
+                    elem.remove(child)
+                    elem.insert(index, content)
+
+        self.book_root = root
+        self._lazy_content = spans
+
+    def _is_latest_patch(self, patch_number: int) -> bool:
+        """
+        Checks a cached patch number against the folder with two existence checks (a
+        listing of the folder and its history/ archive for 0).
+        """
+        if patch_number < 0:
+            return False
+        if patch_number == 0:
+            # Retention may have archived patch-01 while later snapshots remain, so only a
+            # folder without any snapshot confirms that none was saved
+            history = PatchHistory(self.book_dir)
+            return not history.hot_patch_numbers() and not history.archived_patch_numbers()
+        if not (self.book_dir / f"patch-{patch_number:02d}.xml").exists():
+            return False
+        return not (self.book_dir / f"patch-{patch_number + 1:02d}.xml").exists()
+
+    def _recover_patch_sequence(self) -> int:
+        """
+        Rebuilds latest_patch_number by listing the project folder and its history/ archive.
+
+        Returns:
+            Highest patch number still present uncompressed in the folder (0 = none)
+        """
+        history = PatchHistory(self.book_dir)
+        hot = history.hot_patch_numbers()
+        archived = history.archived_patch_numbers()
+        self.latest_patch_number = max(hot[-1:] + archived[-1:], default=0)
+        return hot[-1] if hot else 0
+
+    def next_patch_number(self) -> int:
+        """
+        Returns the number for the next patch-NN.xml snapshot.
+
+        The sequence is tracked in memory; the folder is only rescanned when a file
+        appeared or vanished behind the project's back. SQLite-backed projects are only
+        written through this object, so their in-memory sequence is authoritative.
+        """
+        if self.book_dir is None or self.store is not None:
+            return self.latest_patch_number + 1
+        if not self._is_latest_patch(self.latest_patch_number):
+            self._recover_patch_sequence()
+        return self.latest_patch_number + 1
+
     def save_state(self, filename: str) -> bool:
         """Saves the current book_root to a specified XML file."""
         if self.book_root is None or self.book_dir is None:
@@ -155,6 +368,10 @@ class Project:
             )
             return False
 
+        patch_number = utils.parse_patch_number(filename)
+        if self.store is not None:
+            return self._save_state_to_store(filename, patch_number)
+
         filepath = self.book_dir / filename
         try:
             xml_str = utils.pretty_xml(self.book_root)
@@ -163,13 +380,86 @@ class Project:
             self.console.print(
                 f"[green]Project state saved to:[/green] [cyan]{filepath.name}[/cyan]"
             )
-            return True
         except Exception as e:
             self.console.print(
                 f"[bold red]Error saving project state to {filepath}: {e}[/bold red]"
             )
             return False
 
+        if patch_number is not None:
+            self.latest_patch_number = max(self.latest_patch_number, patch_number)
+            if config.ENABLE_PATCH_HISTORY_RETENTION:
+                PatchHistory(self.book_dir).apply_retention()
+        ProjectManifest(self.book_dir.parent).update(self.build_summary())
+        return True
+
+    def _save_state_to_store(self, label: str, patch_number: int | None) -> bool:
+        """Records the current book_root as a new version in project.db."""
+        try:
+            self.store.save(
+                self.book_root, label, patch_number, metadata={"story_type": self.story_type}
+            )
+        except sqlite3.Error as e:
+            self.console.print(
+                f"[bold red]Error saving project state to {self.store.db_path}: {e}[/bold red]"
+            )
+            return False
+        self.console.print(
+            f"[green]Project state saved to:[/green] [cyan]{self.store.db_path.name}[/cyan] "
+            f"({label})"
+        )
+        if patch_number is not None:
+            self.latest_patch_number = max(self.latest_patch_number, patch_number)
+        ProjectManifest(self.book_dir.parent).update(self.build_summary())
+        return True
+
+    def migrate_to_store(self) -> bool:
+        """
+        Moves an XML-backed project onto the SQLite backend (project.db).
+
+        outline.xml and every snapshot on disk, the latest of which is the current
+        state, are imported as versions; the XML files are left in place. Later saves
+        and loads use project.db.
+        """
+        if self.book_dir is None or self.store is not None:
+            return False
+        store_file = self.book_dir / STORE_FILENAME
+        try:
+            store = migrate_project_to_store(self.book_dir)
+        except (sqlite3.Error, OSError, ET.ParseError) as e:
+            self.console.print(
+                f"[bold red]Error migrating project to {store_file.name}: {e}[/bold red]"
+            )
+            # A half-imported database would be loaded in place of the XML files
+            store_file.unlink(missing_ok=True)
+            return False
+        self.store = store
+        self.latest_patch_number = max(self.latest_patch_number, store.latest_patch_number())
+        self.console.print(f"[green]Project migrated to:[/green] [cyan]{store_file.name}[/cyan]")
+        return True
+
+    def close(self) -> None:
+        """Closes the SQLite store of a project that uses one."""
+        if self.store is not None:
+            self.store.close()
+
+    def build_summary(self) -> ProjectSummary:
+        """Builds this project's manifest entry from the in-memory state."""
+        summary = ProjectSummary(
+            folder=self.book_dir.name if self.book_dir else "",
+            story_type=self.story_type,
+            latest_patch=self.latest_patch_number,
+        )
+        if self.book_dir is not None and self.book_dir.is_dir():
+            summary.last_modified = folder_mtime(self.book_dir)
+        book_root = self.outline_root
+        if book_root is not None:
+            summary.title = book_root.findtext("title") or summary.title
+            chapters = book_root.findall(".//chapter")
+            summary.chapter_count = len(chapters)
+            summary.word_count = sum(self.get_chapter_word_count(c) for c in chapters)
+        return summary
+
     def apply_patch(self, patch_xml_str: str, is_loading: bool = False) -> bool:
         """Applies a patch XML string to the current book_root."""
         patch_root = utils.parse_xml_string(patch_xml_str, self.console, expected_root_tag="patch")
@@ -199,29 +489,41 @@ class Project:
                         )
                     continue
 
-                new_content = chapter_patch.find("content")
+                if any(child.tag in PARAGRAPH_EDIT_TAGS for child in chapter_patch):
+                    if self._apply_paragraph_edits(
+                        target_chapter, chapter_patch, chapter_id, is_loading
+                    ):
+                        if not is_loading:
+                            self.chapters_generated_in_session.add(chapter_id)
+                        applied_changes = True
+                    continue
 
-                # Handle case where paragraphs are directly under chapter (without content wrapper)
-                if new_content is None:
+                # Move the parsed <content> out of the patch tree instead of copying it;
+                # the patch tree is discarded once applied.
+                new_content = chapter_patch.find("content")
+                if new_content is not None:
+                    chapter_patch.remove(new_content)
+                else:
+                    # Handle case where paragraphs are directly under chapter (without content wrapper)
                     paragraphs = chapter_patch.findall("paragraph")
                     if paragraphs:
-                        # Create a content element and move paragraphs into it
                         new_content = ET.Element("content")
                         for paragraph in paragraphs:
-                            if paragraph.text:
-                                paragraph.text = utils.clean_paragraph_text(paragraph.text)
-                            new_content.append(copy.deepcopy(paragraph))
+                            chapter_patch.remove(paragraph)
+                            new_content.append(paragraph)
 
                 if new_content is not None:
-                    # Clean paragraph text to remove unwanted line breaks
-                    for paragraph in new_content.findall("paragraph"):
+                    # Clean paragraph text to remove unwanted line breaks (single pass) and
+                    # number the paragraphs, so later paragraph edits can refer to them
+                    for number, paragraph in enumerate(new_content.findall("paragraph"), start=1):
                         if paragraph.text:
                             paragraph.text = utils.clean_paragraph_text(paragraph.text)
+                        paragraph.set("id", str(number))
 
                     old_content = target_chapter.find("content")
                     if old_content is not None:
                         target_chapter.remove(old_content)
-                    target_chapter.append(copy.deepcopy(new_content))
+                    target_chapter.append(new_content)
                     if not is_loading:
                         self.console.print(
                             f"[green]Applied full content patch to Chapter {chapter_id}.[/green]"
@@ -230,16 +532,18 @@ class Project:
                     applied_changes = True
 
             # Apply top-level element patches (title, synopsis, characters, story_elements)
-            for element_patch in patch_root:
+            # Iterate over a snapshot of the children since matched elements are moved out.
+            for element_patch in list(patch_root):
                 if element_patch.tag not in ["title", "synopsis", "characters", "story_elements"]:
                     continue
 
-                if self.book_root is not None:
-                    target_element = self.book_root.find(element_patch.tag)
+                if self._book_root is not None:
+                    target_element = self._book_root.find(element_patch.tag)
                     if target_element is not None:
-                        self.book_root.remove(target_element)
+                        self._book_root.remove(target_element)
 
-                    self.book_root.append(copy.deepcopy(element_patch))
+                    patch_root.remove(element_patch)
+                    self._book_root.append(element_patch)
                     if not is_loading:
                         self.console.print(
                             f"[green]Applied patch for <{element_patch.tag}>.[/green]"
@@ -258,16 +562,96 @@ class Project:
 
         return applied_changes
 
+    def _apply_paragraph_edits(
+        self, chapter: ET.Element, chapter_patch: ET.Element, chapter_id: str, is_loading: bool
+    ) -> bool:
+        """
+        Applies <replace paragraph="N">, <insert after="N"> and <delete paragraph="N"/> edits.
+
+        Ids refer to the chapter as it was before the patch (after="0" inserts at the
+        start), so the operations are independent of each other. The chapter's paragraphs
+        are renumbered sequentially afterwards.
+        """
+        content = chapter.find("content")
+        if content is None:
+            content = ET.SubElement(chapter, "content")
+        # A no-op when the edit prompt was built, which numbers the chapter the same way
+        utils.number_paragraphs(chapter)
+        paragraphs = content.findall("paragraph")
+        by_id = {p.get("id"): p for p in paragraphs}
+
+        inserts: dict[str, list[ET.Element]] = {}
+        deleted = set()
+        applied = 0
+        for operation in chapter_patch:
+            if operation.tag not in PARAGRAPH_EDIT_TAGS:
+                continue
+            is_insert = operation.tag == "insert"
+            target_attribute = "after" if is_insert else "paragraph"
+            target_id = operation.get(target_attribute)
+            if not target_id:
+                if not is_loading:
+                    self.console.print(
+                        f"[yellow]Warning: <{operation.tag}> in Chapter {chapter_id} patch has no "
+                        f"{target_attribute!r} attribute, skipping.[/yellow]"
+                    )
+                continue
+            if target_id not in by_id and not (is_insert and target_id == "0"):
+                if not is_loading:
+                    self.console.print(
+                        f"[yellow]Warning: Chapter {chapter_id} has no paragraph "
+                        f"{target_id!r}, skipping <{operation.tag}>.[/yellow]"
+                    )
+                continue
+
+            text = utils.clean_paragraph_text(operation.text or "")
+            if operation.tag == "replace":
+                by_id[target_id].text = text
+            elif operation.tag == "delete":
+                deleted.add(target_id)
+            else:
+                paragraph = ET.Element("paragraph")
+                paragraph.text = text
+                inserts.setdefault(target_id, []).append(paragraph)
+            applied += 1
+
+        if not applied:
+            return False
+
+        new_order = list(inserts.get("0", []))
+        for paragraph in paragraphs:
+            paragraph_id = paragraph.get("id")
+            if paragraph_id not in deleted:
+                new_order.append(paragraph)
+            new_order.extend(inserts.get(paragraph_id, []))
+        for paragraph in paragraphs:
+            content.remove(paragraph)
+        for number, paragraph in enumerate(new_order, start=1):
+            paragraph.set("id", str(number))
+            content.append(paragraph)
+
+        if not is_loading:
+            self.console.print(
+                f"[green]Applied {applied} paragraph edit(s) to Chapter {chapter_id}.[/green]"
+            )
+        return True
+
     def find_chapter(self, chapter_id: str | None) -> ET.Element | None:
         """Finds a chapter element by its 'id' attribute or child element."""
-        if self.book_root is None or not chapter_id:
+        if self._book_root is None or not chapter_id:
             return None
+        chapter = self._find_chapter_in_outline(chapter_id)
+        if chapter is not None:
+            self.load_chapter_content(chapter)
+        return chapter
+
+    def _find_chapter_in_outline(self, chapter_id: str) -> ET.Element | None:
         # Try attribute-based ID first
-        chapter = self.book_root.find(f".//chapter[@id='{chapter_id}']")
+        chapter = self._book_root.find(f".//chapter[@id='{chapter_id}']")
         if chapter is not None:
             return chapter
         # Try child element-based ID
-        for chapter in self.book_root.findall(".//chapter"):
+        for chapter in self._book_root.findall(".//chapter"):
             if chapter.findtext("id") == chapter_id:
                 return chapter
         return None
@@ -300,24 +684,19 @@ class Project:
 
     def _restore_generated_chapters_set(self) -> None:
         """Restores the chapters_generated_in_session set based on chapters with content."""
-        if not self.book_root:
+        if self._book_root is None:
             return
 
         chapters_with_content = []
-        all_chapters = self.book_root.findall(".//chapter")
+        all_chapters = self._book_root.findall(".//chapter")
 
         for chapter in all_chapters:
-            # Check if chapter has content with paragraphs that contain text
-            content_elem = chapter.find("content")
-            if content_elem is not None:
-                paragraphs = content_elem.findall("paragraph")
-                has_text_content = any(p.text and p.text.strip() for p in paragraphs)
-
-                if has_text_content:
-                    chapter_id = chapter.get("id") or chapter.findtext("id")
-                    if chapter_id:
-                        self.chapters_generated_in_session.add(chapter_id)
-                        chapters_with_content.append(chapter_id)
+            # A chapter has content when its paragraphs contain any words
+            if self.get_chapter_word_count(chapter) > 0:
+                chapter_id = chapter.get("id") or chapter.findtext("id")
+                if chapter_id:
+                    self.chapters_generated_in_session.add(chapter_id)
+                    chapters_with_content.append(chapter_id)
 
         if chapters_with_content:
             self.console.print(
@@ -389,7 +768,7 @@ class Project:
 
                 # Save the changes
                 if self.book_dir:
-                    patch_num = utils.get_next_patch_number(self.book_dir)
+                    patch_num = self.next_patch_number()
                     self.save_state(f"patch-{patch_num:02d}.xml")
                     self.console.print(
                         f"[green]✓ {section_name.replace('_', ' ')} updated successfully.[/green]"
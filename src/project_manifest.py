@@ -0,0 +1,169 @@
+"""
+project_manifest.py - Maintains projects/index.json, a summary of every project on disk.
+
+The manifest lets the project-selection menu list projects with a single small read
+instead of parsing each project's XML. Entries are updated whenever a project saves
+its state and are rebuilt individually when a project folder changed behind our back.
+"""
+import json
+import os
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from src import utils
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILENAME = "index.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass(slots=True)
+class ProjectSummary:
+    """Manifest entry describing one project folder."""
+
+    folder: str
+    title: str = "Unknown Title"
+    story_type: str = "novel"
+    chapter_count: int = 0
+    word_count: int = 0
+    latest_patch: int = 0
+    last_modified: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ProjectSummary":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+def folder_mtime(project_dir: Path) -> float:
+    """
+    Returns the last-modified time of a project folder.
+
+    New patch files bump the directory mtime, while in-place rewrites of outline.xml
+    (or of project.db for SQLite-backed projects) only bump the file itself, so those
+    are checked too.
+    """
+    mtime = project_dir.stat().st_mtime
+    for name in ("outline.xml", "project.db"):
+        state_file = project_dir / name
+        if state_file.exists():
+            mtime = max(mtime, state_file.stat().st_mtime)
+    return mtime
+
+
+class ProjectManifest:
+    """Reads, updates and incrementally rebuilds the projects/index.json manifest."""
+
+    def __init__(self, projects_dir: Path = Path("projects")) -> None:
+        self.projects_dir = projects_dir
+        self.path = projects_dir / MANIFEST_FILENAME
+        self.entries: dict[str, ProjectSummary] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable project manifest {self.path}: {e}")
+            return
+
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        for folder, entry in data.get("projects", {}).items():
+            try:
+                self.entries[folder] = ProjectSummary.from_dict({**entry, "folder": folder})
+            except TypeError:
+                continue
+
+    def save(self) -> None:
+        """Writes the manifest atomically so a crash never leaves a truncated index."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "projects": {
+                folder: {k: v for k, v in asdict(entry).items() if k != "folder"}
+                for folder, entry in self.entries.items()
+            },
+        }
+        try:
+            self.projects_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write project manifest {self.path}: {e}")
+
+    def get(self, folder: str) -> ProjectSummary | None:
+        return self.entries.get(folder)
+
+    def update(self, summary: ProjectSummary) -> None:
+        """Stores an entry and writes the manifest."""
+        self.entries[summary.folder] = summary
+        self.save()
+
+    def remove(self, folder: str) -> None:
+        """Drops an entry (e.g. after the project folder was deleted) and writes the manifest."""
+        if self.entries.pop(folder, None) is not None:
+            self.save()
+
+    def list_projects(self) -> list[ProjectSummary]:
+        """
+        Returns summaries of all project folders, most recently modified first.
+
+        Entries whose folder changed since they were recorded (or that are missing) are
+        rebuilt from disk; entries for deleted folders are dropped. The manifest is only
+        rewritten when something changed.
+        """
+        if not self.projects_dir.is_dir():
+            return []
+
+        changed = False
+        seen = set()
+        for project_dir in self.projects_dir.iterdir():
+            if not project_dir.is_dir():
+                continue
+            seen.add(project_dir.name)
+            entry = self.entries.get(project_dir.name)
+            try:
+                mtime = folder_mtime(project_dir)
+            except OSError:
+                continue
+            if entry is None or mtime > entry.last_modified:
+                self.entries[project_dir.name] = summarize_project_dir(project_dir)
+                changed = True
+
+        for folder in list(self.entries):
+            if folder not in seen:
+                del self.entries[folder]
+                changed = True
+
+        if changed:
+            self.save()
+
+        return sorted(self.entries.values(), key=lambda e: e.last_modified, reverse=True)
+
+
+def summarize_project_dir(project_dir: Path) -> ProjectSummary:
+    """Builds a manifest entry by lazily loading a project's latest state from disk."""
+    from rich.console import Console
+
+    from src.project import Project
+
+    summary = ProjectSummary(folder=project_dir.name)
+    try:
+        summary.last_modified = folder_mtime(project_dir)
+        project = Project(Console(quiet=True), str(project_dir), lazy=True)
+    except Exception as e:
+        logger.warning(f"Could not summarize project {project_dir}: {e}")
+        # Still show a title if the outline itself is readable
+        summary.title = utils.read_book_title(project_dir / "outline.xml") or summary.title
+        return summary
+    try:
+        return project.build_summary()
+    finally:
+        project.close()
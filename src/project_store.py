@@ -0,0 +1,520 @@
+"""
+project_store.py - SQLite storage backend for a project's book state.
+
+The book is kept as rows instead of one XML snapshot per save: top-level elements,
+characters, chapters and their paragraphs, plus a version log. Saves are a single
+transaction that rewrites only the chapters whose content changed, and questions such
+as "word count per chapter" or "history of chapter 7" are indexed lookups instead of a
+full-tree parse. The Project class still works on an ElementTree in memory, so
+apply_patch and find_chapter behave exactly as with the XML backend; the tree can be
+imported from and exported to the existing XML layout at any time.
+"""
+import hashlib
+import json
+import sqlite3
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from src import utils
+from src.logger import get_logger
+from src.patch_history import PatchHistory
+
+logger = get_logger(__name__)
+
+STORE_FILENAME = "project.db"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS book_elements (
+    position INTEGER PRIMARY KEY,
+    tag TEXT NOT NULL,
+    xml TEXT
+);
+CREATE TABLE IF NOT EXISTS characters (
+    position INTEGER PRIMARY KEY,
+    character_id TEXT,
+    name TEXT,
+    xml TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chapters (
+    chapter_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT,
+    outline_xml TEXT NOT NULL,
+    content_index INTEGER,
+    content_hash TEXT,
+    word_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_chapters_position ON chapters (position);
+CREATE TABLE IF NOT EXISTS paragraphs (
+    chapter_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    paragraph_id TEXT,
+    text TEXT,
+    xml TEXT,
+    PRIMARY KEY (chapter_id, position)
+);
+CREATE TABLE IF NOT EXISTS content_blobs (
+    content_hash TEXT PRIMARY KEY,
+    xml TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    label TEXT NOT NULL,
+    patch_number INTEGER,
+    saved_at TEXT NOT NULL,
+    skeleton TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_versions_patch_number ON versions (patch_number);
+CREATE TABLE IF NOT EXISTS chapter_versions (
+    chapter_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    content_hash TEXT,
+    word_count INTEGER NOT NULL,
+    PRIMARY KEY (chapter_id, version)
+);
+"""
+
+# Top-level elements whose children live in their own tables
+_TABLE_BACKED_ELEMENTS = ("chapters", "characters")
+
+
+@dataclass(slots=True)
+class ChapterVersion:
+    """One change to a chapter's content, as recorded in the version log."""
+
+    version: int
+    label: str
+    saved_at: str
+    word_count: int
+    has_content: bool
+
+
+def chapter_key(chapter: ET.Element, position: int) -> str:
+    """Returns the id a chapter is stored under, matching Project.find_chapter's lookup."""
+    return chapter.get("id") or chapter.findtext("id") or f"#{position}"
+
+
+def _content_rows(content: ET.Element) -> list[tuple[str | None, str | None, str | None]]:
+    """Splits a <content> element into (paragraph_id, text, xml) rows.
+
+    Plain paragraphs are stored as id and text; anything else (extra attributes, inline
+    markup, non-paragraph children) is kept verbatim in the xml column.
+    """
+    rows = []
+    for child in content:
+        if child.tag == "paragraph" and len(child) == 0 and set(child.attrib) <= {"id"}:
+            rows.append((child.get("id"), child.text, None))
+        else:
+            tail, child.tail = child.tail, None
+            rows.append((None, None, ET.tostring(child, encoding="unicode")))
+            child.tail = tail
+    return rows
+
+
+def _build_content(rows) -> ET.Element:
+    content = ET.Element("content")
+    for paragraph_id, text, xml in rows:
+        if xml is not None:
+            content.append(ET.fromstring(xml))
+            continue
+        paragraph = ET.SubElement(content, "paragraph")
+        if paragraph_id is not None:
+            paragraph.set("id", paragraph_id)
+        paragraph.text = text
+    return content
+
+
+def _hash_rows(rows) -> str:
+    return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _count_row_words(rows) -> int:
+    total = 0
+    for _, text, xml in rows:
+        if xml is not None:
+            element = ET.fromstring(xml)
+            total += sum(utils.count_words(p.text) for p in element.iter("paragraph"))
+        else:
+            total += utils.count_words(text)
+    return total
+
+
+class ProjectStore:
+    """Reads and writes one project's book state in a SQLite database."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute(
+                "INSERT OR IGNORE INTO metadata (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+
+    def __enter__(self) -> "ProjectStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get_metadata(self, key: str, default: str | None = None) -> str | None:
+        row = self.conn.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_metadata(self, key: str, value: str) -> None:
+        with self.conn:
+            self._set_metadata(key, value)
+
+    def _set_metadata(self, key: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT INTO metadata (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def has_state(self) -> bool:
+        """True once at least one version has been saved."""
+        return self.conn.execute("SELECT 1 FROM versions LIMIT 1").fetchone() is not None
+
+    def latest_patch_number(self) -> int:
+        row = self.conn.execute("SELECT MAX(patch_number) FROM versions").fetchone()
+        return row[0] or 0
+
+    # --- Saving ---
+
+    def save(
+        self,
+        book_root: ET.Element,
+        label: str,
+        patch_number: int | None = None,
+        metadata: dict[str, str] | None = None,
+    ) -> int:
+        """
+        Stores the book tree as the current state and appends a version, in one transaction.
+
+        Only chapters whose content differs from the stored rows have their paragraphs
+        rewritten and get an entry in the chapter history. Any metadata entries (e.g. the
+        story type, which the XML does not carry) are written in the same transaction.
+
+        Returns:
+            The new version number
+        """
+        with self.conn:
+            stored = {
+                chapter_id: (content_hash, word_count)
+                for chapter_id, content_hash, word_count in self.conn.execute(
+                    "SELECT chapter_id, content_hash, word_count FROM chapters"
+                )
+            }
+            cursor = self.conn.execute(
+                "INSERT INTO versions (label, patch_number, saved_at, skeleton) "
+                "VALUES (?, ?, ?, '')",
+                (label, patch_number, datetime.now().isoformat(timespec="seconds")),
+            )
+            version = cursor.lastrowid
+
+            self.conn.execute("DELETE FROM book_elements")
+            for position, element in enumerate(book_root):
+                xml = None
+                if element.tag not in _TABLE_BACKED_ELEMENTS:
+                    xml = _element_xml(element)
+                self.conn.execute(
+                    "INSERT INTO book_elements (position, tag, xml) VALUES (?, ?, ?)",
+                    (position, element.tag, xml),
+                )
+
+            self._save_characters(book_root.find("characters"))
+            hashes = self._save_chapters(book_root, stored, version)
+            self.conn.execute(
+                "UPDATE versions SET skeleton = ? WHERE version = ?",
+                (_skeleton_xml(book_root, hashes), version),
+            )
+            self._set_metadata("title", book_root.findtext("title") or "")
+            for key, value in (metadata or {}).items():
+                self._set_metadata(key, value)
+        return version
+
+    def _save_characters(self, characters: ET.Element | None) -> None:
+        self.conn.execute("DELETE FROM characters")
+        if characters is None:
+            return
+        for position, character in enumerate(characters):
+            self.conn.execute(
+                "INSERT INTO characters (position, character_id, name, xml) VALUES (?, ?, ?, ?)",
+                (
+                    position,
+                    character.get("id") or character.findtext("id"),
+                    character.findtext("name"),
+                    _element_xml(character),
+                ),
+            )
+
+    def _save_chapters(
+        self, book_root: ET.Element, stored: dict[str, tuple[str | None, int]], version: int
+    ) -> dict[ET.Element, str]:
+        """Upserts chapter rows, rewriting paragraphs only where content changed."""
+        hashes: dict[ET.Element, str] = {}
+        seen = set()
+        chapters = book_root.find("chapters")
+        for position, chapter in enumerate(chapters if chapters is not None else ()):
+            if chapter.tag != "chapter":
+                continue
+            chapter_id = chapter_key(chapter, position)
+            seen.add(chapter_id)
+
+            content_index = None
+            content = None
+            for index, child in enumerate(chapter):
+                if child.tag == "content":
+                    content_index, content = index, child
+                    break
+            rows = _content_rows(content) if content is not None else []
+            content_hash = _hash_rows(rows) if content is not None else None
+            if content_hash is not None:
+                hashes[chapter] = content_hash
+
+            previous_hash, word_count = stored.get(chapter_id, (None, 0))
+            changed = chapter_id not in stored or previous_hash != content_hash
+            if changed:
+                word_count = _count_row_words(rows)
+                self.conn.execute("DELETE FROM paragraphs WHERE chapter_id = ?", (chapter_id,))
+                self.conn.executemany(
+                    "INSERT INTO paragraphs (chapter_id, position, paragraph_id, text, xml) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(chapter_id, i, *row) for i, row in enumerate(rows)],
+                )
+                if content_hash is not None:
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO content_blobs (content_hash, xml) VALUES (?, ?)",
+                        (content_hash, ET.tostring(_build_content(rows), encoding="unicode")),
+                    )
+                self.conn.execute(
+                    "INSERT INTO chapter_versions (chapter_id, version, content_hash, word_count) "
+                    "VALUES (?, ?, ?, ?)",
+                    (chapter_id, version, content_hash, word_count),
+                )
+
+            self.conn.execute(
+                "INSERT INTO chapters (chapter_id, position, title, outline_xml, content_index, "
+                "content_hash, word_count) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(chapter_id) DO UPDATE SET position = excluded.position, "
+                "title = excluded.title, outline_xml = excluded.outline_xml, "
+                "content_index = excluded.content_index, content_hash = excluded.content_hash, "
+                "word_count = excluded.word_count",
+                (
+                    chapter_id,
+                    position,
+                    chapter.findtext("title"),
+                    _outline_xml(chapter, content),
+                    content_index,
+                    content_hash,
+                    word_count,
+                ),
+            )
+
+        for chapter_id in set(stored) - seen:
+            self.conn.execute("DELETE FROM chapters WHERE chapter_id = ?", (chapter_id,))
+            self.conn.execute("DELETE FROM paragraphs WHERE chapter_id = ?", (chapter_id,))
+        return hashes
+
+    # --- Loading ---
+
+    def load_book(self) -> ET.Element | None:
+        """Rebuilds the current book tree from the tables, or None if nothing was saved."""
+        elements = self.conn.execute(
+            "SELECT tag, xml FROM book_elements ORDER BY position"
+        ).fetchall()
+        if not elements:
+            return None
+
+        book_root = ET.Element("book")
+        for tag, xml in elements:
+            if xml is not None:
+                book_root.append(ET.fromstring(xml))
+            elif tag == "characters":
+                characters = ET.SubElement(book_root, "characters")
+                for (character_xml,) in self.conn.execute(
+                    "SELECT xml FROM characters ORDER BY position"
+                ):
+                    characters.append(ET.fromstring(character_xml))
+            elif tag == "chapters":
+                book_root.append(self._load_chapters())
+        return book_root
+
+    def _load_chapters(self) -> ET.Element:
+        paragraphs: dict[str, list] = {}
+        for chapter_id, paragraph_id, text, xml in self.conn.execute(
+            "SELECT chapter_id, paragraph_id, text, xml FROM paragraphs "
+            "ORDER BY chapter_id, position"
+        ):
+            paragraphs.setdefault(chapter_id, []).append((paragraph_id, text, xml))
+
+        chapters = ET.Element("chapters")
+        for chapter_id, outline_xml, content_index in self.conn.execute(
+            "SELECT chapter_id, outline_xml, content_index FROM chapters ORDER BY position"
+        ):
+            chapter = ET.fromstring(outline_xml)
+            if content_index is not None:
+                chapter.insert(content_index, _build_content(paragraphs.get(chapter_id, [])))
+            chapters.append(chapter)
+        return chapters
+
+    def load_version(self, version: int) -> ET.Element | None:
+        """Rebuilds the book tree exactly as it was saved in a given version."""
+        row = self.conn.execute(
+            "SELECT skeleton FROM versions WHERE version = ?", (version,)
+        ).fetchone()
+        if row is None:
+            return None
+        book_root = ET.fromstring(row[0])
+        for chapter in book_root.iter("chapter"):
+            for index, child in enumerate(chapter):
+                content_hash = child.get("__blob__") if child.tag == "content" else None
+                if content_hash is None:
+                    continue
+                (xml,) = self.conn.execute(
+                    "SELECT xml FROM content_blobs WHERE content_hash = ?", (content_hash,)
+                ).fetchone()
+                chapter.remove(child)
+                chapter.insert(index, ET.fromstring(xml))
+                break
+        return book_root
+
+    def version_for_patch(self, patch_number: int) -> int | None:
+        row = self.conn.execute(
+            "SELECT MAX(version) FROM versions WHERE patch_number = ?", (patch_number,)
+        ).fetchone()
+        return row[0]
+
+    # --- Queries ---
+
+    def chapter_word_counts(self) -> dict[str, int]:
+        """Returns {chapter_id: word count} in book order."""
+        return dict(
+            self.conn.execute("SELECT chapter_id, word_count FROM chapters ORDER BY position")
+        )
+
+    def chapters_without_content(self) -> list[str]:
+        """Returns the ids of chapters that have no prose yet, in book order."""
+        return [
+            chapter_id
+            for (chapter_id,) in self.conn.execute(
+                "SELECT chapter_id FROM chapters WHERE word_count = 0 ORDER BY position"
+            )
+        ]
+
+    def chapter_history(self, chapter_id: str) -> list[ChapterVersion]:
+        """Returns every saved version in which a chapter's content changed, oldest first."""
+        return [
+            ChapterVersion(version, label, saved_at, word_count, content_hash is not None)
+            for version, label, saved_at, word_count, content_hash in self.conn.execute(
+                "SELECT v.version, v.label, v.saved_at, cv.word_count, cv.content_hash "
+                "FROM chapter_versions cv JOIN versions v ON v.version = cv.version "
+                "WHERE cv.chapter_id = ? ORDER BY cv.version",
+                (chapter_id,),
+            )
+        ]
+
+    # --- XML import/export ---
+
+    def import_xml(self, xml_path: Path, label: str | None = None) -> int:
+        """Stores a book XML file (outline.xml or patch-NN.xml) as a new version."""
+        label = label or xml_path.name
+        book_root = ET.parse(xml_path).getroot()
+        return self.save(book_root, label, utils.parse_patch_number(label))
+
+    def export_xml(self, xml_path: Path, version: int | None = None) -> bool:
+        """Writes the current state (or a past version) in the XML file layout."""
+        book_root = self.load_book() if version is None else self.load_version(version)
+        if book_root is None:
+            return False
+        with open(xml_path, "w", encoding="utf-8") as f:
+            f.write(utils.pretty_xml(book_root))
+        return True
+
+
+def _element_xml(element: ET.Element) -> str:
+    tail, element.tail = element.tail, None
+    try:
+        return ET.tostring(element, encoding="unicode")
+    finally:
+        element.tail = tail
+
+
+def _outline_xml(chapter: ET.Element, content: ET.Element | None) -> str:
+    """Serializes a chapter without its <content> child."""
+    if content is None:
+        return _element_xml(chapter)
+    index = list(chapter).index(content)
+    chapter.remove(content)
+    try:
+        return _element_xml(chapter)
+    finally:
+        chapter.insert(index, content)
+
+
+def _skeleton_xml(book_root: ET.Element, hashes: dict[ET.Element, str]) -> str:
+    """Serializes the whole book with each chapter's content replaced by a blob reference."""
+    swapped = []
+    for chapter, content_hash in hashes.items():
+        content = chapter.find("content")
+        index = list(chapter).index(content)
+        placeholder = ET.Element("content", __blob__=content_hash)
+        chapter.remove(content)
+        chapter.insert(index, placeholder)
+        swapped.append((chapter, index, content, placeholder))
+    try:
+        return ET.tostring(book_root, encoding="unicode")
+    finally:
+        for chapter, index, content, placeholder in swapped:
+            chapter.remove(placeholder)
+            chapter.insert(index, content)
+
+
+def migrate_project_to_store(book_dir: Path) -> ProjectStore:
+    """
+    Imports an XML-backed project folder into a new project.db.
+
+    outline.xml and every patch snapshot still on disk (including those compressed
+    into history/) are imported in order, so the chapter history is preserved. The XML
+    files are left untouched. The caller owns the returned store and must close it.
+    """
+    store = ProjectStore(book_dir / STORE_FILENAME)
+    try:
+        if not store.has_state():
+            _import_snapshots(store, book_dir)
+    except BaseException:
+        store.close()
+        raise
+    return store
+
+
+def _import_snapshots(store: ProjectStore, book_dir: Path) -> None:
+    """Saves outline.xml and then every patch snapshot, oldest first, as versions."""
+    outline_file = book_dir / "outline.xml"
+    if outline_file.exists():
+        store.import_xml(outline_file)
+
+    history = PatchHistory(book_dir)
+    patch_numbers = sorted(set(history.hot_patch_numbers()) | set(history.archived_patch_numbers()))
+    for patch_number in patch_numbers:
+        data = history.read_snapshot(patch_number)
+        if data is None:
+            continue
+        try:
+            book_root = ET.fromstring(data)
+        except ET.ParseError as e:
+            logger.warning(f"Skipping unreadable snapshot patch-{patch_number:02d}.xml: {e}")
+            continue
+        store.save(book_root, f"patch-{patch_number:02d}.xml", patch_number)
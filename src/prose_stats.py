@@ -0,0 +1,254 @@
+"""
+prose_stats.py - Book-wide prose statistics, vectorised with NumPy.
+
+The sentence lengths, word lengths and word types of every chapter are gathered
+into flat arrays for the whole book, tagged with the chapter they belong to, and
+each statistic is computed for all chapters (and the book as a whole) at once:
+sentence length distributions, variance, the moving-average type-token ratio
+and readability scores. NumPy is optional; without it numpy_available is False
+and book_prose_stats raises ImportError.
+"""
+
+import re
+from dataclasses import dataclass
+
+from src import config
+from src.text_analysis import TextAnalysis
+
+try:
+    import numpy as np
+
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+# Sentence length bins of ContentEnhancer.analyze_sentence_variety_detailed (lower bounds)
+_LENGTH_BINS = {"short": 0, "medium": 10, "long": 25, "very_long": 40}
+# Sentence length bins and ideal shares of QualityEvaluator._evaluate_sentence_variety
+_VARIETY_BINS = (10, 26)
+_VARIETY_IDEAL = (0.25, 0.45, 0.30)
+
+_VOWEL_GROUP_PATTERN = re.compile(r"[aeiouy]+")
+
+
+@dataclass(slots=True)
+class ProseStats:
+    """Prose statistics of one chapter, or of the whole book."""
+
+    label: str  # Chapter id, or "book"
+    word_count: int
+    sentence_count: int
+    mean_sentence_length: float  # Words per sentence
+    median_sentence_length: float  # The upper middle length for an even count
+    sentence_length_std: float
+    length_distribution: dict[str, int]  # Sentences per ContentEnhancer length bin
+    sentence_variety_score: float  # 0-10, as QualityEvaluator scores it
+    type_token_ratio: float  # Unique words / words
+    moving_average_ttr: float  # Mean type-token ratio of every window of words (MATTR)
+    mean_word_length: float  # Characters per word
+    flesch_reading_ease: float  # Higher is easier, 60-70 is plain English
+    flesch_kincaid_grade: float  # US school grade
+
+
+@dataclass(slots=True)
+class BookProseStats:
+    """Prose statistics of each chapter and of the book as a whole."""
+
+    chapters: list[ProseStats]
+    book: ProseStats
+
+
+def _syllables(word: str) -> int:
+    """Estimates a word's syllables from its vowel groups, less a silent final e."""
+    count = len(_VOWEL_GROUP_PATTERN.findall(word))
+    if count > 1 and word.endswith("e") and not word.endswith("le"):
+        count -= 1
+    return max(1, count)
+
+
+def _previous_occurrences(token_ids: "np.ndarray") -> "np.ndarray":
+    """Index of the previous occurrence of each token (-1 for a first occurrence)."""
+    order = np.argsort(token_ids, kind="stable")
+    sorted_ids = token_ids[order]
+    previous_sorted = np.full(len(order), -1, dtype=np.int64)
+    repeats = np.flatnonzero(sorted_ids[1:] == sorted_ids[:-1]) + 1
+    previous_sorted[repeats] = order[repeats - 1]
+    previous = np.empty_like(previous_sorted)
+    previous[order] = previous_sorted
+    return previous
+
+
+def _ratio(numerator: "np.ndarray", denominator: "np.ndarray") -> "np.ndarray":
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+
+def _segment_stats(
+    labels: list[str],
+    sentence_lengths: "np.ndarray",
+    sentence_segments: "np.ndarray",
+    token_ids: "np.ndarray",
+    token_segments: "np.ndarray",
+    previous: "np.ndarray",
+    word_lengths: "np.ndarray",
+    syllables: "np.ndarray",
+    window: int,
+) -> list[ProseStats]:
+    """Statistics of every segment (run of sentences and tokens with the same segment index)."""
+    segments = len(labels)
+
+    # Sentence lengths: moments, upper-middle median and length bins
+    sentence_counts = np.bincount(sentence_segments, minlength=segments)
+    total_length = np.bincount(sentence_segments, weights=sentence_lengths, minlength=segments)
+    total_squares = np.bincount(
+        sentence_segments, weights=sentence_lengths.astype(np.float64) ** 2, minlength=segments
+    )
+    mean_length = _ratio(total_length, sentence_counts)
+    variance = np.maximum(_ratio(total_squares, sentence_counts) - mean_length**2, 0.0)
+    sorted_lengths = sentence_lengths[np.lexsort((sentence_lengths, sentence_segments))]
+    median = np.zeros(segments)
+    if len(sorted_lengths):
+        starts = np.cumsum(sentence_counts) - sentence_counts
+        middle = np.minimum(starts + sentence_counts // 2, len(sorted_lengths) - 1)
+        median = np.where(sentence_counts > 0, sorted_lengths[middle], 0)
+
+    bins = np.digitize(sentence_lengths, list(_LENGTH_BINS.values())[1:])
+    distribution = np.bincount(
+        sentence_segments * len(_LENGTH_BINS) + bins, minlength=segments * len(_LENGTH_BINS)
+    ).reshape(segments, len(_LENGTH_BINS))
+
+    variety_bins = np.digitize(sentence_lengths, _VARIETY_BINS)
+    variety_counts = np.bincount(
+        sentence_segments * 3 + variety_bins, minlength=segments * 3
+    ).reshape(segments, 3)
+    shares = variety_counts / np.maximum(sentence_counts, 1)[:, None]
+    deviation = (
+        np.abs(shares[:, 0] - _VARIETY_IDEAL[0])
+        + np.abs(shares[:, 1] - _VARIETY_IDEAL[1])
+        + np.abs(shares[:, 2] - _VARIETY_IDEAL[2])
+    )
+    variety = np.where(sentence_counts > 0, np.maximum(0, 10 - deviation * 20), 0.0)
+
+    # Tokens: type-token ratio, moving-average type-token ratio, word length, syllables
+    token_counts = np.bincount(token_segments, minlength=segments)
+    type_count = int(token_ids.max()) + 1 if len(token_ids) else 1
+    segment_types = np.unique(token_segments * type_count + token_ids)
+    types_per_segment = np.bincount(segment_types // type_count, minlength=segments)
+    type_token_ratio = _ratio(types_per_segment, token_counts)
+
+    # A token starts a new type in every window [s, s + window) that contains it but
+    # not its previous occurrence; summing those windows per token gives the MATTR total
+    token_ends = np.cumsum(token_counts)
+    token_starts = token_ends - token_counts
+    first = token_starts[token_segments]
+    last_window = token_ends[token_segments] - window
+    positions = np.arange(len(token_ids))
+    window_from = np.maximum(np.maximum(previous + 1, positions - window + 1), first)
+    window_to = np.minimum(positions, last_window)
+    new_type_windows = np.maximum(window_to - window_from + 1, 0)
+    windows = np.maximum(token_counts - window + 1, 0)
+    mattr = np.where(
+        windows > 0,
+        _ratio(
+            np.bincount(token_segments, weights=new_type_windows, minlength=segments),
+            windows * window,
+        ),
+        type_token_ratio,
+    )
+
+    mean_word_length = _ratio(
+        np.bincount(token_segments, weights=word_lengths, minlength=segments), token_counts
+    )
+    syllables_per_word = _ratio(
+        np.bincount(token_segments, weights=syllables, minlength=segments), token_counts
+    )
+    words_per_sentence = _ratio(token_counts, sentence_counts)
+    reading_ease = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+    grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+    readable = (token_counts > 0) & (sentence_counts > 0)
+
+    return [
+        ProseStats(
+            label=labels[i],
+            word_count=int(token_counts[i]),
+            sentence_count=int(sentence_counts[i]),
+            mean_sentence_length=float(mean_length[i]),
+            median_sentence_length=float(median[i]),
+            sentence_length_std=float(np.sqrt(variance[i])),
+            length_distribution=dict(zip(_LENGTH_BINS, map(int, distribution[i]), strict=True)),
+            sentence_variety_score=round(float(variety[i]), 1),
+            type_token_ratio=float(type_token_ratio[i]),
+            moving_average_ttr=float(mattr[i]),
+            mean_word_length=float(mean_word_length[i]),
+            flesch_reading_ease=float(reading_ease[i]) if readable[i] else 0.0,
+            flesch_kincaid_grade=float(grade[i]) if readable[i] else 0.0,
+        )
+        for i in range(segments)
+    ]
+
+
+def book_prose_stats(
+    chapters: list[tuple[str, str | TextAnalysis]], window: int | None = None
+) -> BookProseStats:
+    """
+    Computes the prose statistics of every chapter and of the whole book in one batch.
+
+    Args:
+        chapters: (chapter id, content text or its TextAnalysis) for each chapter, in book order
+        window: Words per moving-average type-token ratio window
+            (defaults to config.MATTR_WINDOW_WORDS)
+
+    Returns:
+        BookProseStats with the chapter statistics in book order
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    if not numpy_available:
+        raise ImportError("Book prose statistics need numpy: uv add numpy")
+    window = window or config.MATTR_WINDOW_WORDS
+    analyses = [TextAnalysis.of(text) for _, text in chapters]
+
+    sentence_lengths = np.fromiter(
+        (length for analysis in analyses for length in analysis.sentence_word_counts),
+        dtype=np.int64,
+    )
+    sentence_segments = np.repeat(
+        np.arange(len(analyses)), [len(analysis.sentence_word_counts) for analysis in analyses]
+    )
+    words = [word for analysis in analyses for word in analysis.lower_words]
+    token_segments = np.repeat(
+        np.arange(len(analyses)), [len(analysis.lower_words) for analysis in analyses]
+    )
+
+    # Every word becomes the index of its type; lengths and syllables are per type
+    types, token_ids = np.unique(np.array(words, dtype=str), return_inverse=True)
+    token_ids = token_ids.astype(np.int64)
+    word_lengths = np.char.str_len(types)[token_ids] if len(types) else np.zeros(0)
+    syllables = np.fromiter(map(_syllables, types.tolist()), dtype=np.int64, count=len(types))[
+        token_ids
+    ]
+    previous = _previous_occurrences(token_ids)
+
+    chapter_stats = _segment_stats(
+        [chapter_id for chapter_id, _ in chapters],
+        sentence_lengths,
+        sentence_segments,
+        token_ids,
+        token_segments,
+        previous,
+        word_lengths,
+        syllables,
+        window,
+    )
+    book_stats = _segment_stats(
+        ["book"],
+        sentence_lengths,
+        np.zeros(len(sentence_lengths), dtype=np.int64),
+        token_ids,
+        np.zeros(len(token_ids), dtype=np.int64),
+        previous,
+        word_lengths,
+        syllables,
+        window,
+    )
+    return BookProseStats(chapters=chapter_stats, book=book_stats[0])
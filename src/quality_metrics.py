@@ -7,6 +7,7 @@ from typing import Optional
 
 from src import config
 from src.slop_detection import SlopDetectionAgent, SlopAnalysis
+from src.text_analysis import MovingAverageTTR, TextAnalysis
 
 
 @dataclass
@@ -43,19 +44,20 @@ class QualityEvaluator:
             self.slop_agent = None
 
     def evaluate_chapter(
-        self, content_text: str, chapter_context: dict | None = None
+        self, content_text: str | TextAnalysis, chapter_context: dict | None = None
     ) -> QualityMetrics:
         """
         Evaluates a chapter's content quality.
 
         Args:
-            content_text: The prose content of the chapter
+            content_text: The prose content of the chapter, or its shared TextAnalysis
             chapter_context: Optional dict with chapter summary, beats, and subbeats for dialogue appropriateness check
 
         Returns:
             QualityMetrics object with all metrics and evaluation results
         """
-        if not content_text or not content_text.strip():
+        analysis = TextAnalysis.of(content_text)
+        if not analysis.text or not analysis.text.strip():
             return QualityMetrics(
                 word_count=0,
                 dialogue_ratio=0.0,
@@ -68,13 +70,13 @@ class QualityEvaluator:
 
         issues = []
 
-        word_count = self._count_words(content_text)
+        word_count = len(analysis.words)
         if word_count < self.thresholds["min_words"]:
             issues.append(
                 f"Word count ({word_count}) below minimum ({self.thresholds['min_words']})"
             )
 
-        dialogue_ratio = self._calculate_dialogue_ratio(content_text)
+        dialogue_ratio = self._calculate_dialogue_ratio(analysis)
 
         # Check if dialogue is expected for this chapter based on context
         dialogue_expected = True
@@ -92,13 +94,13 @@ class QualityEvaluator:
                     f"Dialogue ratio ({dialogue_ratio:.2%}) above maximum ({self.thresholds['max_dialogue_ratio']:.2%})"
                 )
 
-        sentence_variety_score = self._evaluate_sentence_variety(content_text)
+        sentence_variety_score = self._evaluate_sentence_variety(analysis)
         if sentence_variety_score < self.thresholds["min_sentence_variety"]:
             issues.append(
                 f"Sentence variety score ({sentence_variety_score:.1f}/10) below threshold"
             )
 
-        vocabulary_richness_score = self._evaluate_vocabulary_richness(content_text)
+        vocabulary_richness_score = self._evaluate_vocabulary_richness(analysis)
         if vocabulary_richness_score < self.thresholds["min_vocabulary_richness"]:
             issues.append(
                 f"Vocabulary richness score ({vocabulary_richness_score:.1f}/10) below threshold"
@@ -107,7 +109,7 @@ class QualityEvaluator:
         # Run slop detection if enabled
         slop_analysis = None
         if self.enable_slop_detection and self.slop_agent:
-            slop_analysis = self.slop_agent.validate_content_quality(content_text)
+            slop_analysis = self.slop_agent.validate_content_quality(analysis)
             
             # Add slop issues to overall issues list
             if slop_analysis.has_issues:
@@ -238,38 +240,34 @@ class QualityEvaluator:
         words = re.findall(r"\b\w+\b", text)
         return len(words)
 
-    def _calculate_dialogue_ratio(self, text: str) -> float:
+    def _calculate_dialogue_ratio(self, text: str | TextAnalysis) -> float:
         """
         Calculate the ratio of dialogue to total text.
         Dialogue is detected as text within quotation marks.
         """
-        quoted_text = re.findall(r'"([^"]*)"', text)
-        quoted_text.extend(re.findall(r"'([^']*)'", text))
-
-        dialogue_words = sum(self._count_words(quote) for quote in quoted_text)
-        total_words = self._count_words(text)
+        analysis = TextAnalysis.of(text)
+        dialogue_words = analysis.dialogue_word_count
+        total_words = len(analysis.words)
 
         if total_words == 0:
             return 0.0
         return dialogue_words / total_words
 
-    def _evaluate_sentence_variety(self, text: str) -> float:
+    def _evaluate_sentence_variety(self, text: str | TextAnalysis) -> float:
         """
         Evaluate sentence variety on a 1-10 scale.
         Considers distribution of short (<10 words), medium (10-25), and long (>25) sentences.
         """
-        sentences = re.split(r"[.!?]+", text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentence_word_counts = TextAnalysis.of(text).sentence_word_counts
 
-        if not sentences:
+        if not sentence_word_counts:
             return 0.0
 
         short_count = 0
         medium_count = 0
         long_count = 0
 
-        for sentence in sentences:
-            word_count = self._count_words(sentence)
+        for word_count in sentence_word_counts:
             if word_count < 10:
                 short_count += 1
             elif word_count <= 25:
@@ -277,7 +275,7 @@ class QualityEvaluator:
             else:
                 long_count += 1
 
-        total = len(sentences)
+        total = len(sentence_word_counts)
         short_ratio = short_count / total
         medium_ratio = medium_count / total
         long_ratio = long_count / total
@@ -295,35 +293,38 @@ class QualityEvaluator:
         score = max(0, 10 - (variance * 20))
         return round(score, 1)
 
-    def _evaluate_vocabulary_richness(self, text: str) -> float:
+    def _evaluate_vocabulary_richness(self, text: str | TextAnalysis) -> float:
         """
         Evaluate vocabulary richness on a 1-10 scale.
-        Based on the ratio of unique words to total words.
+        Based on the moving-average type-token ratio, the share of unique words in
+        each window of config.MATTR_WINDOW_WORDS words, which unlike the plain ratio
+        of unique to total words does not fall as chapters get longer.
         """
-        words = re.findall(r"\b\w+\b", text.lower())
+        analysis = TextAnalysis.of(text)
 
-        if not words:
+        if not analysis.lower_words:
             return 0.0
 
-        unique_words = set(words)
-        unique_ratio = len(unique_words) / len(words)
+        unique_ratio = MovingAverageTTR().update(analysis.lower_words).value
 
+        # Bands for 50-word windows: flat, repetitive prose sits below 0.70, varied
+        # fiction around 0.75-0.80 and dense literary prose above 0.82
         score = 0
-        if unique_ratio >= 0.70:
+        if unique_ratio >= 0.82:
             score = 9
-        elif unique_ratio >= 0.65:
+        elif unique_ratio >= 0.79:
             score = 8
-        elif unique_ratio >= 0.60:
+        elif unique_ratio >= 0.76:
             score = 7
-        elif unique_ratio >= 0.55:
+        elif unique_ratio >= 0.73:
             score = 6
-        elif unique_ratio >= 0.50:
+        elif unique_ratio >= 0.70:
             score = 5
-        elif unique_ratio >= 0.45:
+        elif unique_ratio >= 0.67:
             score = 4
-        elif unique_ratio >= 0.40:
+        elif unique_ratio >= 0.64:
             score = 3
-        elif unique_ratio >= 0.35:
+        elif unique_ratio >= 0.60:
             score = 2
         else:
             score = 1
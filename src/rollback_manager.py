@@ -7,6 +7,10 @@ from datetime import datetime
 from enum import Enum
 from pathlib import Path
 
+from src import utils
+from src.patch_history import PatchHistory
+from src.project_store import STORE_FILENAME, ProjectStore
+
 
 class GenerationStatus(str, Enum):
     """Status of a generation attempt."""
@@ -315,6 +319,25 @@ ADDITIONAL CLARITY GUIDANCE FOR ATTEMPT 5:
         ):
             return None
 
+        patch_path = Path(target_attempt.result_patch_path)
+        if not patch_path.exists():
+            # The snapshot may have been compressed into history/ by the retention policy
+            patch_number = utils.parse_patch_number(patch_path.name)
+            if patch_number is not None:
+                restored = PatchHistory(self.project_dir).materialize(patch_number)
+                if restored is not None:
+                    return str(restored)
+                # SQLite-backed projects keep their versions in project.db instead
+                store_file = self.project_dir / STORE_FILENAME
+                if store_file.exists():
+                    store = ProjectStore(store_file)
+                    try:
+                        version = store.version_for_patch(patch_number)
+                        if version is not None and store.export_xml(patch_path, version):
+                            return str(patch_path)
+                    finally:
+                        store.close()
+
         return target_attempt.result_patch_path
 
     def get_attempts_summary(self, chapter_id: str) -> str:
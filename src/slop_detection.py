@@ -5,12 +5,17 @@ This module provides comprehensive detection and mitigation of AI-generated "slo
 generic, clichéd, or low-quality content patterns commonly produced by LLMs.
 """
 
+import bisect
+import hashlib
 import re
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple, Optional
 from enum import Enum
 
 from src import config
+from src.text_analysis import TextAnalysis
 
 
 class SlopCategory(Enum):
@@ -35,6 +40,17 @@ class SlopIssue:
     context: str = ""
 
 
+@dataclass
+class SlopEdit:
+    """A removal or replacement applied by auto-cleaning, as a span of the original text."""
+    start: int
+    end: int
+    original: str
+    replacement: str  # Empty for removals
+    category: SlopCategory
+    severity: float
+
+
 @dataclass
 class SlopAnalysis:
     """Results of slop detection analysis."""
@@ -43,6 +59,7 @@ class SlopAnalysis:
     cleaned_text: Optional[str] = None
     removals_count: int = 0
     replacements_count: int = 0
+    edits: List[SlopEdit] = field(default_factory=list)  # Applied edits, in text order
     
     @property
     def has_issues(self) -> bool:
@@ -57,27 +74,243 @@ class SlopAnalysis:
         return sum(issue.severity for issue in self.issues) / len(self.issues)
 
 
+# Characters re.IGNORECASE matches to an ASCII letter although str.lower() does not map them to it
+_IGNORECASE_EXTRAS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+
+# Characters re.IGNORECASE matches to an ASCII letter that str.lower() leaves non-ASCII
+_CASEFOLD_LETTERS = frozenset("\u0131\u017f")
+
+_WORD_PATTERN = re.compile(r"\b[a-zA-Z]+\b")
+
+# Leading run of literal characters in a pattern: anything but metacharacters, or an
+# escaped punctuation character such as \' or \(
+_LITERAL_RUN_PATTERN = re.compile(r"(?:[^\\.^$*+?{}\[\]|()]|\\[^A-Za-z0-9])+")
+_UNESCAPE_PATTERN = re.compile(r"\\(.)")
+
+
+def _pattern_trigger(pattern: str, flags: int) -> tuple[str, bool]:
+    """
+    Finds the literal text every match of a pattern must contain.
+
+    Returns:
+        (trigger, starts_with_trigger): the lowercased literal, empty if there is
+        none or the pattern is case-sensitive, and whether every match begins
+        exactly where the trigger occurs
+    """
+    if "|" in pattern or not flags & re.IGNORECASE:
+        # Only IGNORECASE patterns are checked against the lowercased text
+        return "", False
+    body = pattern
+    starts_with_trigger = True
+    if body.startswith(r"\b"):
+        body = body[2:]
+    elif body.startswith("^"):
+        body = body[1:].removeprefix(r"\s*")
+        starts_with_trigger = False
+
+    run = _LITERAL_RUN_PATTERN.match(body)
+    if not run:
+        return "", False
+    literal = run.group()
+    if body[run.end() : run.end() + 1] in ("?", "*", "{"):
+        # The quantifier makes the run's last character optional
+        literal = literal[:-1]
+    literal = _UNESCAPE_PATTERN.sub(r"\1", literal).lower()
+    return literal, starts_with_trigger and bool(literal)
+
+
+@dataclass
+class _CompiledPattern:
+    """A slop pattern compiled once, with the literal used to skip texts it cannot match."""
+    category: SlopCategory
+    pattern: str
+    regex: re.Pattern
+    severity: float
+    suggestion: str
+    trigger: str
+    starts_with_trigger: bool
+    text_start_only: bool  # Anchored with ^ but not MULTILINE
+
+
+class SlopPatternScanner:
+    """
+    Compiled matcher for every regex-based slop category, shared by all detectors.
+
+    Each pattern keeps its own compiled regex, so matches (including matches of
+    different patterns that overlap) are exactly those of running re.finditer per
+    pattern. What is saved is the work: a pattern runs only if the literal text all
+    of its matches contain occurs in the text, and a pattern whose matches start
+    with that literal is only tried where it occurs instead of at every position.
+    """
+
+    def __init__(self, categories: list[tuple[SlopCategory, int, list[tuple[str, float, str]]]]):
+        """
+        Args:
+            categories: (category, regex flags, [(pattern, severity, suggestion), ...])
+                        in the order issues are reported
+        """
+        self.patterns: list[_CompiledPattern] = []
+        for category, flags, patterns in categories:
+            for pattern, severity, suggestion in patterns:
+                trigger, starts_with_trigger = _pattern_trigger(pattern, flags)
+                self.patterns.append(_CompiledPattern(
+                    category=category,
+                    pattern=pattern,
+                    regex=re.compile(pattern, flags),
+                    severity=severity,
+                    suggestion=suggestion,
+                    trigger=trigger,
+                    starts_with_trigger=starts_with_trigger,
+                    text_start_only=pattern.startswith("^") and not flags & re.MULTILINE,
+                ))
+
+    def scan(self, text: str, lowered: Optional[str] = None) -> Dict[SlopCategory, List[SlopIssue]]:
+        """Returns the issues of every category found in the text, in pattern order."""
+        return self.issues(self.scan_matches(text, lowered))
+
+    def scan_matches(self, text: str, lowered: Optional[str] = None) -> List[Tuple[int, List[Tuple[int, str]]]]:
+        """
+        Returns (pattern index, matches) for every pattern found in the text.
+
+        lowered, the text's str.lower() if the caller already has it, spares lowering
+        ASCII text again.
+        """
+        found = []
+        # Case-insensitive view of the text for the trigger checks
+        if text.isascii():
+            view = lowered if lowered is not None else text.lower()
+        else:
+            view = text.translate(_IGNORECASE_EXTRAS).lower()
+        aligned = len(view) == len(text)
+
+        for index, compiled in enumerate(self.patterns):
+            if compiled.trigger and compiled.trigger not in view:
+                continue
+            if compiled.starts_with_trigger and aligned:
+                matches = self._match_at_triggers(compiled, text, view)
+            else:
+                matches = [(m.start(), m.group()) for m in compiled.regex.finditer(text)]
+            if matches:
+                found.append((index, matches))
+        return found
+
+    def issues(self, pattern_matches: List[Tuple[int, List[Tuple[int, str]]]]) -> Dict[SlopCategory, List[SlopIssue]]:
+        """Builds the issues of every category from scan_matches results, in pattern order."""
+        issues: Dict[SlopCategory, List[SlopIssue]] = {compiled.category: [] for compiled in self.patterns}
+        for index, matches in pattern_matches:
+            compiled = self.patterns[index]
+            issues[compiled.category].append(SlopIssue(
+                category=compiled.category,
+                pattern=compiled.pattern,
+                matches=matches,
+                severity=compiled.severity,
+                suggestion=compiled.suggestion
+            ))
+        return issues
+
+    @staticmethod
+    def _match_at_triggers(compiled: _CompiledPattern, text: str, view: str) -> List[Tuple[int, str]]:
+        """Same matches as finditer, trying the regex only where its leading literal occurs."""
+        matches = []
+        match_at = compiled.regex.match
+        trigger = compiled.trigger
+        position = view.find(trigger)
+        while position != -1:
+            match = match_at(text, position)
+            if match:
+                matches.append((position, match.group()))
+                position = view.find(trigger, match.end())
+            else:
+                position = view.find(trigger, position + 1)
+        return matches
+
+
+def _offsets_align(text: str, lowered: str) -> bool:
+    """
+    Whether offsets in the lowercased text index the original text, and ASCII words
+    found there are exactly those a case-insensitive search of the original finds.
+    """
+    return len(lowered) == len(text) and (text.isascii() or not _CASEFOLD_LETTERS.intersection(text))
+
+
+@dataclass
+class _ParagraphScan:
+    """Sensitivity-independent detection results for one paragraph, with paragraph offsets."""
+    pattern_matches: List[Tuple[int, List[Tuple[int, str]]]]  # (pattern index, matches)
+    word_count: int
+    overused_counts: Dict[str, int]  # Overused-word candidates, in first-occurrence order
+    overused_positions: Dict[str, List[Tuple[int, str]]]
+
+
+class SlopAnalysisCache:
+    """
+    Content-addressed cache of per-paragraph detection results, shared by all detectors.
+
+    Entries are keyed by detector version, sensitivity and a hash of the paragraph, so
+    re-checking an edited chapter only scans the paragraphs that changed. The least
+    recently used entries are dropped once max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = config.SLOP_CACHE_MAX_PARAGRAPHS if max_entries is None else max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, _ParagraphScan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(sensitivity: str, paragraph: str) -> tuple:
+        digest = hashlib.sha256(paragraph.encode("utf-8", "surrogatepass")).digest()
+        return (DETECTOR_VERSION, sensitivity, digest)
+
+    def get(self, key: tuple) -> Optional[_ParagraphScan]:
+        with self._lock:
+            scan = self._entries.get(key)
+            if scan is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return scan
+
+    def put(self, key: tuple, scan: _ParagraphScan) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = scan
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
 class SlopDetector:
     """Main slop detection engine."""
     
-    def __init__(self, sensitivity: str = "medium"):
+    def __init__(self, sensitivity: str = "medium", cache: Optional[SlopAnalysisCache] = None):
         """
         Initialize slop detector.
         
         Args:
             sensitivity: Detection sensitivity - "low", "medium", "high", "strict"
+            cache: Per-paragraph results cache for analyze_paragraphs (defaults to the shared one)
         """
         self.sensitivity = sensitivity
         self.sensitivity_threshold = self._get_sensitivity_threshold(sensitivity)
         
-        # Load slop pattern databases
-        self._generic_phrases = self._load_generic_phrases()
-        self._cliches = self._load_cliches()
+        # Slop pattern databases; the regex-based ones are compiled once for all detectors
         self._overused_words = self._load_overused_words()
-        self._ai_patterns = self._load_ai_patterns()
-        self._weak_prose_patterns = self._load_weak_prose_patterns()
-        self._redundancy_patterns = self._load_redundancy_patterns()
-        self._filler_patterns = self._load_filler_patterns()
+        self._overused_candidates = [word for word in self._overused_words if len(word) > 3]
+        self._scanner = _PATTERN_SCANNER
+        self._cache = cache if cache is not None else _ANALYSIS_CACHE
     
     def _get_sensitivity_threshold(self, sensitivity: str) -> float:
         """Get minimum severity threshold for reporting issues."""
@@ -89,30 +322,115 @@ class SlopDetector:
         }
         return thresholds.get(sensitivity, 0.5)
     
-    def analyze_text(self, text: str, auto_clean: bool = False) -> SlopAnalysis:
+    def analyze_text(self, text: str | TextAnalysis, auto_clean: bool = False) -> SlopAnalysis:
         """
         Analyze text for slop patterns.
         
         Args:
-            text: Text to analyze
+            text: Text to analyze, or its shared TextAnalysis
             auto_clean: Whether to automatically clean detected slop
             
         Returns:
             SlopAnalysis with detected issues and metrics
         """
+        analysis = TextAnalysis.of(text)
+        text = analysis.text
         if not text or not text.strip():
             return SlopAnalysis(issues=[], overall_score=10.0)
         
-        issues = []
+        # Run all detection methods; the pattern categories come from a single scan
+        scanned = self._scanner.scan(text, analysis.lower)
+        return self._build_analysis(text, scanned, self._detect_overused_words(analysis), auto_clean)
+
+    def analyze_paragraphs(self, paragraphs: List[str], auto_clean: bool = False) -> SlopAnalysis:
+        """
+        Analyze the paragraphs of a chapter, joined by newlines, reusing cached results
+        for every paragraph seen before.
+
+        Gives the same analysis as analyze_text on the joined text, except that no match
+        spans two paragraphs.
         
-        # Run all detection methods
-        issues.extend(self._detect_generic_phrases(text))
-        issues.extend(self._detect_cliches(text))
-        issues.extend(self._detect_overused_words(text))
-        issues.extend(self._detect_ai_patterns(text))
-        issues.extend(self._detect_weak_prose(text))
-        issues.extend(self._detect_redundancy(text))
-        issues.extend(self._detect_filler_content(text))
+        Args:
+            paragraphs: Paragraph texts, in order
+            auto_clean: Whether to automatically clean detected slop
+
+        Returns:
+            SlopAnalysis with detected issues and metrics for the joined text
+        """
+        text = "\n".join(paragraphs)
+        if not text.strip():
+            return SlopAnalysis(issues=[], overall_score=10.0)
+
+        pattern_matches: Dict[int, List[Tuple[int, str]]] = {}
+        word_counts: Dict[str, int] = {}
+        text_length = 0
+        scans = []
+        offset = 0
+        for index, paragraph in enumerate(paragraphs):
+            scan = self._scan_paragraph(paragraph)
+            scans.append((offset, scan))
+            for pattern_index, matches in scan.pattern_matches:
+                if index and self._scanner.patterns[pattern_index].text_start_only:
+                    continue
+                pattern_matches.setdefault(pattern_index, []).extend(
+                    (offset + pos, match_text) for pos, match_text in matches
+                )
+            for word, count in scan.overused_counts.items():
+                word_counts[word] = word_counts.get(word, 0) + count
+            text_length += scan.word_count
+            offset += len(paragraph) + 1
+
+        def locate(flagged: List[str]) -> Dict[str, List[Tuple[int, str]]]:
+            positions = {word: [] for word in flagged}
+            for offset, scan in scans:
+                for word, matches in scan.overused_positions.items():
+                    if word in positions:
+                        positions[word].extend((offset + pos, match_text) for pos, match_text in matches)
+            return positions
+
+        scanned = self._scanner.issues(sorted(pattern_matches.items()))
+        overused = self._overused_issues(word_counts, text_length, locate)
+        return self._build_analysis(text, scanned, overused, auto_clean)
+
+    def _scan_paragraph(self, paragraph: str) -> _ParagraphScan:
+        """Detection results for one paragraph, from the cache when it has been seen before."""
+        key = self._cache.key(self.sensitivity, paragraph)
+        scan = self._cache.get(key)
+        if scan is not None:
+            return scan
+
+        lowered = paragraph.lower()
+        words = _WORD_PATTERN.findall(lowered)
+        candidates = self._overused_candidates
+        counts = {word: count for word, count in Counter(words).items() if word in candidates}
+        # Where offsets align, candidates only occur where they were counted; otherwise
+        # case-insensitive matching may find them in words the tokenizer split
+        located = list(counts) if _offsets_align(paragraph, lowered) else candidates
+        scan = _ParagraphScan(
+            pattern_matches=self._scanner.scan_matches(paragraph),
+            word_count=len(words),
+            overused_counts=counts,
+            overused_positions=self._overused_word_positions(paragraph, lowered, located) if located else {},
+        )
+        self._cache.put(key, scan)
+        return scan
+
+    def _build_analysis(
+        self,
+        text: str,
+        scanned: Dict[SlopCategory, List[SlopIssue]],
+        overused: List[SlopIssue],
+        auto_clean: bool
+    ) -> SlopAnalysis:
+        """Filter, score and optionally clean the detected issues of a text."""
+        issues = []
+        issues.extend(scanned[SlopCategory.GENERIC_PHRASES])
+        issues.extend(scanned[SlopCategory.CLICHES])
+        issues.extend(overused)
+        issues.extend(scanned[SlopCategory.AI_PATTERNS])
+        issues.extend(scanned[SlopCategory.WEAK_PROSE])
+        issues.extend(scanned[SlopCategory.REDUNDANCY])
+        issues.extend(scanned[SlopCategory.FILLER_CONTENT])
         
         # Filter by sensitivity threshold
         filtered_issues = [
@@ -127,174 +445,95 @@ class SlopDetector:
         cleaned_text = None
         removals_count = 0
         replacements_count = 0
+        edits = []
         
         if auto_clean and filtered_issues:
-            cleaned_text, removals_count, replacements_count = self._clean_text(text, filtered_issues)
+            cleaned_text, removals_count, replacements_count, edits = self._clean_text(text, filtered_issues)
         
         return SlopAnalysis(
             issues=filtered_issues,
             overall_score=overall_score,
             cleaned_text=cleaned_text,
             removals_count=removals_count,
-            replacements_count=replacements_count
+            replacements_count=replacements_count,
+            edits=edits
         )
     
-    def _detect_generic_phrases(self, text: str) -> List[SlopIssue]:
-        """Detect generic, overused phrases."""
-        issues = []
-        
-        for pattern, severity, suggestion in self._generic_phrases:
-            matches = []
-            for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
-                matches.append((match.start(), match.group()))
-            
-            if matches:
-                issues.append(SlopIssue(
-                    category=SlopCategory.GENERIC_PHRASES,
-                    pattern=pattern,
-                    matches=matches,
-                    severity=severity,
-                    suggestion=suggestion
-                ))
-        
-        return issues
-    
-    def _detect_cliches(self, text: str) -> List[SlopIssue]:
-        """Detect clichéd expressions."""
-        issues = []
-        
-        for pattern, severity, suggestion in self._cliches:
-            matches = []
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                matches.append((match.start(), match.group()))
-            
-            if matches:
-                issues.append(SlopIssue(
-                    category=SlopCategory.CLICHES,
-                    pattern=pattern,
-                    matches=matches,
-                    severity=severity,
-                    suggestion=suggestion
-                ))
+    def _detect_overused_words(self, text: str | TextAnalysis) -> List[SlopIssue]:
+        """Detect overused words and suggest alternatives."""
+        # Count word frequency (excluding common words) from the shared tokens: the
+        # all-ASCII-letter words are exactly what _WORD_PATTERN finds
+        analysis = TextAnalysis.of(text)
+        word_counts = {
+            word: count for word, count in analysis.word_counts.items()
+            if word.isascii() and word.isalpha()
+        }
         
-        return issues
+        # Locate every flagged word in a single further scan
+        return self._overused_issues(
+            word_counts,
+            sum(word_counts.values()),
+            lambda flagged: self._overused_word_positions(analysis.text, analysis.lower, flagged)
+        )
     
-    def _detect_overused_words(self, text: str) -> List[SlopIssue]:
-        """Detect overused words and suggest alternatives."""
+    def _overused_issues(
+        self,
+        word_counts: Dict[str, int],
+        text_length: int,
+        locate: Callable[[List[str]], Dict[str, List[Tuple[int, str]]]]
+    ) -> List[SlopIssue]:
+        """Flag words used too often, given their counts and a lookup of where flagged words occur."""
         issues = []
-        word_counts = {}
-        
-        # Count word frequency (excluding common words)
-        words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
-        for word in words:
-            if len(word) > 3:  # Skip very short words
-                word_counts[word] = word_counts.get(word, 0) + 1
-        
-        # Check for overused words
-        text_length = len(words)
+        flagged = []
         for word, count in word_counts.items():
+            if len(word) <= 3:  # Skip very short words
+                continue
             frequency = count / text_length
             
             # Flag words used too frequently
             if count > 5 and frequency > 0.02:  # More than 2% of all words
                 if word in self._overused_words:
-                    matches = []
-                    for match in re.finditer(rf'\b{re.escape(word)}\b', text, re.IGNORECASE):
-                        matches.append((match.start(), match.group()))
-                    
-                    severity = min(0.9, frequency * 10)  # Scale severity with frequency
-                    suggestion = f"Used {count} times. Consider alternatives: {', '.join(self._overused_words[word])}"
-                    
-                    issues.append(SlopIssue(
-                        category=SlopCategory.OVERUSED_WORDS,
-                        pattern=word,
-                        matches=matches,
-                        severity=severity,
-                        suggestion=suggestion
-                    ))
-        
-        return issues
-    
-    def _detect_ai_patterns(self, text: str) -> List[SlopIssue]:
-        """Detect patterns characteristic of AI-generated text."""
-        issues = []
-        
-        for pattern, severity, suggestion in self._ai_patterns:
-            matches = []
-            for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
-                matches.append((match.start(), match.group()))
-            
-            if matches:
-                issues.append(SlopIssue(
-                    category=SlopCategory.AI_PATTERNS,
-                    pattern=pattern,
-                    matches=matches,
-                    severity=severity,
-                    suggestion=suggestion
-                ))
+                    flagged.append((word, count, frequency))
+        if not flagged:
+            return issues
         
-        return issues
-    
-    def _detect_weak_prose(self, text: str) -> List[SlopIssue]:
-        """Detect weak prose patterns."""
-        issues = []
+        positions = locate([word for word, _, _ in flagged])
         
-        for pattern, severity, suggestion in self._weak_prose_patterns:
-            matches = []
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                matches.append((match.start(), match.group()))
+        for word, count, frequency in flagged:
+            matches = positions.get(word, [])
+            severity = min(0.9, frequency * 10)  # Scale severity with frequency
+            suggestion = f"Used {count} times. Consider alternatives: {', '.join(self._overused_words[word])}"
             
-            if matches:
-                issues.append(SlopIssue(
-                    category=SlopCategory.WEAK_PROSE,
-                    pattern=pattern,
-                    matches=matches,
-                    severity=severity,
-                    suggestion=suggestion
-                ))
+            issues.append(SlopIssue(
+                category=SlopCategory.OVERUSED_WORDS,
+                pattern=word,
+                matches=matches,
+                severity=severity,
+                suggestion=suggestion
+            ))
         
         return issues
-    
-    def _detect_redundancy(self, text: str) -> List[SlopIssue]:
-        """Detect redundant expressions."""
-        issues = []
-        
-        for pattern, severity, suggestion in self._redundancy_patterns:
-            matches = []
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                matches.append((match.start(), match.group()))
-            
-            if matches:
-                issues.append(SlopIssue(
-                    category=SlopCategory.REDUNDANCY,
-                    pattern=pattern,
-                    matches=matches,
-                    severity=severity,
-                    suggestion=suggestion
-                ))
-        
-        return issues
-    
-    def _detect_filler_content(self, text: str) -> List[SlopIssue]:
-        """Detect filler content and unnecessary elaboration."""
-        issues = []
-        
-        for pattern, severity, suggestion in self._filler_patterns:
-            matches = []
-            for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
-                matches.append((match.start(), match.group()))
-            
-            if matches:
-                issues.append(SlopIssue(
-                    category=SlopCategory.FILLER_CONTENT,
-                    pattern=pattern,
-                    matches=matches,
-                    severity=severity,
-                    suggestion=suggestion
-                ))
-        
-        return issues
-    
+
+    @staticmethod
+    def _overused_word_positions(text: str, lowered: str, words: List[str]) -> Dict[str, List[Tuple[int, str]]]:
+        """Find every whole-word, case-insensitive occurrence of the given words in one pass."""
+        # The lookahead on first letters lets the engine skip most positions cheaply
+        first_letters = ''.join(sorted({word[0] for word in words}))
+        matcher = re.compile(
+            rf'\b(?=[{first_letters}])(?:' + '|'.join(f'({re.escape(word)})' for word in words) + r')\b'
+        )
+        positions: Dict[str, List[Tuple[int, str]]] = {}
+
+        if _offsets_align(text, lowered):
+            found = matcher.finditer(lowered)
+        else:
+            found = re.compile(matcher.pattern, re.IGNORECASE).finditer(text)
+
+        for match in found:
+            start, end = match.span()
+            positions.setdefault(words[match.lastindex - 1], []).append((start, text[start:end]))
+        return positions
+
     def _calculate_overall_score(self, text: str, issues: List[SlopIssue]) -> float:
         """Calculate overall slop score (0-10, higher is better)."""
         if not issues:
@@ -316,40 +555,72 @@ class SlopDetector:
         score = max(0.0, 10.0 - total_penalty)
         return round(score, 1)
     
-    def _clean_text(self, text: str, issues: List[SlopIssue]) -> Tuple[str, int, int]:
+    def _clean_text(self, text: str, issues: List[SlopIssue]) -> Tuple[str, int, int, List[SlopEdit]]:
         """
         Automatically clean text by removing/replacing slop patterns.
         
+        Where matches overlap, only the most severe is applied (the earlier, then the
+        longer one on ties), so edits never cut into each other.
+
         Returns:
-            Tuple of (cleaned_text, removals_count, replacements_count)
+            Tuple of (cleaned_text, removals_count, replacements_count, applied edits)
         """
-        cleaned = text
-        removals = 0
-        replacements = 0
-        
-        # Sort issues by position (reverse order to preserve positions during replacement)
-        all_matches = []
+        candidates = []
         for issue in issues:
+            replacement = self._edit_replacement(issue)
+            if replacement is None:
+                continue
             for pos, match_text in issue.matches:
-                all_matches.append((pos, match_text, issue))
-        
-        all_matches.sort(key=lambda x: x[0], reverse=True)
+                if match_text:
+                    candidates.append(SlopEdit(
+                        start=pos,
+                        end=pos + len(match_text),
+                        original=match_text,
+                        replacement=replacement,
+                        category=issue.category,
+                        severity=issue.severity
+                    ))
         
-        # Apply fixes
-        for pos, match_text, issue in all_matches:
-            if issue.category in [SlopCategory.FILLER_CONTENT, SlopCategory.REDUNDANCY]:
-                # Remove filler content
-                cleaned = cleaned[:pos] + cleaned[pos + len(match_text):]
+        # Accept edits by severity, skipping any that overlap one already accepted
+        candidates.sort(key=lambda edit: (-edit.severity, edit.start, edit.start - edit.end))
+        starts: List[int] = []
+        edits: List[SlopEdit] = []
+        for edit in candidates:
+            index = bisect.bisect_right(starts, edit.start)
+            if index and edits[index - 1].end > edit.start:
+                continue
+            if index < len(edits) and edits[index].start < edit.end:
+                continue
+            starts.insert(index, edit.start)
+            edits.insert(index, edit)
+
+        # Build the cleaned text from the untouched segments and the replacements
+        segments = []
+        removals = 0
+        replacements = 0
+        position = 0
+        for edit in edits:
+            segments.append(text[position:edit.start])
+            segments.append(edit.replacement)
+            position = edit.end
+            if edit.replacement:
+                replacements += 1
+            else:
                 removals += 1
-            elif issue.suggestion and "Consider:" in issue.suggestion:
-                # Replace with first suggested alternative
-                alternatives = issue.suggestion.split("Consider:")[1].strip().split(",")
-                if alternatives:
-                    replacement = alternatives[0].strip()
-                    cleaned = cleaned[:pos] + replacement + cleaned[pos + len(match_text):]
-                    replacements += 1
-        
-        return cleaned, removals, replacements
+        segments.append(text[position:])
+
+        return "".join(segments), removals, replacements, edits
+
+    @staticmethod
+    def _edit_replacement(issue: SlopIssue) -> Optional[str]:
+        """Text that replaces the issue's matches when cleaning: empty to remove them, None to keep them."""
+        if issue.category in [SlopCategory.FILLER_CONTENT, SlopCategory.REDUNDANCY]:
+            # Remove filler content
+            return ""
+        if issue.suggestion and "Consider:" in issue.suggestion:
+            # Replace with first suggested alternative
+            return issue.suggestion.split("Consider:")[1].strip().split(",")[0].strip()
+        return None
     
     def generate_report(self, analysis: SlopAnalysis) -> str:
         """Generate human-readable slop detection report."""
@@ -382,7 +653,8 @@ class SlopDetector:
     
     # Pattern databases - these would ideally be loaded from external files
     
-    def _load_generic_phrases(self) -> List[Tuple[str, float, str]]:
+    @staticmethod
+    def _load_generic_phrases() -> List[Tuple[str, float, str]]:
         """Load generic phrase patterns with severity and suggestions."""
         return [
             # Opening cliches
@@ -407,7 +679,8 @@ class SlopDetector:
             (r'\bone might argue\b', 0.4, "Consider direct statement"),
         ]
     
-    def _load_cliches(self) -> List[Tuple[str, float, str]]:
+    @staticmethod
+    def _load_cliches() -> List[Tuple[str, float, str]]:
         """Load clichéd expressions."""
         return [
             (r'\bbite the bullet\b', 0.6, "Consider: face the challenge, confront the problem"),
@@ -424,7 +697,8 @@ class SlopDetector:
             (r'\bwhen pigs fly\b', 0.6, "Consider: never, impossible, not happening"),
         ]
     
-    def _load_overused_words(self) -> Dict[str, List[str]]:
+    @staticmethod
+    def _load_overused_words() -> Dict[str, List[str]]:
         """Load overused words with suggested alternatives."""
         return {
             "very": ["extremely", "remarkably", "exceptionally", "tremendously"],
@@ -442,7 +716,8 @@ class SlopDetector:
             "said": ["whispered", "declared", "announced", "murmured", "stated"],
         }
     
-    def _load_ai_patterns(self) -> List[Tuple[str, float, str]]:
+    @staticmethod
+    def _load_ai_patterns() -> List[Tuple[str, float, str]]:
         """Load AI-specific pattern indicators."""
         return [
             # List-like structures in prose
@@ -462,7 +737,8 @@ class SlopDetector:
             (r'\([^)]*\)', 0.4, "Consider integrating asides into narrative flow"),
         ]
     
-    def _load_weak_prose_patterns(self) -> List[Tuple[str, float, str]]:
+    @staticmethod
+    def _load_weak_prose_patterns() -> List[Tuple[str, float, str]]:
         """Load weak prose pattern indicators."""
         return [
             # Weak verb constructions
@@ -482,7 +758,8 @@ class SlopDetector:
             (r'^\s*But then\b', 0.5, "Consider varied sentence structures"),
         ]
     
-    def _load_redundancy_patterns(self) -> List[Tuple[str, float, str]]:
+    @staticmethod
+    def _load_redundancy_patterns() -> List[Tuple[str, float, str]]:
         """Load redundant expression patterns."""
         return [
             (r'\bfree gift\b', 0.7, "Remove 'free' (gifts are free by definition)"),
@@ -497,7 +774,8 @@ class SlopDetector:
             (r'\brepeat again\b', 0.6, "Use 'repeat'"),
         ]
     
-    def _load_filler_patterns(self) -> List[Tuple[str, float, str]]:
+    @staticmethod
+    def _load_filler_patterns() -> List[Tuple[str, float, str]]:
         """Load filler content patterns."""
         return [
             # Empty expressions
@@ -518,6 +796,30 @@ class SlopDetector:
             (r'\bfor all intents and purposes\b', 0.5, "Consider: essentially, effectively"),
         ]
 
+    @staticmethod
+    def _pattern_categories() -> List[Tuple[SlopCategory, int, List[Tuple[str, float, str]]]]:
+        """Regex-based categories with their matching flags, in the order issues are reported."""
+        return [
+            (SlopCategory.GENERIC_PHRASES, re.IGNORECASE | re.MULTILINE, SlopDetector._load_generic_phrases()),
+            (SlopCategory.CLICHES, re.IGNORECASE, SlopDetector._load_cliches()),
+            (SlopCategory.AI_PATTERNS, re.IGNORECASE | re.MULTILINE, SlopDetector._load_ai_patterns()),
+            (SlopCategory.WEAK_PROSE, re.IGNORECASE, SlopDetector._load_weak_prose_patterns()),
+            (SlopCategory.REDUNDANCY, re.IGNORECASE, SlopDetector._load_redundancy_patterns()),
+            (SlopCategory.FILLER_CONTENT, re.IGNORECASE | re.MULTILINE, SlopDetector._load_filler_patterns()),
+        ]
+
+
+_PATTERN_SCANNER = SlopPatternScanner(SlopDetector._pattern_categories())
+
+# Identifies what the detector reports, so cached paragraph results never outlive a change
+# to the pattern databases; bump the revision when the detection logic itself changes
+_DETECTOR_REVISION = 1
+DETECTOR_VERSION = hashlib.sha256(
+    repr((_DETECTOR_REVISION, SlopDetector._pattern_categories(), SlopDetector._load_overused_words())).encode("utf-8")
+).hexdigest()[:16]
+
+_ANALYSIS_CACHE = SlopAnalysisCache()
+
 
 class SlopDetectionAgent:
     """Enhanced quality assurance agent with slop detection capabilities."""
@@ -531,18 +833,20 @@ class SlopDetectionAgent:
         """
         self.detector = SlopDetector(sensitivity)
     
-    def validate_content_quality(self, content: str, auto_clean: bool = False) -> SlopAnalysis:
+    def validate_content_quality(self, content: str | TextAnalysis, auto_clean: bool = False) -> SlopAnalysis:
         """
         Validate content for slop patterns.
         
         Args:
-            content: Text content to analyze
+            content: Text content to analyze, or its shared TextAnalysis
             auto_clean: Whether to automatically clean detected issues
             
         Returns:
             SlopAnalysis with detected issues and quality metrics
         """
-        return self.detector.analyze_text(content, auto_clean)
+        content = TextAnalysis.of(content).text
+        # Paragraph by paragraph, so unchanged paragraphs of re-checked content come from the cache
+        return self.detector.analyze_paragraphs(content.split("\n") if content else [], auto_clean)
     
     def generate_quality_report(self, analysis: SlopAnalysis) -> str:
         """Generate a comprehensive quality report including slop analysis."""
@@ -0,0 +1,219 @@
+"""
+stream_monitor.py - Slop and repetition monitoring of streamed LLM responses.
+
+A StreamingSlopMonitor is fed the response text as it arrives from a client's chunk
+loop. It keeps a rolling repetition score over the most recent words and a rolling
+slop score over the most recent paragraphs, and once either crosses its threshold it
+reports a StreamAlert, so a degenerate response can be stopped and re-prompted long
+before its token limit instead of being paid for in full.
+"""
+
+import re
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src import config
+from src.slop_detection import SlopDetector
+from src.text_analysis import MovingAverageTTR
+
+# Length of the word sequences counted for the repetition score
+_NGRAM_WORDS = 4
+
+# Paragraphs shorter than this are not checked for verbatim repeats
+_MIN_REPEATED_PARAGRAPH_WORDS = 8
+
+# XML tags and blank lines, which split the prose of a response into paragraphs
+_SEGMENT_PATTERN = re.compile(r"(<[^>]*>|\n[ \t]*\n)")
+_PARAGRAPH_TAG_PATTERN = re.compile(r"</?paragraph\b")
+
+
+@dataclass(slots=True)
+class StreamAlert:
+    """Why a streamed response was flagged."""
+
+    reason: str  # "repetition" or "slop"
+    score: float  # Repetition share (0-1) or rolling slop score (0-10)
+    characters: int  # Response characters received when it was flagged
+    excerpt: str  # The most recent prose
+
+    @property
+    def description(self) -> str:
+        if self.reason == "repetition":
+            return f"started repeating itself ({self.score:.0%} of recent phrases repeated)"
+        return f"degenerated into slop (rolling slop score {self.score:.1f}/10)"
+
+
+class StreamingSlopMonitor:
+    """Watches a streamed response for degenerate repetition and slop, paragraph by paragraph."""
+
+    def __init__(
+        self,
+        on_alert: Callable[[StreamAlert], bool] | None = None,
+        detector: SlopDetector | None = None,
+        repetition_threshold: float | None = None,
+        window_words: int | None = None,
+        min_slop_score: float | None = None,
+        slop_window_paragraphs: int | None = None,
+    ) -> None:
+        """
+        Args:
+            on_alert: Called once with the first alert; returns whether to stop the
+                      response (when omitted, every alert stops it)
+            detector: Slop detector for the paragraph scores (none: repetition only)
+            repetition_threshold: Share of repeated phrases in the window that alerts
+            window_words: Recent words the repetition score covers
+            min_slop_score: Rolling slop score below which to alert
+            slop_window_paragraphs: Paragraphs the rolling slop score averages
+        """
+        self.on_alert = on_alert
+        self.detector = detector
+        self.repetition_threshold = (
+            config.STREAM_REPETITION_THRESHOLD
+            if repetition_threshold is None
+            else repetition_threshold
+        )
+        self.window_words = window_words or config.STREAM_REPETITION_WINDOW_WORDS
+        self.min_slop_score = (
+            config.STREAM_MIN_SLOP_SCORE if min_slop_score is None else min_slop_score
+        )
+        self.slop_window_paragraphs = slop_window_paragraphs or config.STREAM_SLOP_WINDOW_PARAGRAPHS
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets everything fed so far, for a new attempt at the response."""
+        self.alert: StreamAlert | None = None
+        self.aborted = False
+        self.characters = 0
+        # (slop score, repetition score) of every completed paragraph
+        self.paragraph_scores: list[tuple[float, float]] = []
+        # Vocabulary richness of the prose so far
+        self.vocabulary = MovingAverageTTR()
+
+        self._carry = ""  # Unfinished tag held back until its ">" arrives
+        self._partial_word = ""
+        self._paragraph: list[str] = []
+        self._seen_paragraphs: set[str] = set()
+        self._recent_slop: deque[float] = deque(maxlen=self.slop_window_paragraphs)
+        self._last_words: deque[str] = deque(maxlen=_NGRAM_WORDS)
+        self._grams: deque[tuple[str, ...]] = deque()
+        self._gram_counts: Counter = Counter()
+
+    @property
+    def repetition_score(self) -> float:
+        """Share of the recent word sequences that repeat an earlier one in the window."""
+        if len(self._grams) < self.window_words // 2:
+            return 0.0
+        return 1.0 - len(self._gram_counts) / len(self._grams)
+
+    @property
+    def slop_score(self) -> float:
+        """Mean slop score (0-10, higher is cleaner) of the most recent paragraphs."""
+        if not self._recent_slop:
+            return 10.0
+        return sum(self._recent_slop) / len(self._recent_slop)
+
+    def feed(self, piece: str) -> bool:
+        """
+        Consumes the next piece of the response.
+
+        Returns:
+            True once the response should be stopped
+        """
+        if self.aborted:
+            return True
+        self.characters += len(piece)
+        text = self._carry + piece
+        # Hold back a tag that is still arriving
+        tag_start = text.rfind("<")
+        if tag_start > text.rfind(">"):
+            self._carry = text[tag_start:]
+            text = text[:tag_start]
+        else:
+            self._carry = ""
+
+        for index, segment in enumerate(_SEGMENT_PATTERN.split(text)):
+            if index % 2 == 0:
+                self._add_prose(segment)
+            elif not segment.startswith("<") or _PARAGRAPH_TAG_PATTERN.match(segment):
+                self._end_paragraph()
+            else:
+                # Other tags separate words, like whitespace
+                self._add_prose(" ")
+            if self.aborted:
+                return True
+        return False
+
+    def finish(self) -> bool:
+        """Scores the final paragraph once the response is complete; True if it alerts."""
+        if not self.aborted:
+            self._add_prose(" ")
+            self._end_paragraph()
+            self.vocabulary.finish()
+        return self.aborted
+
+    def _add_prose(self, text: str) -> None:
+        if not text:
+            return
+        self._paragraph.append(text)
+        self.vocabulary.feed(text)
+        words = (self._partial_word + text).split()
+        # A word running up to the end of the piece may continue in the next one
+        self._partial_word = "" if text[-1].isspace() or not words else words.pop()
+        for word in words:
+            self._add_word(word.lower())
+
+    def _add_word(self, word: str) -> None:
+        self._last_words.append(word)
+        if len(self._last_words) < _NGRAM_WORDS:
+            return
+        gram = tuple(self._last_words)
+        self._grams.append(gram)
+        self._gram_counts[gram] += 1
+        while len(self._grams) > self.window_words:
+            expired = self._grams.popleft()
+            self._gram_counts[expired] -= 1
+            if not self._gram_counts[expired]:
+                del self._gram_counts[expired]
+        score = self.repetition_score
+        if score >= self.repetition_threshold:
+            self._raise_alert("repetition", score)
+
+    def _end_paragraph(self) -> None:
+        self.vocabulary.feed("\n")
+        if self._partial_word:
+            self._add_word(self._partial_word.lower())
+            self._partial_word = ""
+        paragraph = " ".join("".join(self._paragraph).split())
+        self._paragraph = []
+        if not paragraph or self.alert is not None:
+            return
+
+        if len(paragraph.split()) >= _MIN_REPEATED_PARAGRAPH_WORDS:
+            key = paragraph.lower()
+            if key in self._seen_paragraphs:
+                self._raise_alert("repetition", 1.0, paragraph)
+                return
+            self._seen_paragraphs.add(key)
+
+        slop = (
+            self.detector.analyze_paragraphs([paragraph]).overall_score if self.detector else 10.0
+        )
+        self._recent_slop.append(slop)
+        self.paragraph_scores.append((slop, self.repetition_score))
+        if (
+            len(self._recent_slop) == self.slop_window_paragraphs
+            and self.slop_score < self.min_slop_score
+        ):
+            self._raise_alert("slop", self.slop_score, paragraph)
+
+    def _raise_alert(self, reason: str, score: float, excerpt: str | None = None) -> None:
+        """Reports the first alert only; later ones while the response continues are ignored."""
+        if self.alert is not None:
+            return
+        if excerpt is None:
+            excerpt = " ".join("".join(self._paragraph).split())[-200:]
+        self.alert = StreamAlert(
+            reason=reason, score=score, characters=self.characters, excerpt=excerpt
+        )
+        self.aborted = self.on_alert(self.alert) if self.on_alert is not None else True
@@ -0,0 +1,98 @@
+"""
+structured_output.py - JSON-schema patch generation and its conversion to patch XML.
+
+Providers that support structured output (OpenAI JSON schema, Anthropic tool use,
+Ollama format schemas) return chapters and paragraphs as data, so no XML has to be
+produced by the model and nothing has to be cleaned or repaired. The adapter here
+turns that data into the same <patch> XML that Project.apply_patch consumes.
+"""
+import json
+import xml.etree.ElementTree as ET
+
+PATCH_SCHEMA_NAME = "chapter_patch"
+
+PATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "chapters": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "description": "Chapter ID from the outline"},
+                    "setting": {
+                        "type": "string",
+                        "description": "The chapter's setting attribute, or an empty string",
+                    },
+                    "paragraphs": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The chapter prose, one entry per paragraph, in order",
+                    },
+                },
+                "required": ["id", "setting", "paragraphs"],
+                "additionalProperties": False,
+            },
+        }
+    },
+    "required": ["chapters"],
+    "additionalProperties": False,
+}
+
+_STRUCTURED_PATCH_INSTRUCTIONS = """
+
+OUTPUT FORMAT OVERRIDE: Do not write XML. Return the result through the provided
+`chapter_patch` schema instead: one entry per chapter with its `id`, its `setting`
+(empty string if none) and its `paragraphs` as a list of plain-text strings in reading order.
+"""
+
+
+def build_structured_prompt(prompt: str) -> str:
+    """Appends the instructions that replace the prompt's XML output format."""
+    return prompt + _STRUCTURED_PATCH_INSTRUCTIONS
+
+
+def patch_data_to_xml(data: dict) -> str | None:
+    """
+    Converts structured patch data into <patch> XML for Project.apply_patch.
+
+    Returns:
+        The patch XML, or None if the data contains no usable chapter
+    """
+    chapters = data.get("chapters") if isinstance(data, dict) else None
+    if not isinstance(chapters, list):
+        return None
+
+    patch = ET.Element("patch")
+    for chapter_data in chapters:
+        if not isinstance(chapter_data, dict):
+            continue
+        chapter_id = str(chapter_data.get("id", "")).strip()
+        paragraphs = chapter_data.get("paragraphs")
+        if not chapter_id or not isinstance(paragraphs, list):
+            continue
+
+        chapter = ET.SubElement(patch, "chapter", id=chapter_id)
+        setting = chapter_data.get("setting")
+        if isinstance(setting, str) and setting.strip():
+            chapter.set("setting", setting.strip())
+        content = ET.SubElement(chapter, "content")
+        paragraph_id = 0
+        for text in paragraphs:
+            if not isinstance(text, str) or not text.strip():
+                continue
+            paragraph_id += 1
+            ET.SubElement(content, "paragraph", id=str(paragraph_id)).text = text.strip()
+
+    if len(patch) == 0:
+        return None
+    return ET.tostring(patch, encoding="unicode")
+
+
+def parse_structured_json(json_text: str) -> dict | None:
+    """Decodes a structured-output response into an object, or returns None if it is not one."""
+    try:
+        data = json.loads(json_text)
+    except (TypeError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
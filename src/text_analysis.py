@@ -0,0 +1,176 @@
+"""
+text_analysis.py - Shared tokenisation of a text for the prose analysers.
+
+QualityEvaluator, ContentEnhancer, EngagementOptimizer, SlopDetector and
+ContinuityManager all need the words, sentences and dialogue of the same chapter.
+A TextAnalysis computes each of these the first time an analyser asks for it and
+keeps it, so passing one TextAnalysis to every analyser of a critique pass
+tokenises the chapter once. Every analyser still accepts a plain string, which it
+wraps in a TextAnalysis of its own.
+
+MovingAverageTTR measures vocabulary richness as a stream: it takes tokens from
+any iterable, or text piece by piece as it arrives from the LLM, and keeps only
+its window of recent tokens.
+"""
+
+import re
+from collections import Counter, deque
+from collections.abc import Iterable
+from functools import cached_property
+
+from src import config
+
+_WORD_PATTERN = re.compile(r"\b\w+\b")
+# A word running up to the end of a piece of streamed text, which may continue in the next one
+_TRAILING_WORD_PATTERN = re.compile(r"\w+$")
+_CAPITALIZED_WORD_PATTERN = re.compile(r"[A-Z][a-z]+")
+_SENTENCE_END_PATTERN = re.compile(r"[.!?]+")
+_PARAGRAPH_BREAK_PATTERN = re.compile(r"\n\n+")
+# Dialogue is text within double or, separately, single quotation marks
+_DIALOGUE_PATTERNS = (re.compile(r'"([^"]*)"'), re.compile(r"'([^']*)'"))
+
+
+class TextAnalysis:
+    """Words, sentences and dialogue of one text, each computed on first use."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    @classmethod
+    def of(cls, text: "str | TextAnalysis") -> "TextAnalysis":
+        """Returns text itself if it is already a TextAnalysis, otherwise a new one for it."""
+        return text if isinstance(text, TextAnalysis) else cls(text)
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercase view of the text."""
+        return self.text.lower()
+
+    @cached_property
+    def words(self) -> list[str]:
+        """Word tokens of the text, in order."""
+        return _WORD_PATTERN.findall(self.text)
+
+    @cached_property
+    def capitalized_words(self) -> list[str]:
+        """Word tokens of a capital letter followed by lowercase letters, such as names."""
+        return [word for word in self.words if _CAPITALIZED_WORD_PATTERN.fullmatch(word)]
+
+    @cached_property
+    def lower_words(self) -> list[str]:
+        """Word tokens of the lowercase view, in order."""
+        return _WORD_PATTERN.findall(self.lower)
+
+    @cached_property
+    def word_counts(self) -> Counter:
+        """How often each lowercase word occurs, in order of first occurrence."""
+        return Counter(self.lower_words)
+
+    @cached_property
+    def sentence_pieces(self) -> list[str]:
+        """
+        The stripped text split at sentence-ending punctuation, unstripped and
+        including empty pieces, for analyses that place sentences by index.
+        """
+        return _SENTENCE_END_PATTERN.split(self.text.strip())
+
+    @cached_property
+    def sentences(self) -> list[str]:
+        """Non-empty sentences, stripped."""
+        return [piece.strip() for piece in self.sentence_pieces if piece.strip()]
+
+    @cached_property
+    def sentence_word_counts(self) -> list[int]:
+        """Word tokens in each of the sentences."""
+        return [len(_WORD_PATTERN.findall(sentence)) for sentence in self.sentences]
+
+    @cached_property
+    def paragraphs(self) -> list[str]:
+        """The stripped text split at blank lines."""
+        return _PARAGRAPH_BREAK_PATTERN.split(self.text.strip())
+
+    @cached_property
+    def dialogue_spans(self) -> list[tuple[int, int]]:
+        """(start, end) of the text within each pair of double, then single, quotation marks."""
+        return [
+            match.span(1) for pattern in _DIALOGUE_PATTERNS for match in pattern.finditer(self.text)
+        ]
+
+    @cached_property
+    def dialogue(self) -> list[str]:
+        """The quoted text of each of the dialogue spans."""
+        return [self.text[start:end] for start, end in self.dialogue_spans]
+
+    @cached_property
+    def dialogue_word_count(self) -> int:
+        """Word tokens within dialogue."""
+        return sum(len(_WORD_PATTERN.findall(quote)) for quote in self.dialogue)
+
+
+class MovingAverageTTR:
+    """
+    Moving-average type-token ratio (MATTR): the mean share of distinct words over
+    every window of consecutive words, which unlike the plain unique/total ratio
+    does not fall as a text grows. Texts shorter than one window get the plain ratio.
+
+    Each token updates a sliding window counter in constant time, so a chapter or a
+    streamed response is measured in one pass without keeping its tokens.
+    """
+
+    def __init__(self, window: int | None = None) -> None:
+        self.window = window or config.MATTR_WINDOW_WORDS
+        self.token_count = 0
+        self._recent: deque[str] = deque()
+        self._counts: dict[str, int] = {}
+        self._distinct_total = 0  # Distinct words summed over every complete window
+        self._windows = 0
+        self._partial = ""  # Unfinished word at the end of the text fed so far
+
+    @property
+    def value(self) -> float:
+        """MATTR of the tokens so far (0.0 before the first one)."""
+        if self._windows:
+            return self._distinct_total / (self._windows * self.window)
+        return len(self._counts) / len(self._recent) if self._recent else 0.0
+
+    def add(self, token: str) -> None:
+        """Adds the next token of the stream."""
+        self.token_count += 1
+        self._recent.append(token)
+        self._counts[token] = self._counts.get(token, 0) + 1
+        if len(self._recent) > self.window:
+            expired = self._recent.popleft()
+            if self._counts[expired] == 1:
+                del self._counts[expired]
+            else:
+                self._counts[expired] -= 1
+        if len(self._recent) == self.window:
+            self._distinct_total += len(self._counts)
+            self._windows += 1
+
+    def update(self, tokens: Iterable[str]) -> "MovingAverageTTR":
+        """Adds every token of an iterable, such as a generator over a chapter; returns self."""
+        for token in tokens:
+            self.add(token)
+        return self
+
+    def feed(self, piece: str) -> None:
+        """
+        Adds the words of the next piece of a text, lowercased, as TextAnalysis
+        tokenises them; a word split across pieces is counted once it is complete.
+        """
+        text = self._partial + piece
+        trailing = _TRAILING_WORD_PATTERN.search(text)
+        if trailing:
+            self._partial = text[trailing.start() :]
+            text = text[: trailing.start()]
+        else:
+            self._partial = ""
+        self.update(_WORD_PATTERN.findall(text.lower()))
+
+    def finish(self) -> float:
+        """Counts the final word of fed text; returns the MATTR."""
+        if self._partial:
+            self.update(_WORD_PATTERN.findall(self._partial.lower()))
+            self._partial = ""
+        return self.value
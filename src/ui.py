@@ -12,10 +12,13 @@ from rich.syntax import Syntax
 from rich.table import Table
 
 from src import utils
+from src.project_manifest import ProjectManifest
 
 # --- Global Console Instance ---
 console = Console()
 
+PROJECTS_DIR = Path("projects")
+
 
 def bullet_choice(prompt: str, choices: list[str]) -> str:
     """
@@ -53,30 +56,33 @@ def display_welcome(project_name: str | None):
 
 def display_summary(project):
     """Displays a summary of the current project state."""
-    if project.book_root is None:
+    # Use the outline view so a lazily loaded project does not read chapter content
+    book_root = project.outline_root
+    if book_root is None:
         console.print("[red]Cannot display summary, book data not loaded.[/red]")
         return
 
-    title = project.book_root.findtext("title", "N/A")
-    synopsis = project.book_root.findtext("synopsis", "N/A")
+    title = book_root.findtext("title", "N/A")
+    synopsis = book_root.findtext("synopsis", "N/A")
     chapters = sorted(
-        project.book_root.findall(".//chapter"),
+        book_root.findall(".//chapter"),
         key=lambda c: int(utils.get_chapter_id_with_default(c, "0")),
     )
 
-    # Total word count from all paragraphs
-    total_wc = sum(utils.count_words(p.text) for p in project.book_root.findall(".//paragraph"))
+    # Total word count from all chapters
+    chapter_word_counts = {chap: project.get_chapter_word_count(chap) for chap in chapters}
+    total_wc = sum(chapter_word_counts.values())
 
     console.print(
         Panel(
-            f"Book Summary: {project.book_root.findtext('title', 'Untitled')}\nTotal Word Count: {total_wc:,}",
+            f"Book Summary: {book_root.findtext('title', 'Untitled')}\nTotal Word Count: {total_wc:,}",
             title=f"Current Status ({project.book_dir.name})",
             border_style="blue",
         )
     )
 
     # Story elements summary
-    story_elements = project.book_root.find("story_elements")
+    story_elements = book_root.find("story_elements")
     if story_elements is not None:
         elements_table = Table(title="Story Elements", title_style="bold yellow")
         elements_table.add_column("Element", style="bold")
@@ -94,7 +100,7 @@ def display_summary(project):
         console.print(elements_table)
 
     # Characters summary
-    characters = project.book_root.findall(".//character")
+    characters = book_root.findall(".//character")
     if characters:
         char_table = Table(title="Characters", title_style="bold magenta")
         char_table.add_column("ID", style="dim")
@@ -126,13 +132,11 @@ def display_summary(project):
             summary_status = (
                 "[green]✓[/green]" if chap.findtext("summary", "").strip() else "[red]✗[/red]"
             )
-            paras = chap.findall(".//paragraph")
-            has_content = any(p.text and p.text.strip() for p in paras)
-            content_status = "[green]✓[/green]" if has_content else "[red]✗[/red]"
+            word_count = chapter_word_counts[chap]
+            content_status = "[green]✓[/green]" if word_count else "[red]✗[/red]"
             if chap_id in project.chapters_generated_in_session:
                 content_status += " [cyan](new)[/cyan]"
 
-            word_count = sum(utils.count_words(p.text) for p in paras)
             chap_table.add_row(
                 chap_id,
                 chap.findtext("title", ""),
@@ -211,10 +215,10 @@ def review_and_modify_story_elements(project) -> dict:
     console.print(Panel("[bold cyan]Story Elements Review[/bold cyan]", style="bold blue"))
 
     # Get current title
-    current_title = project.book_root.findtext("title", "Untitled")
+    current_title = project.outline_root.findtext("title", "Untitled")
 
     # Get current story elements
-    story_elements = project.book_root.find("story_elements")
+    story_elements = project.outline_root.find("story_elements")
     if story_elements is None:
         console.print("[red]Warning: No story elements found in project.[/red]")
         return {}
@@ -226,7 +230,7 @@ def review_and_modify_story_elements(project) -> dict:
 
     # Extract character names
     character_names = {}
-    characters = project.book_root.find("characters")
+    characters = project.outline_root.find("characters")
     if characters is not None:
         for char in characters.findall("character"):
             char_id = char.get("id") or char.findtext("id", "")
@@ -741,7 +745,7 @@ def _delete_project(existing_projects: list) -> tuple[bool, str | None, str | No
     Helper function to delete a project.
 
     Args:
-        existing_projects: List of Path objects for existing project directories
+        existing_projects: List of ProjectSummary manifest entries for existing projects
 
     Returns:
         tuple: (is_new_project, project_folder_name, character_card_premise)
@@ -751,23 +755,9 @@ def _delete_project(existing_projects: list) -> tuple[bool, str | None, str | No
     console.print("\n[bold]Available Projects:[/bold]")
 
     # Display projects with details
-    project_choices = []
-    for i, project_path in enumerate(existing_projects, 1):
-        # Try to get project title from outline.xml
-        title = "Unknown Title"
-        outline_file = project_path / "outline.xml"
-        if outline_file.exists():
-            try:
-                tree = ET.parse(outline_file)
-                root = tree.getroot()
-                title_elem = root.find("title")
-                if title_elem is not None and title_elem.text:
-                    title = title_elem.text
-            except (ET.ParseError, FileNotFoundError, PermissionError):
-                pass
-
-        project_choices.append(f"{i}. {project_path.name} - {title}")
-
+    project_choices = [
+        f"{i}. {entry.folder} - {entry.title}" for i, entry in enumerate(existing_projects, 1)
+    ]
     project_choices.append(f"{len(project_choices) + 1}. Cancel")
 
     selected = bullet_choice("Select a project to delete:", project_choices)
@@ -782,18 +772,10 @@ def _delete_project(existing_projects: list) -> tuple[bool, str | None, str | No
         return prompt_for_project_selection()
 
     # Get the selected project
-    selected_project = existing_projects[selected_num - 1]
-    title = "Unknown Title"
-    outline_file = selected_project / "outline.xml"
-    if outline_file.exists():
-        try:
-            tree = ET.parse(outline_file)
-            root = tree.getroot()
-            title_elem = root.find("title")
-            if title_elem is not None and title_elem.text:
-                title = title_elem.text
-        except (ET.ParseError, FileNotFoundError, PermissionError):
-            pass
+    manifest = ProjectManifest(PROJECTS_DIR)
+    selected_entry = existing_projects[selected_num - 1]
+    selected_project = PROJECTS_DIR / selected_entry.folder
+    title = selected_entry.title
 
     # Show warning and ask for confirmation
     console.print("\n[bold red]⚠ WARNING: This will permanently delete the project:[/bold red]")
@@ -820,11 +802,12 @@ def _delete_project(existing_projects: list) -> tuple[bool, str | None, str | No
     # Delete the project directory
     try:
         shutil.rmtree(selected_project)
+        manifest.remove(selected_entry.folder)
         console.print(f"[green]✓ Project '{title}' has been deleted successfully.[/green]")
 
         # Ask if user wants to delete another project or return to main menu
         if Confirm.ask("\n[cyan]Delete another project?[/cyan]", default=False):
-            return _delete_project([p for p in Path("projects").iterdir() if p.is_dir()])
+            return _delete_project(manifest.list_projects())
         else:
             # Return to main menu
             return prompt_for_project_selection()
@@ -848,14 +831,8 @@ def prompt_for_project_selection() -> tuple[bool, str | None, str | None]:
     """
     console.print("\n[bold cyan]Fiction Fabricator[/bold cyan]")
 
-    # Check if projects directory exists and has projects
-    projects_dir = Path("projects")
-    existing_projects = []
-
-    if projects_dir.exists():
-        # Get all subdirectories in projects/
-        existing_projects = [p for p in projects_dir.iterdir() if p.is_dir()]
-        existing_projects.sort(key=lambda p: p.stat().st_mtime, reverse=True)  # Sort by most recent
+    # Read existing projects from the manifest, most recent first (stale entries are rebuilt)
+    existing_projects = ProjectManifest(PROJECTS_DIR).list_projects()
 
     choices = ["1. Start a new project"]
 
@@ -879,22 +856,11 @@ def prompt_for_project_selection() -> tuple[bool, str | None, str | None]:
         console.print("\n[bold]Available Projects:[/bold]")
 
         # Display projects with details
-        project_choices = []
-        for i, project_path in enumerate(existing_projects, 1):
-            # Try to get project title from outline.xml
-            title = "Unknown Title"
-            outline_file = project_path / "outline.xml"
-            if outline_file.exists():
-                try:
-                    tree = ET.parse(outline_file)
-                    root = tree.getroot()
-                    title_elem = root.find("title")
-                    if title_elem is not None and title_elem.text:
-                        title = title_elem.text
-                except (ET.ParseError, FileNotFoundError, PermissionError):
-                    pass
-
-            project_choices.append(f"{i}. {project_path.name} - {title}")
+        project_choices = [
+            f"{i}. {entry.folder} - {entry.title} "
+            f"({entry.chapter_count} chapters, {entry.word_count:,} words)"
+            for i, entry in enumerate(existing_projects, 1)
+        ]
 
         project_choices.append(f"{len(project_choices) + 1}. Cancel (start new project instead)")
 
@@ -910,8 +876,8 @@ def prompt_for_project_selection() -> tuple[bool, str | None, str | None]:
 
         # Return the selected project folder name
         selected_project = existing_projects[selected_num - 1]
-        console.print(f"[green]Loading project: {selected_project.name}[/green]")
-        return False, selected_project.name, None
+        console.print(f"[green]Loading project: {selected_project.folder}[/green]")
+        return False, selected_project.folder, None
 
     elif choice_num == "3" and existing_projects:
         # Delete a project
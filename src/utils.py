@@ -6,9 +6,13 @@ import unicodedata
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from xml.dom import minidom
+from xml.sax.saxutils import escape, quoteattr
 
 from rich.console import Console
 
+from src import config
+from src.xml_repair import repair_xml
+
 
 def count_words(text: str) -> int:
     """Counts the number of words in a given string."""
@@ -49,106 +53,241 @@ def pretty_xml(elem: ET.Element) -> str:
         return ET.tostring(elem, encoding="unicode")
 
 
-def clean_llm_xml_output(xml_string: str) -> str:
+# Container elements of the book schema that prompts refer to by name, kept even when empty
+_PLACEHOLDER_TAGS = frozenset({"characters", "chapters", "content", "story_elements", "plot_beats"})
+
+
+def compact_xml(elem: ET.Element, paragraph_ids: bool = True) -> str:
     """
-    Attempts to clean potential markdown fences or text surrounding LLM XML output.
-    Also fixes common LLM XML formatting issues and attempts to repair truncated XML.
+    Serializes an element as compact XML for use as prompt context.
+
+    Whitespace between elements (the indentation of pretty-printed snapshots) is
+    dropped, text is trimmed and elements with no text, attributes or children are
+    left out, except the empty containers (such as <chapters/>) that prompts ask the
+    model to fill. With paragraph_ids=False the id attribute of <paragraph> elements is
+    omitted, for prompts that never refer to individual paragraphs. Tag names are
+    kept, so the output is still the XML vocabulary the model is asked to write.
     """
-    if not isinstance(xml_string, str):
+    return _compact_element(elem, paragraph_ids)
+
+
+def _compact_element(elem: ET.Element, paragraph_ids: bool) -> str:
+    if not isinstance(elem.tag, str):
+        # Comments and processing instructions carry nothing the model needs
         return ""
-    # Find the first '<' and the last '>'
-    start = xml_string.find("<")
-    end = xml_string.rfind(">")
-    if start != -1 and end != -1:
-        cleaned = xml_string[start : end + 1].strip()
-        # Remove markdown code fences
-        cleaned = re.sub(r"^```xml\s*", "", cleaned, flags=re.IGNORECASE | re.MULTILINE)
-        cleaned = re.sub(r"\s*```$", "", cleaned)
-
-        # Fix malformed attribute quotes with comprehensive patterns
-        # Pattern 1: id="value\n" -> id="value"
-        cleaned = re.sub(r'(\w+)="([^"]*?)\s*\n\s*"', r'\1="\2"', cleaned)
-
-        # Pattern 2: id="value\n"> -> id="value">
-        cleaned = re.sub(r'(\w+)="([^"]*?)\s*\n\s*">', r'\1="\2">', cleaned)
-
-        # Pattern 3: id="value\nother_text" -> id="valueother_text" (no space for IDs)
-        cleaned = re.sub(
-            r'(\w+)="([^"]*?)\n([^"]*?)"',
-            lambda m: (
-                f'{m.group(1)}="{m.group(2)}{m.group(3)}"'
-                if m.group(1) == "id"
-                else f'{m.group(1)}="{m.group(2)} {m.group(3)}"'
-            ),
-            cleaned,
-        )
+    parts = []
+    text = elem.text.strip() if elem.text else ""
+    if text:
+        parts.append(escape(text))
+    for child in elem:
+        parts.append(_compact_element(child, paragraph_ids))
+        tail = child.tail.strip() if child.tail else ""
+        if tail:
+            parts.append(escape(tail))
+    body = "".join(parts)
+
+    attrib = elem.attrib
+    if not paragraph_ids and elem.tag == "paragraph":
+        attrib = {k: v for k, v in attrib.items() if k != "id"}
+    attrs = "".join(f" {name}={quoteattr(value)}" for name, value in attrib.items())
+    if body:
+        return f"<{elem.tag}{attrs}>{body}</{elem.tag}>"
+    return f"<{elem.tag}{attrs}/>" if attrs or elem.tag in _PLACEHOLDER_TAGS else ""
+
+
+def xml_for_prompt(elem: ET.Element, paragraph_ids: bool = True) -> str:
+    """Returns the book XML to embed in a prompt, compacted unless COMPACT_PROMPT_CONTEXT is off."""
+    if config.COMPACT_PROMPT_CONTEXT:
+        return compact_xml(elem, paragraph_ids=paragraph_ids)
+    return ET.tostring(elem, encoding="unicode")
+
+
+def read_book_title(xml_path: Path) -> str | None:
+    """
+    Reads the top-level <title> of a saved book XML file without parsing the whole tree.
 
-        # Pattern 4: Fix cases where the newline is within the tag itself
-        # Example: <paragraph id="2\n1"> -> <paragraph id="21">
-        cleaned = re.sub(r'(<\w+[^>]*?\s+\w+=")([^"]*?)\n([^"]*?)(")', r"\1\2\3\4", cleaned)
-
-        # Pattern 5: Fix newlines breaking the opening tag
-        # Example: <paragraph id="2\n1">content -> <paragraph id="21">content
-        cleaned = re.sub(r"(<\w+[^>]*?)\n([^<>]*?>)", r"\1\2", cleaned)
-
-        # Fix unwanted line breaks within paragraph content with more comprehensive cleaning
-        def fix_paragraph_content(match):
-            full_para = match.group(0)
-
-            # First, fix any structural issues in the paragraph tag itself
-            # Handle cases where attributes are split across lines
-            para_fixed = re.sub(r"(<paragraph[^>]*?)\n([^<>]*?>)", r"\1\2", full_para)
-
-            # Now fix content line breaks - be more aggressive
-            # Replace line breaks that are NOT after sentence endings with spaces
-            content_pattern = r">(.*?)<"
-
-            def fix_content(content_match):
-                content = content_match.group(1)
-                # Replace newlines with spaces unless they follow sentence endings
-                # Keep breaks after: . ! ? " or if the next line starts with a capital (new sentence)
-                fixed_content = re.sub(r'(?<![.!?"\n])\n(?!\s*[A-Z"])', " ", content)
-                # Clean up multiple spaces
-                fixed_content = re.sub(r"  +", " ", fixed_content)
-                return f">{fixed_content}<"
-
-            para_fixed = re.sub(content_pattern, fix_content, para_fixed, flags=re.DOTALL)
-            return para_fixed
-
-        # Apply the fix to all paragraph elements
-        cleaned = re.sub(
-            r"<paragraph[^>]*>.*?</paragraph>", fix_paragraph_content, cleaned, flags=re.DOTALL
-        )
+    Streams the file with iterparse and stops as soon as the title element closes,
+    so anything after the title (usually all chapters) is never read. Returns None if the title is missing or unreadable.
+    """
+    depth = 0
+    try:
+        for event, elem in ET.iterparse(xml_path, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1 and elem.tag == "title":
+                return elem.text or None
+    except (ET.ParseError, OSError):
+        return None
+    return None
 
-        # Additional patterns to fix specific XML formatting issues
 
-        # Fix cases where paragraph opening tags are broken across lines
-        # Example: <paragraph id="2\n1"> -> <paragraph id="21">
-        cleaned = re.sub(
-            r'<paragraph\s+id="([^"]*?)\n([^"]*?)">', r'<paragraph id="\1\2">', cleaned
-        )
+# Matches the opening (or self-closing) tag of every <content> element in saved XML.
+_CONTENT_TAG_PATTERN = re.compile(rb"<content(?:\s[^>]*?)?(/?)>")
+
+
+def find_content_spans(data: bytes) -> list[tuple[int, int]]:
+    """
+    Returns the (start, end) byte offsets of every <content> element in serialized XML.
+
+    Relies on saved XML escaping '<' in text, so a content body can only end at the
+    first following '</content>'. Spans are returned in document order.
+    """
+    spans = []
+    for match in _CONTENT_TAG_PATTERN.finditer(data):
+        if match.group(1):
+            end = match.end()
+        else:
+            end = data.index(b"</content>", match.end()) + len(b"</content>")
+        spans.append((match.start(), end))
+    return spans
+
+
+# Patterns used by clean_llm_xml_output and clean_paragraph_text, compiled once at import
+_FENCE_OPEN_PATTERN = re.compile(r"^```xml\s*", re.IGNORECASE | re.MULTILINE)
+_FENCE_CLOSE_PATTERN = re.compile(r"\s*```$")
+_ATTR_BREAK_BEFORE_QUOTE_PATTERN = re.compile(r'(\w+)="([^"]*?)\s*\n\s*"')
+_ATTR_BREAK_BEFORE_TAG_END_PATTERN = re.compile(r'(\w+)="([^"]*?)\s*\n\s*">')
+_ATTR_BREAK_IN_VALUE_PATTERN = re.compile(r'(\w+)="([^"]*?)\n([^"]*?)"')
+_TAG_ATTR_BREAK_PATTERN = re.compile(r'(<\w+[^>]*?\s+\w+=")([^"]*?)\n([^"]*?)(")')
+_TAG_BREAK_PATTERN = re.compile(r"(<\w+[^>]*?)\n([^<>]*?>)")
+_PARAGRAPH_ELEMENT_PATTERN = re.compile(r"<paragraph[^>]*>.*?</paragraph>", re.DOTALL)
+_PARAGRAPH_TAG_BREAK_PATTERN = re.compile(r"(<paragraph[^>]*?)\n([^<>]*?>)")
+_ELEMENT_TEXT_PATTERN = re.compile(r">(.*?)<", re.DOTALL)
+_SOFT_LINE_BREAK_PATTERN = re.compile(r'(?<![.!?"\n])\n(?!\s*[A-Z"])')
+_PARAGRAPH_ID_BREAK_PATTERN = re.compile(r'<paragraph\s+id="([^"]*?)\n([^"]*?)">')
+_TAG_VALUE_BREAK_PATTERN = re.compile(r'(<\w+[^>]*?="[^"]*?)\n([^"]*?"[^>]*?>)')
+_PARAGRAPH_LEADING_BREAK_PATTERN = re.compile(r"(<paragraph[^>]*>)\s*\n\s*([A-Z])")
+_MULTIPLE_SPACES_PATTERN = re.compile(r"  +")
+# Where an attribute value may contain a line break; every match of the three
+# (\w+)="... patterns above begins with the attribute name right before one of these
+_ATTR_BREAK_CANDIDATE_PATTERN = re.compile(r'="[^"]*\n')
+# Every tag/attribute repair pattern above needs a line break inside an attribute value
+# or an opening tag; when this finds none, all of those passes are no-ops and are skipped.
+_BROKEN_TAG_HINT_PATTERN = re.compile(r'="[^"]*\n|<\w[^>]*\n')
+_MARKDOWN_BOLD_PATTERN = re.compile(r"\*\*(.*?)\*\*")
+_PARAGRAPH_SOFT_BREAK_PATTERN = re.compile(r'(?<![.!?"\n])\n(?=\s*[a-z])')
+_XML_TAG_PATTERN = re.compile(r"<(/?)(\w+)(?:\s[^>]*)?>")
+
+
+def _sub_attr_breaks(pattern: re.Pattern, repl, text: str) -> str:
+    """
+    Same result as pattern.sub(repl, text) for patterns starting with (\\w+)=".
+
+    Such patterns have no literal prefix, so re.sub retries them at every character.
+    Only '="' positions that precede a line break can start a match; for each one,
+    the match is attempted from the start of the attribute name (or from the end of
+    the previous match, as re.sub would), giving the same leftmost matches.
+    """
+    pieces = []
+    last_end = 0
+    for candidate in _ATTR_BREAK_CANDIDATE_PATTERN.finditer(text):
+        equals = candidate.start()
+        if equals <= last_end:
+            continue
+        start = equals
+        while start > last_end and (text[start - 1].isalnum() or text[start - 1] == "_"):
+            start -= 1
+        if start == equals:
+            continue
+        match = pattern.match(text, start)
+        if match is None:
+            continue
+        pieces.append(text[last_end:start])
+        pieces.append(repl(match) if callable(repl) else match.expand(repl))
+        last_end = match.end()
+    if not pieces:
+        return text
+    pieces.append(text[last_end:])
+    return "".join(pieces)
+
+
+def _join_attr_break(match: re.Match) -> str:
+    # IDs are joined without a space, other attribute values with one
+    name, before, after = match.group(1), match.group(2), match.group(3)
+    separator = "" if name == "id" else " "
+    return f'{name}="{before}{separator}{after}"'
 
-        # Fix any XML tag that has been split across lines
-        # Pattern: <tag attr="val\nue"> -> <tag attr="value">
-        cleaned = re.sub(r'(<\w+[^>]*?="[^"]*?)\n([^"]*?"[^>]*?>)', r"\1\2", cleaned)
 
-        # Handle cases where the paragraph content starts on the next line after the tag
-        # Pattern: <paragraph id="1">\nContent -> <paragraph id="1">Content
-        cleaned = re.sub(r"(<paragraph[^>]*>)\s*\n\s*([A-Z])", r"\1\2", cleaned)
+def _fix_element_text(match: re.Match) -> str:
+    # Replace newlines with spaces unless they follow sentence endings
+    # Keep breaks after: . ! ? " or if the next line starts with a capital (new sentence)
+    fixed_content = _SOFT_LINE_BREAK_PATTERN.sub(" ", match.group(1))
+    fixed_content = _MULTIPLE_SPACES_PATTERN.sub(" ", fixed_content)
+    return f">{fixed_content}<"
 
-        # Clean up multiple spaces that might result from the above fixes
-        cleaned = re.sub(r"  +", " ", cleaned)
 
-        # Attempt to repair truncated XML for patches and book outlines
-        if cleaned.startswith("<patch>") and not cleaned.rstrip().endswith("</patch>"):
-            # If the patch XML is truncated, try to repair it by closing open tags
-            cleaned = _attempt_xml_repair(cleaned)
-        elif cleaned.startswith("<book>") and not cleaned.rstrip().endswith("</book>"):
-            # If the XML is truncated, try to repair it by closing open tags
-            cleaned = _attempt_xml_repair(cleaned)
+def _fix_paragraph_element(match: re.Match) -> str:
+    full_para = match.group(0)
+    # Only line breaks need fixing; double spaces are collapsed document-wide afterwards
+    if "\n" not in full_para:
+        return full_para
+    # Handle cases where attributes are split across lines
+    para_fixed = _PARAGRAPH_TAG_BREAK_PATTERN.sub(r"\1\2", full_para)
+    return _ELEMENT_TEXT_PATTERN.sub(_fix_element_text, para_fixed)
 
-        return cleaned
-    return xml_string  # Return original if no tags found
+
+def clean_llm_xml_output(xml_string: str) -> str:
+    """
+    Attempts to clean potential markdown fences or text surrounding LLM XML output.
+    Also fixes common LLM XML formatting issues and attempts to repair truncated XML.
+
+    All patterns are precompiled. The tag and attribute repairs only run when a line
+    break actually occurs inside a tag, which one scan establishes up front, and each
+    paragraph is visited once, so well-formed responses cost a few linear scans.
+    """
+    if not isinstance(xml_string, str):
+        return ""
+    # Find the first '<' and the last '>'
+    start = xml_string.find("<")
+    end = xml_string.rfind(">")
+    if start == -1 or end == -1:
+        return xml_string  # Return original if no tags found
+
+    cleaned = xml_string[start : end + 1].strip()
+    # Remove markdown code fences
+    if "```" in cleaned:
+        cleaned = _FENCE_OPEN_PATTERN.sub("", cleaned)
+        cleaned = _FENCE_CLOSE_PATTERN.sub("", cleaned)
+
+    broken_tags = _BROKEN_TAG_HINT_PATTERN.search(cleaned) is not None
+    if broken_tags:
+        # id="value\n" -> id="value"
+        cleaned = _sub_attr_breaks(_ATTR_BREAK_BEFORE_QUOTE_PATTERN, r'\1="\2"', cleaned)
+        # id="value\n"> -> id="value">
+        cleaned = _sub_attr_breaks(_ATTR_BREAK_BEFORE_TAG_END_PATTERN, r'\1="\2">', cleaned)
+        # id="value\nother_text" -> id="valueother_text" (no space for IDs)
+        cleaned = _sub_attr_breaks(_ATTR_BREAK_IN_VALUE_PATTERN, _join_attr_break, cleaned)
+        # <paragraph id="2\n1"> -> <paragraph id="21">
+        cleaned = _TAG_ATTR_BREAK_PATTERN.sub(r"\1\2\3\4", cleaned)
+        # Newlines breaking the opening tag itself
+        cleaned = _TAG_BREAK_PATTERN.sub(r"\1\2", cleaned)
+
+    # Fix unwanted line breaks within paragraph content
+    cleaned = _PARAGRAPH_ELEMENT_PATTERN.sub(_fix_paragraph_element, cleaned)
+
+    if broken_tags:
+        # <paragraph id="2\n1"> -> <paragraph id="21">
+        cleaned = _PARAGRAPH_ID_BREAK_PATTERN.sub(r'<paragraph id="\1\2">', cleaned)
+        # <tag attr="val\nue"> -> <tag attr="value">
+        cleaned = _TAG_VALUE_BREAK_PATTERN.sub(r"\1\2", cleaned)
+
+    # <paragraph id="1">\nContent -> <paragraph id="1">Content
+    cleaned = _PARAGRAPH_LEADING_BREAK_PATTERN.sub(r"\1\2", cleaned)
+
+    # Clean up multiple spaces that might result from the above fixes
+    if "  " in cleaned:
+        cleaned = _MULTIPLE_SPACES_PATTERN.sub(" ", cleaned)
+
+    # Attempt to repair truncated XML for patches and book outlines
+    for root_tag in ("patch", "book"):
+        if cleaned.startswith(f"<{root_tag}>"):
+            if not cleaned.rstrip().endswith(f"</{root_tag}>"):
+                cleaned = _attempt_xml_repair(cleaned)
+            break
+
+    return cleaned
 
 
 def _attempt_xml_repair(xml_string: str) -> str:
@@ -156,14 +295,8 @@ def _attempt_xml_repair(xml_string: str) -> str:
     Attempts to repair truncated XML by closing open tags.
     """
     # Track open tags using a simple stack
-    import re
-
-    # Find all opening and closing tags
-    tag_pattern = r"<(/?)(\w+)(?:\s[^>]*)?>"
-    matches = re.findall(tag_pattern, xml_string)
-
     tag_stack = []
-    for is_closing, tag_name in matches:
+    for is_closing, tag_name in _XML_TAG_PATTERN.findall(xml_string):
         if is_closing:  # Closing tag
             if tag_stack and tag_stack[-1] == tag_name:
                 tag_stack.pop()
@@ -173,11 +306,7 @@ def _attempt_xml_repair(xml_string: str) -> str:
                 tag_stack.append(tag_name)
 
     # Close any remaining open tags in reverse order
-    repaired = xml_string
-    for tag in reversed(tag_stack):
-        repaired += f"</{tag}>"
-
-    return repaired
+    return xml_string + "".join(f"</{tag}>" for tag in reversed(tag_stack))
 
 
 def parse_xml_string(
@@ -237,15 +366,15 @@ def parse_xml_string(
                 "[yellow]This often indicates the LLM response was cut off due to token limits.[/yellow]"
             )
 
-            # Try to repair truncated XML automatically
-            if expected_root_tag in ["patch", "book"]:
-                console.print("[yellow]Attempting to repair truncated XML...[/yellow]")
-                repaired_xml = _attempt_xml_repair(xml_string)
-                if repaired_xml != xml_string:
-                    try:
-                        return ET.fromstring(repaired_xml)
-                    except ET.ParseError:
-                        console.print("[yellow]Automatic repair failed.[/yellow]")
+        # Salvage as much as possible rather than discarding the whole response
+        console.print("[yellow]Attempting to repair the XML...[/yellow]")
+        result = repair_xml(xml_string)
+        if result.root is not None and result.root.tag == expected_root_tag:
+            console.print(f"[yellow]Repaired XML with {len(result.changes)} change(s):[/yellow]")
+            for change in result.changes:
+                console.print(f"[dim]  - {change}[/dim]")
+            return result.root
+        console.print("[yellow]Automatic repair failed.[/yellow]")
 
         return None
 
@@ -259,19 +388,19 @@ def clean_paragraph_text(text: str) -> str:
         return text
 
     # Remove markdown bold formatting (**text**)
-    cleaned = re.sub(r"\*\*(.*?)\*\*", r"\1", text)
+    cleaned = _MARKDOWN_BOLD_PATTERN.sub(r"\1", text) if "**" in text else text
 
     # Remove line breaks that are not after sentence endings or dialogue
     # Keep breaks after: . ! ? " and at the start/end of paragraphs
-    cleaned = re.sub(r'(?<![.!?"\n])\n(?=\s*[a-z])', " ", cleaned)
+    if "\n" in cleaned:
+        cleaned = _PARAGRAPH_SOFT_BREAK_PATTERN.sub(" ", cleaned)
 
     # Clean up multiple spaces
-    cleaned = re.sub(r"  +", " ", cleaned)
+    if "  " in cleaned:
+        cleaned = _MULTIPLE_SPACES_PATTERN.sub(" ", cleaned)
 
     # Clean up trailing/leading whitespace while preserving intentional breaks
-    cleaned = cleaned.strip()
-
-    return cleaned
+    return cleaned.strip()
 
 
 def get_chapter_id(chapter_element) -> str:
@@ -290,8 +419,36 @@ def get_chapter_id_with_default(chapter_element, default="N/A") -> str:
     return chapter_element.get("id") or chapter_element.findtext("id", default)
 
 
+def number_paragraphs(chapter_element) -> bool:
+    """
+    Numbers a chapter's paragraphs 1..n, the ids paragraph-level edits refer to.
+    Returns True if any id changed (e.g. a chapter written before paragraphs had ids).
+    """
+    paragraphs = chapter_element.findall("content/paragraph")
+    expected = [str(number) for number in range(1, len(paragraphs) + 1)]
+    if [paragraph.get("id") for paragraph in paragraphs] == expected:
+        return False
+    for number, paragraph in zip(expected, paragraphs, strict=True):
+        paragraph.set("id", number)
+    return True
+
+
+def parse_patch_number(filename: str) -> int | None:
+    """Returns NN for a 'patch-NN.xml' filename, or None for any other file."""
+    stem, _, suffix = filename.rpartition(".")
+    if suffix != "xml" or not stem.startswith("patch-"):
+        return None
+    number = stem.split("-")[-1]
+    return int(number) if number.isdigit() else None
+
+
 def get_next_patch_number(book_dir: Path) -> int:
-    """Finds the next available patch number based on existing files."""
+    """
+    Finds the next available patch number by listing existing files.
+
+    Projects track their sequence in memory (Project.next_patch_number); this scan is
+    only for callers without a loaded project.
+    """
     if not book_dir or not book_dir.is_dir():
         return 1
     try:
@@ -375,6 +532,10 @@ def convert_tavern_lorebook_to_fiction_fabricator(tavern_lorebook_path: str) ->
             "enable": True,  # We already filtered out disabled entries
             "disable": False,
         }
+        # Keep the entry's priority for lorebook context selection
+        for priority_field in ("order", "insertion_order"):
+            if priority_field in entry:
+                ff_entry[priority_field] = entry[priority_field]
 
         converted_entries.append(ff_entry)
 
@@ -0,0 +1,141 @@
+"""
+xml_repair.py - Tolerant repair of malformed XML returned by LLMs.
+
+Targets the failure classes seen in generated patches: bare '&' characters, HTML
+entities XML does not define, stray '<' in prose or dialogue, and paragraphs that
+were never closed. Whatever is still malformed after those fixes is handed to lxml's
+recovering parser, which keeps every element it can. Each change is reported so the
+caller can tell the user what was salvaged.
+"""
+import html
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+
+from lxml import etree
+
+# '&' that does not start a character or entity reference
+_AMPERSAND_PATTERN = re.compile(r"&(?!#[0-9]+;|#x[0-9A-Fa-f]+;)(?:([A-Za-z][A-Za-z0-9]*);)?")
+_XML_ENTITIES = {"amp", "lt", "gt", "quot", "apos"}
+
+# '<' that cannot start a tag, comment or processing instruction (e.g. "<3", "a < b")
+_STRAY_LT_PATTERN = re.compile(r"<(?![A-Za-z_/!?])")
+
+# A paragraph and its body, up to its closing tag or whatever shows it was left open
+_PARAGRAPH_PATTERN = re.compile(
+    r"(<paragraph\b[^>]*(?<!/)>)(.*?)"
+    r"(</paragraph>|(?=<paragraph\b|</content>|</chapter>|</patch>|\Z))",
+    re.DOTALL,
+)
+
+# Parser errors listed individually in a report before being summarized
+_MAX_REPORTED_PARSER_ERRORS = 5
+
+
+@dataclass
+class XmlRepairResult:
+    """Outcome of repair_xml: the parsed root (None if nothing was salvageable)."""
+
+    root: ET.Element | None
+    xml: str
+    changes: list[str] = field(default_factory=list)
+
+
+def _fix_ampersands(xml_string: str, changes: list[str]) -> str:
+    escaped = converted = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal escaped, converted
+        name = match.group(1)
+        if name is None:
+            escaped += 1
+            return "&amp;"
+        if name in _XML_ENTITIES:
+            return match.group(0)
+        # HTML entities such as &nbsp; or &mdash; are undefined in XML
+        character = html.unescape(match.group(0))
+        if character != match.group(0):
+            converted += 1
+            return html.escape(character, quote=False)
+        escaped += 1
+        return "&amp;" + match.group(0)[1:]
+
+    fixed = _AMPERSAND_PATTERN.sub(replace, xml_string)
+    if escaped:
+        changes.append(f"Escaped {escaped} bare '&' character(s)")
+    if converted:
+        changes.append(f"Replaced {converted} HTML entity reference(s) undefined in XML")
+    return fixed
+
+
+def _fix_paragraphs(xml_string: str, changes: list[str]) -> str:
+    escaped = closed = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal escaped, closed
+        opening, body, closing = match.groups()
+        # Paragraphs hold plain prose, so any '<' inside one is text (e.g. dialogue)
+        if "<" in body:
+            escaped += body.count("<")
+            body = body.replace("<", "&lt;")
+        if not closing:
+            closed += 1
+            closing = "</paragraph>"
+        return opening + body + closing
+
+    fixed = _PARAGRAPH_PATTERN.sub(replace, xml_string)
+    if escaped:
+        changes.append(f"Escaped {escaped} '<' character(s) inside paragraph text")
+    if closed:
+        changes.append(f"Closed {closed} unterminated <paragraph> element(s)")
+    return fixed
+
+
+def _escape_stray_lt(xml_string: str, changes: list[str]) -> str:
+    fixed, count = _STRAY_LT_PATTERN.subn("&lt;", xml_string)
+    if count:
+        changes.append(f"Escaped {count} stray '<' character(s)")
+    return fixed
+
+
+def _recover_with_lxml(xml_string: str, changes: list[str]) -> ET.Element | None:
+    """Parses with lxml in recover mode and converts the result to an ElementTree element."""
+    parser = etree.XMLParser(recover=True, huge_tree=True)
+    try:
+        lxml_root = etree.fromstring(xml_string.encode("utf-8"), parser)
+    except etree.XMLSyntaxError:
+        lxml_root = None
+    if lxml_root is None:
+        return None
+
+    errors = list(parser.error_log)
+    for error in errors[:_MAX_REPORTED_PARSER_ERRORS]:
+        changes.append(f"Recovered from parser error at line {error.line}: {error.message}")
+    if len(errors) > _MAX_REPORTED_PARSER_ERRORS:
+        changes.append(
+            f"Recovered from {len(errors) - _MAX_REPORTED_PARSER_ERRORS} more parser error(s)"
+        )
+    return ET.fromstring(etree.tostring(lxml_root, encoding="utf-8"))
+
+
+def repair_xml(xml_string: str) -> XmlRepairResult:
+    """
+    Repairs malformed XML in one pass and parses it, keeping as much content as possible.
+
+    Targeted fixes are applied first; if the result still does not parse, lxml's
+    recovering parser salvages every well-formed part and closes truncated elements.
+
+    Returns:
+        XmlRepairResult with the parsed root (or None), the fixed XML text and a
+        human-readable list of the changes made
+    """
+    changes: list[str] = []
+    fixed = _fix_ampersands(xml_string, changes)
+    fixed = _fix_paragraphs(fixed, changes)
+    fixed = _escape_stray_lt(fixed, changes)
+
+    try:
+        root = ET.fromstring(fixed)
+    except ET.ParseError:
+        root = _recover_with_lxml(fixed, changes)
+    return XmlRepairResult(root=root, xml=fixed, changes=changes)
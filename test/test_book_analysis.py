@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for whole-book analysis over a process pool.
+"""
+from src import book_analysis, config
+from src.book_analysis import analyze_book
+from src.continuity_manager import ContinuityManager
+from src.text_analysis import TextAnalysis
+
+CHAPTERS = [
+    (
+        "1",
+        "Mara arrives.",
+        ["Mara walked to the harbour. Suddenly, it was a piece of cake.", "Mara said nothing... what's there"],
+    ),
+    ("2", "The guild.", ['The Guild met. Mara said "Bram" was very late.', "Mora waited, to be honest."]),
+    ("3", "Night.", ["Then suddenly the door opened. Mara ran!"]),
+]
+
+
+def _summary(analysis):
+    return [
+        (
+            chapter.chapter_id,
+            chapter.quality,
+            chapter.engagement,
+            [(issue.issue_type, issue.entity_name) for issue in chapter.continuity_issues],
+        )
+        for chapter in analysis.chapters
+    ]
+
+
+def test_small_books_are_analyzed_in_process():
+    analysis = analyze_book(CHAPTERS, workers=4)
+
+    assert analysis.workers == 1
+    assert [chapter.chapter_id for chapter in analysis.chapters] == ["1", "2", "3"]
+    assert analysis.chapters[0].quality.slop_analysis.has_issues
+    # Continuity runs in book order: "Mora" in chapter 2 is a variation of chapter 1's "Mara"
+    assert [issue.entity_name for issue in analysis.chapters[1].continuity_issues] == ["Mara"]
+    assert analysis.busy_seconds > 0 and analysis.speedup > 0
+
+
+def test_process_pool_gives_the_in_process_results(monkeypatch):
+    monkeypatch.setattr(config, "BOOK_ANALYSIS_PARALLEL_MIN_WORDS", 0)
+    chapters = CHAPTERS * 3
+
+    parallel = analyze_book(chapters, workers=2)
+
+    assert parallel.workers == 2
+    assert _summary(parallel) == _summary(analyze_book(chapters, workers=1))
+
+
+def test_falls_back_in_process_when_workers_cannot_start(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise OSError("no semaphores")
+
+    monkeypatch.setattr(config, "BOOK_ANALYSIS_PARALLEL_MIN_WORDS", 0)
+    monkeypatch.setattr(book_analysis, "ProcessPoolExecutor", unavailable)
+
+    analysis = analyze_book(CHAPTERS, workers=2)
+
+    assert analysis.workers == 1
+    assert len(analysis.chapters) == 3
+
+
+def test_continuity_reuses_the_callers_chapter_analyses(monkeypatch):
+    contents = [TextAnalysis("\n".join(paragraphs)) for _, _, paragraphs in CHAPTERS]
+    expected = _summary(analyze_book(CHAPTERS, workers=1))
+    received = []
+    analyze_chapter = ContinuityManager.analyze_chapter_for_continuity
+
+    def recording(self, chapter_id, content_text, chapter_summary=""):
+        received.append(content_text)
+        return analyze_chapter(self, chapter_id, content_text, chapter_summary)
+
+    monkeypatch.setattr(ContinuityManager, "analyze_chapter_for_continuity", recording)
+
+    analysis = analyze_book(CHAPTERS, workers=1, contents=contents)
+
+    assert _summary(analysis) == expected
+    assert all(seen is content for seen, content in zip(received, contents, strict=True))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the compiled engagement lexicon and the per-sentence signals.
+"""
+import random
+
+from src.engagement_optimizer import EmotionalBeat, EngagementOptimizer, _inflections
+from src.text_analysis import TextAnalysis
+
+WORDS = (
+    "she knew now the war was over and walked toward the danger . killed escaped ! "
+    "everything changed moved on without warning screamed worried calm ? the tide"
+).split()
+
+
+def test_entries_match_whole_words_and_inflections():
+    optimizer = EngagementOptimizer()
+
+    # "now" in "know", "war" in "toward", "over" in "discovered", "die" in "soldier"
+    assert optimizer._measure_tension_level("I know the soldier walked toward it") == 0.0
+    assert optimizer._detect_emotional_beat("She discovered the cove", 0.5) is None
+    assert optimizer._measure_tension_level("He killed the guard and escaped now") == 1.0
+    assert optimizer._measure_tension_level("She was worried, and he hesitated") == 0.4
+    assert optimizer._measure_emotional_intensity("He screamed and she was calm") == 0.8
+    assert optimizer._measure_emotional_intensity("They were calmed") == 0.5
+
+
+def test_inflections_follow_the_word_ending():
+    assert _inflections("die") == ["die", "dies", "died", "dying"]
+    assert _inflections("war") == ["war", "wars", "warred", "warring"]
+    assert _inflections("escape") == ["escape", "escapes", "escaped", "escaping"]
+    assert _inflections("panic") == ["panic", "panics", "panicked", "panicking"]
+    assert _inflections("fight") == ["fight", "fights", "fought", "fighting"]
+    assert _inflections("kill") == ["kill", "kills", "killed", "killing"]
+    assert _inflections("danger") == ["danger", "dangers"]
+    for word in ("safe", "over", "now", "worried", "suddenly"):
+        assert _inflections(word) == [word]
+
+
+def test_real_inflections_count_and_made_up_ones_do_not():
+    optimizer = EngagementOptimizer()
+
+    assert optimizer._measure_tension_level("He was dying") == 0.4
+    assert optimizer._measure_tension_level("She panicked and fled") == 0.4
+    assert optimizer._detect_emotional_beat("The warring clans met", 0.5) == EmotionalBeat.CONFLICT
+    assert optimizer._detect_emotional_beat("They fought at dawn", 0.5) == EmotionalBeat.CONFLICT
+    for non_word in ("diees", "diing", "safing", "overing", "nowed"):
+        assert optimizer._lexicon.entries(f"The {non_word} came") == set()
+
+
+def test_phrases_and_beat_order():
+    optimizer = EngagementOptimizer()
+
+    assert optimizer._detect_emotional_beat("Then everything changed", 0.5) == EmotionalBeat.CLIMAX
+    assert optimizer._detect_emotional_beat("At last she had moved on", 0.5) == EmotionalBeat.RESOLUTION
+    assert optimizer._detect_emotional_beat("She moved the boat on", 0.5) is None
+    assert optimizer._detect_emotional_beat("The danger was over", 0.5) == EmotionalBeat.TENSION_BUILD
+    assert optimizer._detect_emotional_beat("The danger was over", 0.1) == EmotionalBeat.SETUP
+    assert optimizer._has_sudden_action("Without warning, the lamp went out.")
+    assert not optimizer._has_sudden_action("Without a warning light.")
+
+
+def test_sentence_signals_match_per_sentence_scores():
+    rng = random.Random(3)
+    text = " ".join(rng.choice(WORDS) for _ in range(2000)).replace(" . ", ". ")
+    analysis = TextAnalysis(text)
+    optimizer = EngagementOptimizer()
+
+    signals = optimizer._sentence_signals(analysis)
+
+    assert len(signals) == len(analysis.sentence_pieces)
+    for sentence, signal in zip(analysis.sentence_pieces, signals, strict=True):
+        assert signal.beat == optimizer._detect_emotional_beat(sentence, 1.0)
+        assert signal.intensity == optimizer._measure_emotional_intensity(sentence)
+        assert signal.tension == optimizer._measure_tension_level(sentence)
+    assert optimizer._analyze_emotional_arc(text) == optimizer._analyze_emotional_arc(analysis, signals)
+    assert optimizer._analyze_tension_cycles(text) == optimizer._analyze_tension_cycles(analysis, signals)
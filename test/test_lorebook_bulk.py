@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for concurrent bulk condensing and expansion of lorebook entries.
+"""
+import asyncio
+import json
+
+from rich.console import Console
+
+from src import config
+from src.lorebook_manager import LorebookManager
+
+
+class _AsyncLLM:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_response_async(self, prompt, task_description, allow_stream=True):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if "Entry 3" in task_description:
+            return None
+        return f"Condensed {task_description}."
+
+
+class _BlockingLLM:
+    def get_response(self, prompt, task_description, allow_stream=True):
+        return "A much longer description of the stub entry, with detail."
+
+
+def _lorebook(count, words):
+    return {
+        "entries": [
+            {"comment": f"Entry {i}", "keys": [f"k{i}"], "content": " ".join(["word"] * words)}
+            for i in range(count)
+        ]
+    }
+
+
+def test_bulk_update_is_bounded_writes_back_and_saves_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "LOREBOOK_BULK_CONCURRENCY", 2)
+    path = tmp_path / "lorebook.json"
+    saves = []
+    llm = _AsyncLLM()
+    manager = LorebookManager(llm, Console(quiet=True), on_save=lambda p, d: saves.append(p))
+    lorebook = _lorebook(6, words=50)
+    lorebook["entries"][5]["content"] = "short"
+    jobs = [
+        (entry, "prompt", f"Condensing {entry['comment']}")
+        for entry in lorebook["entries"]
+    ]
+
+    updated = manager._run_bulk_update(path, lorebook, jobs, shorten=True)
+
+    assert updated == 4  # Entry 3 failed; Entry 5's result is not shorter
+    assert llm.max_in_flight == 2
+    contents = [entry["content"] for entry in lorebook["entries"]]
+    assert contents[0] == "Condensed Condensing Entry 0."
+    assert contents[3].startswith("word") and contents[5] == "short"
+    assert saves == [path]
+    assert json.loads(path.read_text(encoding="utf-8")) == lorebook
+
+
+def test_bulk_expand_falls_back_to_blocking_client(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.lorebook_manager.IntPrompt.ask", lambda *a, **k: 10)
+    path = tmp_path / "lorebook.json"
+    manager = LorebookManager(_BlockingLLM(), Console(quiet=True))
+    lorebook = _lorebook(2, words=3)
+    lorebook["entries"].append({"comment": "Full", "keys": [], "content": "word " * 20})
+
+    manager._bulk_expand_entries(path, lorebook)
+
+    assert [entry["content"].startswith("A much longer") for entry in lorebook["entries"]] == [
+        True,
+        True,
+        False,
+    ]
+    assert path.exists()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the compiled lorebook keyword index.
+"""
+import hashlib
+import json
+import os
+
+import pytest
+from rich.console import Console
+
+from src.lorebook_index import AhoCorasick, LorebookIndex, cache_path, load_index
+from src.lorebook_manager import LorebookManager
+from src.orchestrator import Orchestrator
+
+LOREBOOK = {
+    "entries": {
+        "0": {"comment": "Ann", "keys": ["Ann"], "content": "The ferrywoman."},
+        "1": {"comment": "Guild", "key": "Silver Guild, guildhall", "content": "Merchants."},
+        "2": {"comment": "Hidden", "keys": ["guild"], "content": "Disabled.", "disable": True},
+        "3": {"comment": "Empty", "keys": ["ferry"], "content": "   "},
+    }
+}
+
+
+def test_automaton_reports_overlapping_matches():
+    automaton = AhoCorasick([("he", 1), ("she", 2), ("hers", 3)])
+
+    matches = sorted(automaton.iter_matches("ushers"))
+
+    assert matches == [(1, 4, 2), (2, 4, 1), (2, 6, 3)]
+
+
+def test_index_matches_whole_words_and_counts_hits():
+    index = LorebookIndex.from_data(LOREBOOK)
+
+    assert [entry.title for entry in index.entries] == ["Ann", "Guild"]
+    assert index.match("They planned the crossing.") == {}
+    assert index.match("ANN met the silver  guild at the Guildhall; Ann left.") == {0: 2, 1: 2}
+
+
+def test_index_substring_mode():
+    index = LorebookIndex.from_data(LOREBOOK, whole_words=False)
+
+    assert index.match("They planned the crossing.") == {0: 1}
+
+
+def test_saving_the_loaded_lorebook_rebuilds_the_index(tmp_path):
+    path = tmp_path / "lorebook.json"
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.lorebook_path = path
+    orchestrator.lorebook_data = LOREBOOK
+    manager = LorebookManager(None, Console(quiet=True), on_save=orchestrator._on_lorebook_saved)
+
+    edited = {"entries": [{"comment": "Tower", "keys": ["tower"], "content": "Tall."}]}
+    manager._save_lorebook(path, edited)
+
+    assert "Tower" in orchestrator._extract_lorebook_context("The tower fell.")
+    assert orchestrator._extract_lorebook_context("Ann waited.") == ""
+
+
+def _entry(title, keys, order=None, words=5):
+    entry = {"comment": title, "keys": keys, "content": " ".join(["lore"] * words)}
+    if order is not None:
+        entry["order"] = order
+    return entry
+
+
+def test_select_ranks_rare_keys_above_shared_ones():
+    index = LorebookIndex.from_data(
+        {
+            "entries": [
+                _entry("Empire", ["empire"]),
+                _entry("Throne", ["throne", "empire"]),
+                _entry("Fleet", ["fleet", "empire"]),
+                _entry("Crown", ["crown"]),
+            ]
+        },
+        recency_weight=0,
+    )
+
+    selected = index.select("The empire sent its crown to the empire's capital.")
+
+    assert [entry.title for entry in selected] == ["Crown", "Empire", "Throne", "Fleet"]
+
+
+def test_select_prefers_recent_mentions_and_honours_order():
+    lorebook = {
+        "entries": [
+            _entry("Harbour", ["harbour"]),
+            _entry("Tower", ["tower"]),
+            _entry("Prophecy", ["prophecy"], order=200),
+        ]
+    }
+    index = LorebookIndex.from_data(lorebook)
+
+    selected = index.select("The harbour at dawn. The prophecy spoke. Later, the tower.")
+
+    assert [entry.title for entry in selected] == ["Prophecy", "Tower", "Harbour"]
+
+
+def test_select_fills_token_budget():
+    index = LorebookIndex.from_data(
+        {
+            "entries": [
+                _entry("Long", ["long"], words=100),
+                _entry("Short", ["short"], words=5),
+                _entry("Other", ["other"], words=5),
+            ]
+        }
+    )
+    text = "long long long short other"
+
+    selected = index.select(text, token_budget=index.entries[1].tokens * 2 + 1)
+
+    assert sorted(entry.title for entry in selected) == ["Other", "Short"]
+    assert len(index.select(text)) == 3
+
+
+def test_load_index_reuses_cache_until_lorebook_changes(tmp_path, monkeypatch):
+    path = tmp_path / "lorebook.json"
+    path.write_text(json.dumps(LOREBOOK), encoding="utf-8")
+    index = load_index(path)
+    assert cache_path(path).exists()
+
+    def fail_build(*args, **kwargs):
+        raise AssertionError("index rebuilt")
+
+    # Unchanged, or only touched: served from the cache without parsing the JSON
+    with monkeypatch.context() as m:
+        m.setattr(LorebookIndex, "from_data", fail_build)
+        cached = load_index(path)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        touched = load_index(path)
+        # The touch is recorded, so the next load trusts the stat without hashing
+        m.setattr(hashlib, "sha256", fail_build)
+        retouched = load_index(path)
+    for loaded in (cached, touched, retouched):
+        assert loaded.entries == index.entries
+        assert loaded.match("Ann met the Silver Guild.") == {0: 1, 1: 1}
+
+    edited = {"entries": [{"comment": "Tower", "keys": ["tower"], "content": "Tall."}]}
+    path.write_text(json.dumps(edited), encoding="utf-8")
+    assert [entry.title for entry in load_index(path).entries] == ["Tower"]
+
+
+def test_load_index_ignores_corrupt_cache(tmp_path):
+    path = tmp_path / "lorebook.json"
+    path.write_text(json.dumps(LOREBOOK), encoding="utf-8")
+    cache_path(path).write_bytes(b"not a cache")
+
+    assert len(load_index(path).entries) == 2
+
+    path.write_text("{broken", encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        load_index(path)
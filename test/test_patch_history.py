@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for patch snapshot retention, compression and deduplication.
+"""
+import gzip
+import re
+import xml.etree.ElementTree as ET
+
+from rich.console import Console
+
+from src import utils
+from src.patch_history import PatchHistory
+from src.project import Project
+
+
+def _project_with_history(tmp_path, monkeypatch, saves: int) -> Project:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("src.config.ENABLE_PATCH_HISTORY_RETENTION", False)
+    project = Project(Console(quiet=True))
+    project.setup_new_project("idea", "History", "synopsis")
+    chapters = project.book_root.find("chapters")
+    for i in range(1, 4):
+        ET.SubElement(chapters, "chapter", id=str(i))
+    for n in range(1, saves + 1):
+        chapter_id = (n % 3) + 1
+        project.apply_patch(
+            f'<patch><chapter id="{chapter_id}"><content>'
+            f'<paragraph id="1">Draft {n} of chapter {chapter_id}.</paragraph>'
+            "</content></chapter></patch>",
+            is_loading=True,
+        )
+        project.save_state(f"patch-{n:02d}.xml")
+    return project
+
+
+def test_archived_snapshots_restore_byte_for_byte(tmp_path, monkeypatch):
+    project = _project_with_history(tmp_path, monkeypatch, saves=8)
+    originals = {n: (project.book_dir / f"patch-{n:02d}.xml").read_bytes() for n in range(1, 9)}
+
+    history = PatchHistory(project.book_dir, keep_last=3, keep_every=1)
+    assert history.apply_retention() == 5
+
+    assert history.hot_patch_numbers() == [6, 7, 8]
+    assert history.archived_patch_numbers() == [1, 2, 3, 4, 5]
+    for n, data in originals.items():
+        assert history.read_snapshot(n) == data
+    assert utils.get_next_patch_number(project.book_dir) == 9
+
+
+def test_identical_chapter_bodies_are_stored_once(tmp_path, monkeypatch):
+    project = _project_with_history(tmp_path, monkeypatch, saves=6)
+    history = PatchHistory(project.book_dir, keep_last=1, keep_every=1)
+    history.apply_retention()
+
+    # Snapshots 1-5 hold 12 <content> bodies between them, but each save only
+    # rewrote one chapter, so there are just 5 distinct bodies on disk.
+    blobs = list(history.blobs_dir.glob("*.xml.gz"))
+    assert len(blobs) == 5
+
+
+def test_keep_every_prunes_snapshots_and_orphan_blobs(tmp_path, monkeypatch):
+    project = _project_with_history(tmp_path, monkeypatch, saves=9)
+    history = PatchHistory(project.book_dir, keep_last=2, keep_every=3)
+    history.apply_retention()
+
+    assert history.archived_patch_numbers() == [3, 6]
+    assert history.read_snapshot(4) is None
+
+    referenced = set()
+    for n in history.archived_patch_numbers():
+        skeleton = gzip.decompress(history._archive_path(n).read_bytes())
+        referenced.update(re.findall(rb'__blob__="([0-9a-f]{64})"', skeleton))
+    stored = {p.name.removesuffix(".xml.gz").encode() for p in history.blobs_dir.glob("*.xml.gz")}
+    assert stored == referenced
+
+
+def test_materialize_restores_archived_snapshot(tmp_path, monkeypatch):
+    project = _project_with_history(tmp_path, monkeypatch, saves=4)
+    original = (project.book_dir / "patch-02.xml").read_bytes()
+    history = PatchHistory(project.book_dir, keep_last=1)
+    history.apply_retention()
+
+    restored = history.materialize(2)
+
+    assert restored == project.book_dir / "patch-02.xml"
+    assert restored.read_bytes() == original
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the projects/index.json manifest.
+"""
+import os
+
+from rich.console import Console
+
+from src.project import Project
+from src.project_manifest import ProjectManifest
+
+
+def _new_project(title: str) -> Project:
+    project = Project(Console(quiet=True))
+    project.setup_new_project("idea", title, "synopsis")
+    return project
+
+
+def test_save_state_updates_manifest(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = _new_project("First Book")
+    project.story_type = "short_story"
+    project.save_state("patch-03.xml")
+
+    entry = ProjectManifest(tmp_path / "projects").get(project.book_dir.name)
+
+    assert entry.title == "First Book"
+    assert entry.story_type == "short_story"
+    assert entry.latest_patch == 3
+    assert entry.chapter_count == 0
+
+
+def test_list_projects_rebuilds_stale_and_missing_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    projects_dir = tmp_path / "projects"
+    first = _new_project("First Book")
+    second = _new_project("Second Book")
+
+    # Simulate an index written before the second project existed
+    manifest = ProjectManifest(projects_dir)
+    manifest.entries.pop(second.book_dir.name)
+    manifest.save()
+
+    # Edit the first project's outline behind the manifest's back
+    outline = first.book_dir / "outline.xml"
+    outline.write_text(outline.read_text().replace("First Book", "Renamed Book"))
+    future = os.stat(outline).st_mtime + 10
+    os.utime(outline, (future, future))
+
+    entries = ProjectManifest(projects_dir).list_projects()
+
+    assert [e.title for e in entries] == ["Renamed Book", "Second Book"]
+    assert set(ProjectManifest(projects_dir).entries) == {first.book_dir.name, second.book_dir.name}
+
+
+def test_resume_restores_story_type(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = _new_project("Story")
+    project.story_type = "short_story"
+    project.save_state("outline.xml")
+
+    resumed = Project(Console(quiet=True), project.book_dir.name)
+
+    assert resumed.story_type == "short_story"
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for applying XML patches to a project's book tree.
+"""
+import dataclasses
+import gzip
+import xml.etree.ElementTree as ET
+
+from rich.console import Console
+
+from src import utils
+from src.orchestrator import Orchestrator
+from src.project import Project
+from src.project_manifest import ProjectManifest
+
+
+def _make_project() -> Project:
+    project = Project(Console(quiet=True))
+    book = ET.Element("book")
+    ET.SubElement(book, "title").text = "Original"
+    ET.SubElement(book, "characters")
+    chapters = ET.SubElement(book, "chapters")
+    for i in (1, 2):
+        chapter = ET.SubElement(chapters, "chapter", id=str(i))
+        ET.SubElement(chapter, "title").text = f"Chapter {i}"
+    project.book_root = book
+    return project
+
+
+def test_apply_patch_with_content_wrapper():
+    project = _make_project()
+    patch = (
+        '<patch><chapter id="1"><content>'
+        '<paragraph id="1">First line\ncontinues **here**.</paragraph>'
+        '<paragraph id="2">Second.</paragraph>'
+        "</content></chapter></patch>"
+    )
+
+    assert project.apply_patch(patch)
+
+    paragraphs = project.find_chapter("1").findall("content/paragraph")
+    assert [p.text for p in paragraphs] == ["First line continues here.", "Second."]
+    assert "1" in project.chapters_generated_in_session
+
+
+def test_apply_patch_without_content_wrapper_replaces_old_content():
+    project = _make_project()
+    project.apply_patch(
+        '<patch><chapter id="2"><content><paragraph>Old</paragraph></content></chapter></patch>'
+    )
+
+    assert project.apply_patch(
+        '<patch><chapter id="2"><paragraph id="1">New text</paragraph></chapter></patch>'
+    )
+
+    chapter = project.find_chapter("2")
+    assert len(chapter.findall("content")) == 1
+    assert [p.text for p in chapter.findall("content/paragraph")] == ["New text"]
+
+
+def test_apply_patch_replaces_top_level_elements():
+    project = _make_project()
+    patch = (
+        "<patch><title>Renamed</title>"
+        '<characters><character id="hero"><name>Ada</name></character></characters>'
+        "</patch>"
+    )
+
+    assert project.apply_patch(patch)
+
+    assert project.book_root.findtext("title") == "Renamed"
+    assert len(project.book_root.findall("title")) == 1
+    assert project.book_root.findtext("characters/character/name") == "Ada"
+
+
+def test_apply_patch_rejects_invalid_xml():
+    project = _make_project()
+    assert not project.apply_patch("no xml here", is_loading=True)
+
+
+def _project_with_paragraphs(*texts: str) -> Project:
+    project = _make_project()
+    paragraphs = "".join(f'<paragraph id="{i}">{t}</paragraph>' for i, t in enumerate(texts, 1))
+    project.apply_patch(
+        f'<patch><chapter id="1"><content>{paragraphs}</content></chapter></patch>',
+        is_loading=True,
+    )
+    return project
+
+
+def test_apply_patch_paragraph_edits():
+    project = _project_with_paragraphs("One.", "Two.", "Three.", "Four.")
+    patch = (
+        '<patch><chapter id="1">'
+        '<insert after="0">Zero.</insert>'
+        '<replace paragraph="2">Two,\nrevised.</replace>'
+        '<delete paragraph="3"/>'
+        '<insert after="3">Three and a half.</insert>'
+        '<insert after="4">Five.</insert>'
+        "</chapter></patch>"
+    )
+
+    assert project.apply_patch(patch)
+
+    paragraphs = project.find_chapter("1").findall("content/paragraph")
+    assert [(p.get("id"), p.text) for p in paragraphs] == [
+        ("1", "Zero."),
+        ("2", "One."),
+        ("3", "Two, revised."),
+        ("4", "Three and a half."),
+        ("5", "Four."),
+        ("6", "Five."),
+    ]
+    assert "1" in project.chapters_generated_in_session
+
+
+def test_paragraph_edits_skip_unknown_ids():
+    project = _project_with_paragraphs("One.", "Two.")
+
+    assert not project.apply_patch('<patch><chapter id="1"><delete paragraph="7"/></chapter></patch>')
+    assert project.apply_patch(
+        '<patch><chapter id="1"><delete paragraph="7"/><delete paragraph="1"/></chapter></patch>'
+    )
+    paragraphs = project.find_chapter("1").findall("content/paragraph")
+    assert [(p.get("id"), p.text) for p in paragraphs] == [("1", "Two.")]
+
+
+def test_full_content_is_numbered_for_later_paragraph_edits():
+    project = _make_project()
+    project.apply_patch(
+        '<patch><chapter id="1"><content><paragraph>One.</paragraph>'
+        '<paragraph id="9">Two.</paragraph></content></chapter></patch>'
+    )
+
+    assert project.apply_patch(
+        '<patch><chapter id="1"><replace paragraph="1">Uno.</replace></chapter></patch>'
+    )
+    paragraphs = project.find_chapter("1").findall("content/paragraph")
+    assert [(p.get("id"), p.text) for p in paragraphs] == [("1", "Uno."), ("2", "Two.")]
+
+
+def test_paragraph_edits_without_target_are_skipped():
+    project = _project_with_paragraphs("One.", "Two.")
+
+    assert not project.apply_patch(
+        '<patch><chapter id="1"><replace>Lost.</replace><delete paragraph=""/>'
+        "<insert>Nowhere.</insert></chapter></patch>"
+    )
+    paragraphs = project.find_chapter("1").findall("content/paragraph")
+    assert [p.text for p in paragraphs] == ["One.", "Two."]
+
+
+def test_legacy_chapter_without_ids_is_numbered_for_its_edit_prompt():
+    project = _make_project()
+    content = ET.SubElement(project.find_chapter("1"), "content")
+    for text in ("One.", "Two.", "Three."):
+        ET.SubElement(content, "paragraph").text = text
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.project = project
+
+    context = orchestrator._create_reduced_context_for_chapter("1")
+
+    assert '<paragraph id="3">Three.</paragraph>' in context
+    assert project.apply_patch(
+        '<patch><chapter id="1"><replace paragraph="2">Deux.</replace>'
+        '<delete paragraph="3"/></chapter></patch>'
+    )
+    paragraphs = project.find_chapter("1").findall("content/paragraph")
+    assert [(p.get("id"), p.text) for p in paragraphs] == [("1", "One."), ("2", "Deux.")]
+
+
+def test_duplicate_paragraph_ids_are_renumbered_before_edits():
+    project = _make_project()
+    content = ET.SubElement(project.find_chapter("1"), "content")
+    for text in ("One.", "Two."):
+        ET.SubElement(content, "paragraph", id="1").text = text
+
+    assert project.apply_patch(
+        '<patch><chapter id="1"><replace paragraph="2">Deux.</replace></chapter></patch>'
+    )
+    paragraphs = project.find_chapter("1").findall("content/paragraph")
+    assert [(p.get("id"), p.text) for p in paragraphs] == [("1", "One."), ("2", "Deux.")]
+
+def _write_project(tmp_path, chapters: int = 3):
+    project = _make_project()
+    chapters_elem = project.book_root.find("chapters")
+    for i in range(3, chapters + 1):
+        ET.SubElement(chapters_elem, "chapter", id=str(i))
+    project.apply_patch(
+        '<patch><chapter id="1"><content><paragraph id="1">One two three &amp; four.</paragraph>'
+        '<paragraph id="2">Five.</paragraph></content></chapter>'
+        '<chapter id="3"><content/></chapter></patch>',
+        is_loading=True,
+    )
+    project_dir = tmp_path / "20250101-original-abcd1234"
+    project_dir.mkdir()
+    project.book_dir = project_dir
+    project.save_state("outline.xml")
+    project.save_state("patch-01.xml")
+    return project_dir
+
+
+def test_lazy_load_matches_eager_load(tmp_path):
+    project_dir = _write_project(tmp_path)
+    console = Console(quiet=True)
+
+    eager = Project(console, str(project_dir))
+    lazy = Project(console, str(project_dir), lazy=True)
+
+    chapter_one = lazy.outline_root.find(".//chapter[@id='1']")
+    assert chapter_one.find("content") is None
+    assert lazy.get_chapter_word_count(chapter_one) == 6
+    assert lazy.chapters_generated_in_session == eager.chapters_generated_in_session == {"1"}
+
+    assert ET.tostring(lazy.book_root) == ET.tostring(eager.book_root)
+
+
+def test_find_chapter_loads_only_that_chapter(tmp_path):
+    project_dir = _write_project(tmp_path)
+    project = Project(Console(quiet=True), str(project_dir), lazy=True)
+
+    chapter = project.find_chapter("1")
+
+    paragraphs = chapter.findall("content/paragraph")
+    assert [p.text for p in paragraphs] == ["One two three & four.", "Five."]
+    chapter_three = project.outline_root.find(".//chapter[@id='3']")
+    assert chapter_three.find("content") is None
+
+
+def test_read_book_title(tmp_path):
+    project_dir = _write_project(tmp_path)
+    assert utils.read_book_title(project_dir / "outline.xml") == "Original"
+    assert utils.read_book_title(tmp_path / "missing.xml") is None
+
+
+def test_patch_sequence_is_tracked_without_listing_folder(tmp_path, monkeypatch):
+    project_dir = _write_project(tmp_path)
+    project = Project(Console(quiet=True), str(project_dir), lazy=True)
+    assert project.latest_patch_number == 1
+
+    def fail_scan():
+        raise AssertionError("patch folder was rescanned")
+
+    monkeypatch.setattr(project, "_recover_patch_sequence", fail_scan)
+    assert project.next_patch_number() == 2
+    project.save_state("patch-02.xml")
+    assert project.next_patch_number() == 3
+    assert Project(Console(quiet=True), str(project_dir)).latest_patch_number == 2
+
+
+def test_patch_sequence_recovers_from_files_added_externally(tmp_path):
+    project_dir = _write_project(tmp_path)
+    project = Project(Console(quiet=True), str(project_dir))
+    (project_dir / "patch-02.xml").write_bytes((project_dir / "patch-01.xml").read_bytes())
+
+    assert project.next_patch_number() == 3
+    # A stale manifest entry is detected on load as well
+    assert Project(Console(quiet=True), str(project_dir)).latest_patch_number == 2
+
+
+def test_cached_zero_is_not_trusted_once_patches_are_archived(tmp_path):
+    project_dir = _write_project(tmp_path)
+    history_dir = project_dir / "history"
+    history_dir.mkdir()
+    (history_dir / "patch-01.xml.gz").write_bytes(
+        gzip.compress((project_dir / "patch-01.xml").read_bytes())
+    )
+    (project_dir / "patch-01.xml").rename(project_dir / "patch-02.xml")
+    manifest = ProjectManifest(tmp_path)
+    manifest.update(dataclasses.replace(manifest.get(project_dir.name), latest_patch=0))
+
+    project = Project(Console(quiet=True), str(project_dir))
+    assert project.latest_patch_number == 2
+
+    project.latest_patch_number = 0
+    assert project.next_patch_number() == 3
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the SQLite project storage backend.
+"""
+import xml.etree.ElementTree as ET
+
+from rich.console import Console
+
+from src import config, utils
+from src.project import Project
+from src.project_store import STORE_FILENAME, ProjectStore, migrate_project_to_store
+
+
+def _new_sqlite_project(tmp_path, monkeypatch) -> Project:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "PROJECT_STORAGE_BACKEND", "sqlite")
+    project = Project(Console(quiet=True))
+    project.setup_new_project("An idea", "Store Book", "A synopsis")
+    project.apply_patch(
+        '<patch><characters><character id="c1"><name>Ada</name></character></characters></patch>',
+        is_loading=True,
+    )
+    chapters = project.book_root.find("chapters")
+    for i in (1, 2, 3):
+        chapter = ET.SubElement(chapters, "chapter", id=str(i))
+        ET.SubElement(chapter, "title").text = f"Chapter {i}"
+    project.story_type = "short_story"
+    project.save_state("outline.xml")
+    return project
+
+
+def _write_chapter(project: Project, chapter_id: str, text: str) -> None:
+    project.apply_patch(
+        f'<patch><chapter id="{chapter_id}"><content>'
+        f'<paragraph id="1">{text}</paragraph></content></chapter></patch>',
+        is_loading=True,
+    )
+    project.save_state(f"patch-{project.next_patch_number():02d}.xml")
+
+
+def test_sqlite_project_round_trips_through_project_api(tmp_path, monkeypatch):
+    project = _new_sqlite_project(tmp_path, monkeypatch)
+    _write_chapter(project, "1", "One two three.")
+    _write_chapter(project, "2", "Four &amp; five.")
+
+    assert (project.book_dir / STORE_FILENAME).exists()
+    assert not list(project.book_dir.glob("*.xml"))
+
+    reloaded = Project(Console(quiet=True), str(project.book_dir))
+    assert reloaded.store is not None
+    assert reloaded.story_type == "short_story"
+    assert reloaded.latest_patch_number == 2
+    assert reloaded.next_patch_number() == 3
+    assert reloaded.chapters_generated_in_session == {"1", "2"}
+    assert utils.pretty_xml(reloaded.book_root) == utils.pretty_xml(project.book_root)
+    assert reloaded.find_chapter("2").findtext("content/paragraph") == "Four & five."
+
+
+def test_history_queries(tmp_path, monkeypatch):
+    project = _new_sqlite_project(tmp_path, monkeypatch)
+    _write_chapter(project, "1", "Draft one.")
+    _write_chapter(project, "2", "Other chapter.")
+    _write_chapter(project, "1", "Second draft of one.")
+
+    store = project.store
+    assert store.chapter_word_counts() == {"1": 4, "2": 2, "3": 0}
+    assert store.chapters_without_content() == ["3"]
+
+    history = store.chapter_history("1")
+    assert [v.label for v in history] == ["outline.xml", "patch-01.xml", "patch-03.xml"]
+    assert [v.word_count for v in history] == [0, 2, 4]
+    # Saving chapter 2 did not touch chapter 1's history
+    assert [v.label for v in store.chapter_history("2")] == ["outline.xml", "patch-02.xml"]
+
+    first_draft = store.load_version(store.version_for_patch(1))
+    assert first_draft.findtext(".//chapter[@id='1']/content/paragraph") == "Draft one."
+    assert first_draft.find(".//chapter[@id='2']/content") is None
+
+
+def test_migrate_xml_project_and_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = Project(Console(quiet=True))
+    project.setup_new_project("An idea", "Xml Book", "A synopsis")
+    chapter = ET.SubElement(project.book_root.find("chapters"), "chapter", id="1")
+    ET.SubElement(chapter, "title").text = "Opening"
+    for text in ("First.", "Second try."):
+        _write_chapter(project, "1", text)
+
+    store = migrate_project_to_store(project.book_dir)
+    assert [v.label for v in store.chapter_history("1")] == ["patch-01.xml", "patch-02.xml"]
+
+    exported = tmp_path / "export.xml"
+    assert store.export_xml(exported, store.version_for_patch(1))
+    exported_root = ET.parse(exported).getroot()
+    assert exported_root.findtext(".//chapter[@id='1']/title") == "Opening"
+    assert exported_root.findtext(".//chapter[@id='1']/content/paragraph") == "First."
+    store.close()
+
+    reopened = ProjectStore(project.book_dir / STORE_FILENAME)
+    book = reopened.load_book()
+    assert book.findtext("title") == "Xml Book"
+    assert book.findtext(".//chapter[@id='1']/content/paragraph") == "Second try."
+    reopened.close()
+
+
+def test_project_migrates_in_place_and_closes_its_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    project = Project(Console(quiet=True))
+    project.setup_new_project("An idea", "Xml Book", "A synopsis")
+    ET.SubElement(project.book_root.find("chapters"), "chapter", id="1")
+    _write_chapter(project, "1", "First.")
+
+    assert project.migrate_to_store()
+    assert not project.migrate_to_store()
+    _write_chapter(project, "1", "Second try.")
+    assert project.latest_patch_number == 2
+    assert not (project.book_dir / "patch-02.xml").exists()
+    project.close()
+
+    with ProjectStore(project.book_dir / STORE_FILENAME) as store:
+        assert [v.label for v in store.chapter_history("1")] == ["patch-01.xml", "patch-02.xml"]
+    reloaded = Project(Console(quiet=True), str(project.book_dir))
+    assert reloaded.find_chapter("1").findtext("content/paragraph") == "Second try."
+    reloaded.close()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the compact XML serialization used in prompt context.
+"""
+import xml.etree.ElementTree as ET
+
+from src import config, utils
+
+
+def _loaded_book():
+    book = ET.Element("book")
+    ET.SubElement(book, "title").text = "Salt & Iron"
+    ET.SubElement(book, "characters")
+    chapters = ET.SubElement(book, "chapters")
+    chapter = ET.SubElement(chapters, "chapter", id="1", setting='The "old" chapel')
+    ET.SubElement(chapter, "summary").text = "  She waits < dawn.  "
+    content = ET.SubElement(chapter, "content")
+    ET.SubElement(content, "paragraph", id="1").text = "First paragraph."
+    ET.SubElement(content, "paragraph", id="2").text = "Second  paragraph."
+    return ET.fromstring(utils.pretty_xml(book))
+
+
+def test_compact_xml_drops_layout_but_keeps_content():
+    compact = utils.compact_xml(_loaded_book())
+
+    assert "\n" not in compact
+    assert "<characters/>" in compact
+    root = ET.fromstring(compact)
+    assert root.findtext("title") == "Salt & Iron"
+    assert root.findtext(".//summary") == "She waits < dawn."
+    chapter = root.find(".//chapter")
+    assert chapter.get("setting") == 'The "old" chapel'
+    assert [(p.get("id"), p.text) for p in chapter.iter("paragraph")] == [
+        ("1", "First paragraph."),
+        ("2", "Second  paragraph."),
+    ]
+
+
+def test_compact_xml_keeps_empty_containers_but_not_empty_leaves():
+    book = ET.Element("book")
+    ET.SubElement(book, "title")
+    ET.SubElement(book, "chapters")
+    chapter = ET.SubElement(book, "chapter", id="1")
+    ET.SubElement(chapter, "content")
+    ET.SubElement(chapter, "summary")
+
+    assert utils.compact_xml(book) == '<book><chapters/><chapter id="1"><content/></chapter></book>'
+
+
+def test_compact_xml_can_omit_paragraph_ids():
+    root = ET.fromstring(utils.compact_xml(_loaded_book(), paragraph_ids=False))
+
+    assert root.find(".//chapter").get("id") == "1"
+    assert all(p.get("id") is None for p in root.iter("paragraph"))
+
+
+def test_xml_for_prompt_respects_config(monkeypatch):
+    book = _loaded_book()
+    monkeypatch.setattr(config, "COMPACT_PROMPT_CONTEXT", False)
+
+    assert utils.xml_for_prompt(book) == ET.tostring(book, encoding="unicode")
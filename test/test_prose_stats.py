@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the vectorised book-wide prose statistics.
+"""
+import random
+import statistics
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.prose_stats import book_prose_stats  # noqa: E402
+from src.quality_metrics import QualityEvaluator  # noqa: E402
+from src.text_analysis import TextAnalysis  # noqa: E402
+
+WORDS = "the tide came in over the stones and she watched the lamps burn low by the quay".split()
+
+
+def _chapter(rng, sentences):
+    return " ".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 45))).capitalize() + rng.choice(".!?")
+        for _ in range(sentences)
+    )
+
+
+def _window_ttr(words, window):
+    if len(words) < window:
+        return len(set(words)) / len(words) if words else 0.0
+    windows = len(words) - window + 1
+    return sum(len(set(words[i:i + window])) for i in range(windows)) / (window * windows)
+
+
+def test_chapter_stats_match_per_chapter_loops():
+    rng = random.Random(4)
+    chapters = [(str(i), _chapter(rng, rng.randint(1, 40))) for i in range(8)] + [("9", "Short. Text!")]
+    evaluator = QualityEvaluator(enable_slop_detection=False)
+
+    stats = book_prose_stats(chapters, window=25)
+
+    for (chapter_id, text), chapter in zip(chapters, stats.chapters, strict=True):
+        analysis = TextAnalysis(text)
+        lengths = analysis.sentence_word_counts
+        assert chapter.label == chapter_id
+        assert chapter.sentence_count == len(lengths) and chapter.word_count == len(analysis.lower_words)
+        assert chapter.mean_sentence_length == pytest.approx(statistics.fmean(lengths))
+        assert chapter.sentence_length_std == pytest.approx(statistics.pstdev(lengths))
+        assert chapter.median_sentence_length == sorted(lengths)[len(lengths) // 2]
+        assert sum(chapter.length_distribution.values()) == len(lengths)
+        assert chapter.sentence_variety_score == evaluator._evaluate_sentence_variety(text)
+        assert chapter.type_token_ratio == pytest.approx(len(set(analysis.lower_words)) / len(analysis.lower_words))
+        assert chapter.moving_average_ttr == pytest.approx(_window_ttr(analysis.lower_words, 25))
+    book_words = [word for _, text in chapters for word in TextAnalysis(text).lower_words]
+    assert stats.book.word_count == len(book_words)
+    assert stats.book.moving_average_ttr == pytest.approx(_window_ttr(book_words, 25))
+
+
+def test_readability_and_empty_chapters():
+    stats = book_prose_stats([("1", "The cat sat. The dog ran."), ("2", ""), ("3", "Extraordinarily complicated terminology proliferates.")])
+    simple, empty, dense = stats.chapters
+
+    assert simple.flesch_reading_ease > 100 > dense.flesch_reading_ease
+    assert dense.flesch_kincaid_grade > simple.flesch_kincaid_grade
+    assert simple.length_distribution == {"short": 2, "medium": 0, "long": 0, "very_long": 0}
+    assert (empty.word_count, empty.sentence_count, empty.flesch_reading_ease) == (0, 0, 0.0)
+    assert book_prose_stats([]).book.word_count == 0
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the slop detector.
+"""
+import re
+
+from src.slop_detection import (
+    _PATTERN_SCANNER,
+    SlopAnalysisCache,
+    SlopCategory,
+    SlopDetectionAgent,
+    SlopDetector,
+    SlopIssue,
+)
+
+TEXT = (
+    "Suddenly, once upon a time, it's worth noting that the free gift was a piece of cake.\n"
+    "And then she seemed to smile (kind of) and said: first, second, third. To be honest, "
+    "SUDDENLY the fact of the matter is it was/were... (nested (aside)) basically "
+    "İt's clear that a ſort of Kind of thing was, if you will, the exact same."
+)
+
+
+def _finditer_matches(text):
+    expected = {}
+    for category, flags, patterns in SlopDetector._pattern_categories():
+        for pattern, _, _ in patterns:
+            matches = [(m.start(), m.group()) for m in re.finditer(pattern, text, flags)]
+            if matches:
+                expected.setdefault(category, []).append((pattern, matches))
+    return expected
+
+
+def test_scanner_matches_per_pattern_finditer():
+    for text in (TEXT, TEXT.lower(), TEXT.replace("İ", "I"), "", "plain prose only"):
+        scanned = _PATTERN_SCANNER.scan(text)
+        found = {
+            category: [(issue.pattern, issue.matches) for issue in issues]
+            for category, issues in scanned.items()
+            if issues
+        }
+        assert found == _finditer_matches(text)
+
+
+def test_detectors_share_the_compiled_scanner():
+    first, second = SlopDetector("low"), SlopDetector("strict")
+
+    assert first._scanner is second._scanner
+    strict = second.analyze_text(TEXT)
+    assert {issue.pattern for issue in first.analyze_text(TEXT).issues} < {
+        issue.pattern for issue in strict.issues
+    }
+    assert strict.issues[0].pattern == r"\bonce upon a time\b"
+
+
+def _per_word_matches(word, text):
+    return [(m.start(), m.group()) for m in re.finditer(rf"\b{word}\b", text, re.IGNORECASE)]
+
+
+def test_overused_words_are_located_from_one_scan():
+    detector = SlopDetector()
+    base = "Very very VERY really. The thing, Things; thing_x 2very verys said Said SAID "
+    for text in (base * 8, (base + "İ ſaid ıt K") * 8):
+        issues = detector._detect_overused_words(text)
+
+        assert [issue.pattern for issue in issues] == ["very", "really", "thing", "said"]
+        for issue in issues:
+            assert issue.matches == _per_word_matches(issue.pattern, text)
+    # "ſaid" is not counted as a word but, as before, is located as "said"
+    assert issues[3].suggestion.startswith("Used 24 times.") and len(issues[3].matches) == 32
+    assert detector._detect_overused_words("short text") == []
+
+
+def test_clean_text_resolves_overlaps_by_severity():
+    text = "It was a piece of cake, to be honest, as you know."
+    issues = [
+        SlopIssue(SlopCategory.CLICHES, "cake", [(9, "piece of cake")], 0.5, "Consider: easy, simple"),
+        # Overlaps the cliché but is less severe, so it is dropped
+        SlopIssue(SlopCategory.FILLER_CONTENT, "cake", [(18, "cake, to")], 0.4, ""),
+        SlopIssue(SlopCategory.FILLER_CONTENT, "honest", [(24, "to be honest")], 0.6, ""),
+        # Shares its start with a more severe removal
+        SlopIssue(SlopCategory.CLICHES, "to be", [(24, "to be")], 0.5, "Consider: being"),
+        SlopIssue(SlopCategory.FILLER_CONTENT, "know", [(38, "as you know")], 0.5, ""),
+        SlopIssue(SlopCategory.WEAK_PROSE, "was", [(3, "was")], 0.9, "Consider stronger verbs"),
+    ]
+
+    cleaned, removals, replacements, edits = SlopDetector()._clean_text(text, issues)
+
+    assert cleaned == "It was a easy, , ."
+    assert (removals, replacements) == (2, 1)
+    assert [(edit.start, edit.end, edit.replacement) for edit in edits] == [
+        (9, 22, "easy"),
+        (24, 36, ""),
+        (38, 49, ""),
+    ]
+    assert all(text[edit.start:edit.end] == edit.original for edit in edits)
+
+
+def test_analyze_text_reports_applied_edits():
+    analysis = SlopDetector("strict").analyze_text("Basically, the free gift was a piece of cake.", True)
+
+    assert analysis.cleaned_text == ", the  was a easy."
+    assert [edit.original for edit in analysis.edits] == ["Basically", "free gift", "piece of cake"]
+    assert SlopDetector().analyze_text("Basically fine.").edits == []
+
+
+PARAGRAPHS = [
+    "And then, suddenly, it was very quiet; to be honest, the very end result was very odd.",
+    "And then she said it was very, very late. Very late, basically a piece of cake.",
+    "The free gift was very small and very strange (an aside), if you will, said Ann.",
+]
+
+
+def test_analyze_paragraphs_matches_whole_text_analysis():
+    detector = SlopDetector("strict", cache=SlopAnalysisCache())
+    text = "\n".join(PARAGRAPHS)
+
+    for auto_clean in (False, True):
+        assert detector.analyze_paragraphs(PARAGRAPHS, auto_clean) == detector.analyze_text(text, auto_clean)
+    # ^ without MULTILINE still only matches at the start of the chapter
+    weak = [issue for issue in detector.analyze_paragraphs(PARAGRAPHS).issues if "And then" in issue.pattern]
+    assert [issue.matches for issue in weak] == [[(0, "And then")]]
+    assert detector.analyze_paragraphs(["", " "]).overall_score == 10.0
+
+
+def test_recheck_only_scans_changed_paragraphs():
+    cache = SlopAnalysisCache()
+    detector = SlopDetector("medium", cache=cache)
+    detector.analyze_paragraphs(PARAGRAPHS)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    edited = PARAGRAPHS[:1] + ["A new paragraph, needless to say."] + PARAGRAPHS[2:]
+    analysis = detector.analyze_paragraphs(edited)
+
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert analysis == detector.analyze_text("\n".join(edited))
+    # Another sensitivity gets its own entries
+    SlopDetector("strict", cache=cache).analyze_paragraphs(edited)
+    assert (cache.hits, cache.misses, len(cache)) == (2, 7, 7)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SlopAnalysisCache(max_entries=2)
+    detector = SlopDetector(cache=cache)
+    detector.analyze_paragraphs(PARAGRAPHS[:2])
+    detector.analyze_paragraphs(PARAGRAPHS[:1])
+    detector.analyze_paragraphs(PARAGRAPHS[2:])
+
+    assert len(cache) == 2
+    assert cache.get(cache.key("medium", PARAGRAPHS[0])) is not None
+    assert cache.get(cache.key("medium", PARAGRAPHS[1])) is None
+
+
+def test_agent_checks_content_paragraph_by_paragraph():
+    agent = SlopDetectionAgent("strict")
+    agent.detector._cache = cache = SlopAnalysisCache()
+    content = "\n".join(PARAGRAPHS)
+
+    first = agent.validate_content_quality(content)
+    second = agent.validate_content_quality(content, auto_clean=True)
+
+    assert first.issues == second.issues and second.cleaned_text
+    assert cache.hits == 3
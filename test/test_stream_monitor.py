@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the streaming slop monitor and the orchestrator's early abort.
+"""
+from types import SimpleNamespace
+
+from rich.console import Console
+
+from src import config
+from src.llm_client import LLMClient
+from src.orchestrator import Orchestrator
+from src.slop_detection import SlopAnalysisCache, SlopDetector
+from src.stream_monitor import StreamingSlopMonitor
+
+CLEAN = (
+    "<chapter id=\"1\"><content>"
+    "<paragraph id=\"1\">Mara crossed the harbour before dawn, counting the masts against a grey sky.</paragraph>"
+    "<paragraph id=\"2\">The fishmonger had already hung his lamps, and gulls argued over the gutters.</paragraph>"
+    "<paragraph id=\"3\">She bought bread, asked about the northern road, and paid with a bent coin.</paragraph>"
+    "<paragraph id=\"4\">By noon the wind had turned; the ferry would not sail until tomorrow.</paragraph>"
+    "</content></chapter>"
+)
+SLOP = [
+    "Suddenly, it's worth noting that, to be honest, needless to say it was a piece of cake.",
+    "Basically, kind of, sort of, if you will, the exact same free gift, as you know.",
+]
+
+
+def _stream(monitor, text, size=7):
+    """Feeds text in small chunks, like a client's chunk loop; returns the characters sent."""
+    for start in range(0, len(text), size):
+        if monitor.feed(text[start:start + size]):
+            return start + size
+    monitor.finish()
+    return len(text)
+
+
+def test_clean_prose_streams_without_alert():
+    monitor = StreamingSlopMonitor(detector=SlopDetector("medium", cache=SlopAnalysisCache()))
+
+    assert _stream(monitor, CLEAN) == len(CLEAN)
+    assert monitor.alert is None and not monitor.aborted
+    # Tags split across chunks still end paragraphs, and are not read as words
+    assert len(monitor.paragraph_scores) == 4
+    assert monitor.repetition_score == 0.0
+    assert monitor.vocabulary.token_count == 53 and monitor.vocabulary.value > 0.8
+
+
+def test_degenerate_loop_is_stopped_early():
+    loop = "and the door opened and the door closed " * 200
+    monitor = StreamingSlopMonitor()
+
+    sent = _stream(monitor, loop)
+
+    assert monitor.aborted and monitor.alert.reason == "repetition"
+    assert sent < len(loop) // 10
+    assert monitor.alert.characters == sent
+    assert "door" in monitor.alert.excerpt
+
+
+def test_repeated_paragraph_alerts():
+    paragraph = "<paragraph>The lamps were lit along the quay one by one as the tide came in.</paragraph>"
+    monitor = StreamingSlopMonitor(window_words=1000)
+
+    _stream(monitor, CLEAN + paragraph + paragraph)
+
+    assert monitor.alert.reason == "repetition" and monitor.alert.score == 1.0
+
+
+def test_rolling_slop_score_alerts():
+    monitor = StreamingSlopMonitor(
+        detector=SlopDetector("strict"), min_slop_score=7.5, slop_window_paragraphs=2
+    )
+
+    _stream(monitor, "\n\n".join(SLOP + ["The end."]))
+
+    assert monitor.alert.reason == "slop" and monitor.alert.score == 6.9
+    assert [slop for slop, _ in monitor.paragraph_scores] == [7.2, 6.6]
+
+
+def test_callback_can_let_the_response_continue():
+    alerts = []
+    monitor = StreamingSlopMonitor(on_alert=lambda alert: alerts.append(alert) or False)
+    loop = "over and over again " * 100
+
+    assert _stream(monitor, loop) == len(loop)
+    assert len(alerts) == 1 and not monitor.aborted
+
+
+class _StreamingLLM:
+    supports_stream_monitor = True
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def get_response(self, prompt, task_description, stream_monitor=None):
+        self.prompts.append(prompt)
+        response = self.responses.pop(0)
+        if stream_monitor is not None and _stream(stream_monitor, response) < len(response):
+            return None
+        return response
+
+
+def test_orchestrator_reprompts_a_stopped_response(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_STRUCTURED_PATCH_OUTPUT", False)
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.console = Console(quiet=True)
+    orchestrator.slop_agent = None
+    orchestrator.llm = _StreamingLLM(["word salad " * 500, CLEAN])
+
+    assert orchestrator._request_patch("Write chapter 1.", "Writing") == CLEAN
+    first, second = orchestrator.llm.prompts
+    assert first == "Write chapter 1." and "repeating itself" in second
+
+
+def test_orchestrator_keeps_the_final_attempt(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_STRUCTURED_PATCH_OUTPUT", False)
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.console = Console(quiet=True)
+    orchestrator.slop_agent = None
+    loop = "word salad " * 500
+    orchestrator.llm = _StreamingLLM([loop, loop])
+
+    assert orchestrator._request_patch("Write chapter 1.", "Writing") == loop
+    assert len(orchestrator.llm.prompts) == config.STREAM_MAX_REPROMPTS + 1
+
+
+def test_reset_forgets_a_failed_attempt():
+    paragraph = "<paragraph>The lamps were lit along the quay one by one as the tide came in.</paragraph>"
+    monitor = StreamingSlopMonitor(window_words=1000)
+    monitor.feed(CLEAN + paragraph + "<paragraph>Half a sent")
+
+    monitor.reset()
+
+    assert _stream(monitor, paragraph + CLEAN) == len(paragraph + CLEAN)
+    assert monitor.alert is None and monitor.characters == len(paragraph + CLEAN)
+    assert len(monitor.paragraph_scores) == 5
+
+
+class _FakeStream:
+    def __init__(self, text, size=7):
+        self.pieces = [text[start:start + size] for start in range(0, len(text), size)]
+        self.closed = False
+
+    def __iter__(self):
+        for piece in self.pieces:
+            delta = SimpleNamespace(content=piece, reasoning_content=None)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    def close(self):
+        self.closed = True
+
+
+def _client_streaming(text):
+    llm = LLMClient.__new__(LLMClient)
+    llm.console = Console(quiet=True)
+    completions = SimpleNamespace(create=lambda **kwargs: _FakeStream(text))
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return llm
+
+
+def test_client_checks_the_final_unterminated_paragraph():
+    paragraph = "The lamps were lit along the quay one by one as the tide came in."
+    other = "The ferry would not sail until tomorrow, the harbourmaster said."
+    text = f"{paragraph}\n\n{other}\n\n{paragraph}"
+    monitor = StreamingSlopMonitor(window_words=1000)
+
+    assert _client_streaming(text).get_response("prompt", stream_monitor=monitor) is None
+    assert monitor.alert.reason == "repetition" and monitor.alert.score == 1.0
+
+
+def test_client_counts_the_final_word():
+    text = "Mara crossed the harbour before dawn.\n\nShe bought bread and paid with a bent coin"
+    monitor = StreamingSlopMonitor()
+
+    assert _client_streaming(text).get_response("prompt", stream_monitor=monitor) == text
+    assert monitor.alert is None
+    assert monitor.vocabulary.token_count == len(text.split())
+    assert len(monitor.paragraph_scores) == 2
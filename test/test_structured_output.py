@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for converting structured-output patch data into patch XML.
+"""
+import json
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+
+from rich.console import Console
+
+from src import config
+from src.llm_client import LLMClient
+from src.orchestrator import Orchestrator
+from src.project import Project
+from src.structured_output import PATCH_SCHEMA_NAME, parse_structured_json, patch_data_to_xml
+
+
+def _project() -> Project:
+    project = Project(Console(quiet=True))
+    book = ET.Element("book")
+    chapters = ET.SubElement(book, "chapters")
+    ET.SubElement(chapters, "chapter", id="1")
+    project.book_root = book
+    return project
+
+
+def test_patch_data_converts_to_applicable_patch():
+    data = {
+        "chapters": [
+            {
+                "id": "1",
+                "setting": "The harbour at dawn",
+                "paragraphs": ["Fish & chips < 5 coins.", "  ", '"Go," she said.'],
+            }
+        ]
+    }
+
+    patch_xml = patch_data_to_xml(data)
+    project = _project()
+
+    assert project.apply_patch(patch_xml)
+    chapter = project.find_chapter("1")
+    assert chapter.get("setting") is None  # apply_patch only replaces content
+    paragraphs = chapter.findall("content/paragraph")
+    assert [(p.get("id"), p.text) for p in paragraphs] == [
+        ("1", "Fish & chips < 5 coins."),
+        ("2", '"Go," she said.'),
+    ]
+    assert ET.fromstring(patch_xml).find("chapter").get("setting") == "The harbour at dawn"
+
+
+def test_unusable_patch_data_is_rejected():
+    assert patch_data_to_xml({"chapters": [{"id": "", "paragraphs": ["x"]}]}) is None
+    assert patch_data_to_xml({"chapters": "nope"}) is None
+    assert parse_structured_json("not json") is None
+    assert parse_structured_json("[1, 2]") is None
+
+
+class _StubLLM:
+    def __init__(self, structured):
+        self.structured = structured
+        self.text_prompts = []
+
+    def get_structured_response(self, prompt, task_description, schema, schema_name):
+        return self.structured
+
+    def get_response(self, prompt, task_description):
+        self.text_prompts.append(prompt)
+        return "<patch/>"
+
+
+def test_request_patch_prefers_structured_output_and_falls_back(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_STRUCTURED_PATCH_OUTPUT", True)
+    orchestrator = Orchestrator.__new__(Orchestrator)
+
+    orchestrator.llm = _StubLLM({"chapters": [{"id": "2", "setting": "", "paragraphs": ["Hi."]}]})
+    assert orchestrator._request_patch("prompt", "Writing") == (
+        '<patch><chapter id="2"><content><paragraph id="1">Hi.</paragraph></content></chapter></patch>'
+    )
+    assert orchestrator.llm.text_prompts == []
+
+    orchestrator.llm = _StubLLM(None)
+    assert orchestrator._request_patch("prompt", "Writing") == "<patch/>"
+    assert orchestrator.llm.text_prompts == ["prompt"]
+
+
+class _FakeCompletions:
+    def __init__(self, content):
+        self.content = content
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_request_patch_uses_the_default_clients_structured_output(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_STRUCTURED_PATCH_OUTPUT", True)
+    data = {"chapters": [{"id": "3", "setting": "", "paragraphs": ["Rain.", "Then sun."]}]}
+    completions = _FakeCompletions(json.dumps(data))
+    llm = LLMClient.__new__(LLMClient)
+    llm.console = Console(quiet=True)
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.llm = llm
+
+    patch_xml = orchestrator._request_patch("prompt", "Writing")
+
+    assert patch_xml == (
+        '<patch><chapter id="3"><content><paragraph id="1">Rain.</paragraph>'
+        '<paragraph id="2">Then sun.</paragraph></content></chapter></patch>'
+    )
+    (request,) = completions.requests
+    assert request["response_format"]["json_schema"]["name"] == PATCH_SCHEMA_NAME
+    assert "stream" not in request
+
+
+def test_default_client_falls_back_when_structured_output_fails(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_STRUCTURED_PATCH_OUTPUT", True)
+    monkeypatch.setattr(config, "ENABLE_STREAM_MONITOR", False)
+    llm = LLMClient.__new__(LLMClient)
+    llm.console = Console(quiet=True)
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions("not json")))
+    text_prompts = []
+    llm.get_response = lambda prompt, task_description: text_prompts.append(prompt) or "<patch/>"
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.llm = llm
+
+    assert orchestrator._request_patch("prompt", "Writing") == "<patch/>"
+    assert text_prompts == ["prompt"]
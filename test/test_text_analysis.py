@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the shared text analysis and the analysers that accept it.
+"""
+import pytest
+
+from src import config
+from src.content_enhancements import ContentEnhancer
+from src.continuity_manager import ContinuityManager
+from src.engagement_optimizer import EngagementOptimizer
+from src.quality_metrics import QualityEvaluator
+from src.slop_detection import _WORD_PATTERN, SlopDetector
+from src.text_analysis import MovingAverageTTR, TextAnalysis
+
+TEXT = (
+    "  Mara crossed the harbour before dawn. \"Is the ferry running?\" she asked! "
+    "'Not today,' said Tomas... The danger was over; she felt relief.\n\n"
+    "İt was a café, and the thing was very very very odd. Marа waited?  "
+)
+
+
+def test_fields_are_computed_on_first_use_and_kept():
+    analysis = TextAnalysis(TEXT)
+    assert set(vars(analysis)) == {"text"}
+
+    words = analysis.words
+    assert set(vars(analysis)) == {"text", "words"}
+    assert analysis.words is words
+    assert TextAnalysis.of(analysis) is analysis
+    assert TextAnalysis.of(TEXT).text == TEXT
+
+
+def test_fields():
+    analysis = TextAnalysis(TEXT)
+
+    assert analysis.sentences[:3] == ["Mara crossed the harbour before dawn", "\"Is the ferry running", "\" she asked"]
+    assert analysis.sentence_pieces[-1] == ""
+    assert analysis.sentence_word_counts[:3] == [6, 4, 2]
+    assert analysis.dialogue == ["Is the ferry running?", "Not today,"]
+    assert [TEXT[start:end] for start, end in analysis.dialogue_spans] == analysis.dialogue
+    assert analysis.dialogue_word_count == 6
+    assert analysis.word_counts["very"] == 3 and analysis.word_counts["mara"] == 1
+    assert analysis.capitalized_words == ["Mara", "Is", "Not", "Tomas", "The"]
+    assert len(analysis.paragraphs) == 2
+
+
+def test_slop_word_counts_match_its_tokenizer():
+    analysis = TextAnalysis(TEXT + " thing_x 2very verys ſaid K")
+    ascii_words = [word for word in analysis.lower_words if word.isascii() and word.isalpha()]
+
+    assert ascii_words == _WORD_PATTERN.findall(analysis.lower)
+
+
+def test_analysers_share_one_analysis():
+    text = TEXT * 20
+    analysis = TextAnalysis(text)
+
+    quality = QualityEvaluator(enable_slop_detection=False)
+    engagement = EngagementOptimizer()
+    enhancer = ContentEnhancer()
+    detector = SlopDetector("strict")
+    assert quality.evaluate_chapter(analysis) == quality.evaluate_chapter(text)
+    assert engagement.analyze_chapter_engagement(analysis) == engagement.analyze_chapter_engagement(text)
+    assert enhancer.get_quick_suggestions(analysis) == enhancer.get_quick_suggestions(text)
+    assert detector.analyze_text(analysis, True) == detector.analyze_text(text, True)
+    shared, separate = ContinuityManager(), ContinuityManager()
+    for chapter_id in ("1", "2"):
+        assert shared.analyze_chapter_for_continuity(chapter_id, analysis) == (
+            separate.analyze_chapter_for_continuity(chapter_id, text)
+        )
+    assert shared.entities == separate.entities
+
+    assert {"lower", "words", "word_counts", "sentence_pieces", "dialogue_spans"} <= set(vars(analysis))
+
+
+# Varied literary prose, and flat prose that keeps reusing the same few words
+RICH_PROSE = (
+    "Mara crossed the harbour before dawn, counting the masts against a sky the colour of wet "
+    "slate. The fishmonger had already hung his lamps, and gulls quarrelled over the gutters "
+    "where last night's catch had been gutted and rinsed. She bought a heel of rye bread, "
+    "asked about the northern road, and paid with a bent coin that the baker turned twice in "
+    "his floury fingers before pocketing it. By noon the wind had veered; the ferry would not "
+    "sail until tomorrow, and the captain, a stooped man with a pipe clenched in what "
+    "remained of his teeth, told her so without looking up from his ledger. She spent the "
+    "afternoon in the chandlery, pretending to examine rope while she listened. Two dockhands "
+    "argued about wages, then about a widow in Tanner Street, then about nothing at all. A "
+    "boy swept sawdust into drifts and swept the drifts apart again. Nobody mentioned the "
+    "lighthouse keeper, which was strange, because a week ago everyone in Greyhaven had "
+    "talked of little else."
+)
+FLAT_PROSE = (
+    "Sarah walked into the room and looked around. The room was quiet and the light was dim. "
+    "She could see the table in the corner and the chair next to it. She walked over to the "
+    "table and looked at the papers on it. The papers were old and some of them were torn. "
+    "She picked up one of the papers and read it. It was a letter from her mother. Her mother "
+    "had written it many years ago, before she had left the village. Sarah read the letter "
+    "slowly. Her mother wrote about the house and the garden and the old dog that used to "
+    "sleep by the door. She wrote about Sarah too, and about how much she missed her. Sarah "
+    "felt tears in her eyes. She put the letter down on the table and looked out of the "
+    "window. Outside, the sun was setting over the hills. The sky was red and orange and the "
+    "trees were dark against it. She thought about her mother and about the house and about "
+    "the years that had passed. Then she picked up the letter again and put it in her pocket. "
+    "She would read it again later, when she was alone. She turned and walked back to the "
+    "door. At the door she stopped and looked back at the room one more time. Then she went "
+    "out and closed the door behind her."
+)
+
+
+def _window_ttr(words, window):
+    if len(words) < window:
+        return len(set(words)) / len(words) if words else 0.0
+    windows = len(words) - window + 1
+    return sum(len(set(words[i:i + window])) for i in range(windows)) / (window * windows)
+
+
+def test_moving_average_ttr_matches_window_by_window():
+    words = TextAnalysis(TEXT * 6).lower_words
+    for window in (1, 5, 30, len(words), len(words) + 10):
+        assert MovingAverageTTR(window).update(iter(words)).value == pytest.approx(_window_ttr(words, window))
+    assert MovingAverageTTR(5).value == 0.0
+
+
+def test_moving_average_ttr_of_streamed_pieces():
+    text = TEXT * 6
+    streamed = MovingAverageTTR(20)
+    for start in range(0, len(text), 3):
+        streamed.feed(text[start:start + 3])
+
+    assert streamed.finish() == pytest.approx(MovingAverageTTR(20).update(TextAnalysis(text).lower_words).value)
+    assert streamed.token_count == len(TextAnalysis(text).lower_words)
+
+
+def test_vocabulary_richness_does_not_fall_with_length():
+    evaluator = QualityEvaluator(enable_slop_detection=False)
+    # Only 400 distinct words in 3,000, but no word repeats within a window
+    chapter = " ".join(f"word{i % 400}" for i in range(3000))
+
+    assert evaluator._evaluate_vocabulary_richness(chapter) == 9.0
+    assert evaluator._evaluate_vocabulary_richness(" ".join([chapter] * 5)) == 9.0
+    assert evaluator._evaluate_vocabulary_richness("the the the the") == 1.0
+
+
+def test_vocabulary_richness_bands_separate_real_prose():
+    evaluator = QualityEvaluator(enable_slop_detection=False)
+
+    assert evaluator._evaluate_vocabulary_richness(RICH_PROSE) >= 8
+    assert evaluator._evaluate_vocabulary_richness(FLAT_PROSE) < config.MIN_VOCABULARY_RICHNESS_SCORE
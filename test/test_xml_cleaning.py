@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Regression tests for cleaning LLM XML output.
+
+llm_xml_corpus.json holds responses together with the output the original multi-pass
+cleaner produced for them; the precompiled cleaner must reproduce it exactly.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from src import utils
+
+CORPUS = json.loads((Path(__file__).parent / "llm_xml_corpus.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=range(len(CORPUS)))
+def test_clean_llm_xml_output_matches_corpus(case):
+    assert utils.clean_llm_xml_output(case["input"]) == case["xml"]
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=range(len(CORPUS)))
+def test_clean_paragraph_text_matches_corpus(case):
+    assert utils.clean_paragraph_text(case["input"]) == case["paragraph"]
+
+
+def test_clean_llm_xml_output_repairs_common_damage():
+    response = (
+        "Here you go:\n```xml\n<patch><chapter id=\"1\"><content>"
+        '<paragraph id="2\n1">The lantern swung\nin the wind.</paragraph>'
+        "</content></chapter>\n```"
+    )
+    assert utils.clean_llm_xml_output(response) == (
+        '<patch><chapter id="1"><content>'
+        '<paragraph id="21">The lantern swung in the wind.</paragraph>'
+        "</content></chapter></patch>"
+    )
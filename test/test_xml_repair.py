@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for repairing malformed LLM XML.
+"""
+from rich.console import Console
+
+from src import utils
+from src.xml_repair import repair_xml
+
+
+def _paragraphs(root):
+    return [p.text for p in root.iter("paragraph")]
+
+
+def test_escapes_bare_ampersands_and_converts_html_entities():
+    result = repair_xml(
+        "<patch><title>Salt &amp; Iron</title><synopsis>Rock & roll&nbsp;forever &#169;</synopsis></patch>"
+    )
+
+    assert result.root.findtext("title") == "Salt & Iron"
+    assert result.root.findtext("synopsis") == "Rock & roll\xa0forever \xa9"
+    assert "Escaped 1 bare '&' character(s)" in result.changes
+    assert "Replaced 1 HTML entity reference(s) undefined in XML" in result.changes
+
+
+def test_escapes_stray_angle_brackets_in_dialogue():
+    result = repair_xml(
+        '<patch><chapter id="1"><content>'
+        '<paragraph id="1">"I <3 you," she said. "<Whisper> it."</paragraph>'
+        "</content></chapter></patch>"
+    )
+
+    assert _paragraphs(result.root) == ['"I <3 you," she said. "<Whisper> it."']
+    assert result.changes == ["Escaped 2 '<' character(s) inside paragraph text"]
+
+
+def test_closes_unterminated_paragraphs_and_truncated_patch():
+    result = repair_xml(
+        '<patch><chapter id="1"><content>'
+        '<paragraph id="1">First.<paragraph id="2">Second.</paragraph>'
+        '<paragraph id="3">Cut off mid sent'
+    )
+
+    assert _paragraphs(result.root) == ["First.", "Second.", "Cut off mid sent"]
+    assert result.root.find("chapter/content") is not None
+    assert "Closed 2 unterminated <paragraph> element(s)" in result.changes
+    assert any(change.startswith("Recovered from parser error") for change in result.changes)
+
+
+def test_well_formed_xml_is_left_alone():
+    xml = '<patch><chapter id="1"><content><paragraph id="1">Fine.</paragraph></content></chapter></patch>'
+    result = repair_xml(xml)
+
+    assert result.xml == xml
+    assert result.changes == []
+
+
+def test_parse_xml_string_salvages_malformed_patch():
+    patch = (
+        '<patch><chapter id="1"><content><paragraph id="1">Tom & Jerry</paragraph>'
+        '<paragraph id="2">x < y</paragraph></content></chapter></patch>'
+    )
+    root = utils.parse_xml_string(patch, Console(quiet=True), expected_root_tag="patch")
+
+    assert root is not None
+    assert _paragraphs(root) == ["Tom & Jerry", "x < y"]